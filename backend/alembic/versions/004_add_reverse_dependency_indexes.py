@@ -0,0 +1,28 @@
+"""Add reverse dependency indexes for repricing
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18 09:00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Matériau -> articles qui l'utilisent
+    op.create_index('ix_article_materials_material', 'article_materials', ['material_id'])
+    
+    # Matériau/article -> compositions qui le contiennent
+    op.create_index('ix_composition_items_item', 'composition_items', ['item_type', 'item_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_composition_items_item', table_name='composition_items')
+    op.drop_index('ix_article_materials_material', table_name='article_materials')
@@ -0,0 +1,32 @@
+"""Allow compositions inside compositions
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18 09:30:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Nouveau type d'item : sous-composition
+    op.execute("ALTER TYPE compositionitemtype ADD VALUE IF NOT EXISTS 'composition'")
+
+
+def downgrade() -> None:
+    # PostgreSQL ne permet pas de retirer une valeur d'enum : recréer le type
+    op.execute("DELETE FROM composition_items WHERE item_type = 'composition'")
+    op.execute("ALTER TYPE compositionitemtype RENAME TO compositionitemtype_old")
+    op.execute("CREATE TYPE compositionitemtype AS ENUM ('material', 'article')")
+    op.execute(
+        "ALTER TABLE composition_items ALTER COLUMN item_type TYPE compositionitemtype "
+        "USING item_type::text::compositionitemtype"
+    )
+    op.execute("DROP TYPE compositionitemtype_old")
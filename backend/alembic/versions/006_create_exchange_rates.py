@@ -0,0 +1,71 @@
+"""Create exchange rates table and LEI price columns
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18 14:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create exchange_rates table
+    op.create_table(
+        'exchange_rates',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True),
+        sa.Column('currency', sa.String(), nullable=False, server_default='LEI'),
+        sa.Column('rate', sa.Numeric(10, 4), nullable=False),
+        sa.Column('effective_date', sa.Date(), nullable=False),
+        sa.Column('created_at', sa.String(), nullable=True),
+    )
+    op.create_index(
+        'ix_exchange_rates_currency_date',
+        'exchange_rates',
+        ['currency', 'effective_date'],
+        unique=True
+    )
+    
+    # Prix LEI dénormalisés
+    op.add_column('articles', sa.Column('total_price_lei', sa.Numeric(10, 2), nullable=True))
+    op.add_column('compositions', sa.Column('total_price_lei', sa.Numeric(10, 2), nullable=True))
+    op.add_column('services', sa.Column('price_net_lei', sa.Numeric(10, 2), nullable=True))
+    op.add_column('services', sa.Column('price_gross_lei', sa.Numeric(10, 2), nullable=True))
+    
+    # Taux initial issu de la configuration
+    op.execute(
+        sa.text(
+            "INSERT INTO exchange_rates (id, currency, rate, effective_date, created_at) "
+            "VALUES (gen_random_uuid(), 'LEI', :rate, CURRENT_DATE, to_char(now(), 'YYYY-MM-DD\"T\"HH24:MI:SS')) "
+        ).bindparams(rate=settings.EUR_LEI_RATE)
+    )
+    
+    # Remplir les prix LEI
+    op.execute(sa.text("UPDATE materials SET price_lei = ROUND(price_eur * :rate, 2)").bindparams(rate=settings.EUR_LEI_RATE))
+    op.execute(sa.text("UPDATE articles SET total_price_lei = ROUND(total_price * :rate, 2)").bindparams(rate=settings.EUR_LEI_RATE))
+    op.execute(sa.text("UPDATE compositions SET total_price_lei = ROUND(total_price * :rate, 2)").bindparams(rate=settings.EUR_LEI_RATE))
+    op.execute(
+        sa.text(
+            "UPDATE services SET price_net_lei = ROUND(price_net * :rate, 2), "
+            "price_gross_lei = ROUND(price_gross * :rate, 2)"
+        ).bindparams(rate=settings.EUR_LEI_RATE)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('services', 'price_gross_lei')
+    op.drop_column('services', 'price_net_lei')
+    op.drop_column('compositions', 'total_price_lei')
+    op.drop_column('articles', 'total_price_lei')
+    op.drop_index('ix_exchange_rates_currency_date', table_name='exchange_rates')
+    op.drop_table('exchange_rates')
@@ -0,0 +1,39 @@
+"""Create import files table
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18 16:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create import_files table
+    op.create_table(
+        'import_files',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True),
+        sa.Column('sha256', sa.String(64), nullable=False),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('sheet_name', sa.String(), nullable=False, server_default=''),
+        sa.Column('filename', sa.String(), nullable=True),
+        sa.Column('statistics', JSONB(), nullable=True),
+        sa.Column('user_id', UUID(as_uuid=True), nullable=True),
+        sa.Column('imported_at', sa.String(), nullable=True),
+    )
+    
+    op.create_index('ix_import_files_hash', 'import_files', ['sha256', 'kind', 'sheet_name'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_import_files_hash', table_name='import_files')
+    op.drop_table('import_files')
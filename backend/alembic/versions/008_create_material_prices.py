@@ -0,0 +1,53 @@
+"""Create material price history table
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-18 18:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create material_prices table
+    op.create_table(
+        'material_prices',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True),
+        sa.Column(
+            'material_id',
+            UUID(as_uuid=True),
+            sa.ForeignKey('materials.id', ondelete='CASCADE'),
+            nullable=False
+        ),
+        sa.Column('price_eur', sa.Numeric(10, 2), nullable=False),
+        sa.Column('price_lei', sa.Numeric(10, 2), nullable=True),
+        sa.Column('valid_from', sa.DateTime(), nullable=False),
+        sa.Column('source', sa.String(), nullable=True),
+    )
+    op.create_index(
+        'ix_material_prices_material_valid_from',
+        'material_prices',
+        ['material_id', 'valid_from']
+    )
+    
+    # Prix actuels comme premier point de l'historique
+    op.execute(
+        "INSERT INTO material_prices (id, material_id, price_eur, price_lei, valid_from, source) "
+        "SELECT gen_random_uuid(), id, price_eur, price_lei, "
+        "COALESCE(NULLIF(price_date, '')::timestamp, now()::timestamp), 'migration' "
+        "FROM materials"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_material_prices_material_valid_from', table_name='material_prices')
+    op.drop_table('material_prices')
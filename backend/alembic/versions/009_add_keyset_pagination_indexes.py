@@ -0,0 +1,35 @@
+"""Add keyset pagination indexes on (updated_at, id)
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-18 19:00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+TABLES = ('materials', 'articles', 'compositions', 'services')
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        # La comparaison de clés (updated_at, id) exige une date renseignée
+        op.execute(
+            f"UPDATE {table} SET updated_at = COALESCE(created_at, to_char(now(), 'YYYY-MM-DD\"T\"HH24:MI:SS')) "
+            "WHERE updated_at IS NULL"
+        )
+        
+        # Tri et pagination par date de modification (le tri par code utilise l'index unique)
+        op.create_index(f'ix_{table}_updated_at_id', table, ['updated_at', 'id'])
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        op.drop_index(f'ix_{table}_updated_at_id', table_name=table)
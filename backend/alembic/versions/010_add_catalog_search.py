@@ -0,0 +1,57 @@
+"""Add trigram and accent-insensitive catalog search
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-18 20:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+# Table -> texte indexé (code et noms)
+SEARCH_COLUMNS = {
+    'materials': "code || ' ' || coalesce(name_fr, '') || ' ' || coalesce(name_ro, '')",
+    'articles': "code || ' ' || coalesce(name, '')",
+    'services': "code || ' ' || coalesce(name, '')",
+}
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+    
+    # unaccent() n'est pas IMMUTABLE : enveloppe utilisable dans une colonne générée
+    op.execute(
+        "CREATE OR REPLACE FUNCTION f_unaccent(text) RETURNS text "
+        "LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT AS "
+        "$$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$"
+    )
+    
+    for table, source in SEARCH_COLUMNS.items():
+        op.add_column(
+            table,
+            sa.Column('search_text', sa.String(), sa.Computed(f"lower(f_unaccent({source}))", persisted=True))
+        )
+        op.create_index(
+            f'ix_{table}_search_text',
+            table,
+            ['search_text'],
+            postgresql_using='gin',
+            postgresql_ops={'search_text': 'gin_trgm_ops'}
+        )
+
+
+def downgrade() -> None:
+    for table in reversed(list(SEARCH_COLUMNS)):
+        op.drop_index(f'ix_{table}_search_text', table_name=table)
+        op.drop_column(table, 'search_text')
+    
+    op.execute("DROP FUNCTION IF EXISTS f_unaccent(text)")
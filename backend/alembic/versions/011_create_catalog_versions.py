@@ -0,0 +1,46 @@
+"""Create catalog versions table
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-18 21:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+# Tables suivies par app.services.catalog_events
+CATALOG_TABLES = (
+    'materials',
+    'articles',
+    'article_materials',
+    'compositions',
+    'composition_items',
+    'services',
+    'exchange_rates',
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'catalog_versions',
+        sa.Column('table_name', sa.String(), primary_key=True),
+        sa.Column('version', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.String(), nullable=True),
+    )
+    
+    op.bulk_insert(
+        sa.table('catalog_versions', sa.column('table_name', sa.String), sa.column('version', sa.BigInteger)),
+        [{'table_name': table, 'version': 1} for table in CATALOG_TABLES]
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('catalog_versions')
@@ -2,6 +2,6 @@
 Package API - Routes de l'API
 """
 
-from app.api import auth, materials, imports, articles, services
+from app.api import auth, materials, imports, exports, articles, compositions, services, pricing, search
 
-__all__ = ["auth", "materials", "imports", "articles", "services"]
+__all__ = ["auth", "materials", "imports", "exports", "articles", "compositions", "services", "pricing", "search"]
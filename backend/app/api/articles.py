@@ -2,8 +2,8 @@
 Routes API pour les articles
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.orm import Session, noload, selectinload
 from typing import List, Optional
 import uuid
 from datetime import datetime
@@ -13,55 +13,127 @@ from app.schemas.catalog import Article, ArticleCreate, ArticleUpdate
 from app.models.article import Article as ArticleModel, ArticleMaterial
 from app.models.material import Material
 from app.services.price_calculator import PriceCalculator
+from app.services.repricing import RepricingService
+from app.services.exchange_rates import ExchangeRateService
+from app.services.catalog_search import normalized_term
 from app.api.dependencies import get_current_user
+from app.api.pagination import paginate, SORT_PATTERN
+from app.api.caching import cache_response, cached_response, catalog_etag
 from app.models.user import User
 
 
 router = APIRouter()
 
+# Réponses revalidées par ETag et mises en cache sous cet ETag
+article_etag = Depends(catalog_etag("articles", "article_materials", "materials"))
+
+
+def _bom_options(include: str = "materials") -> list:
+    """Options de chargement de la nomenclature (une requête par niveau)"""
+    if include == "none":
+        return [noload(ArticleModel.materials)]
+    
+    return [selectinload(ArticleModel.materials).selectinload(ArticleMaterial.material)]
+
+
+def _resolve_materials(articles: List[ArticleModel]) -> None:
+    """Renseigner code, nom, unité et prix des matériaux de chaque ligne"""
+    for article in articles:
+        for line in article.materials:
+            material = line.material
+            line.material_code = material.code if material else None
+            line.material_name = material.name_fr if material else None
+            line.material_unit = material.unit if material else None
+            line.material_price_eur = material.price_eur if material else None
+
+
+def _get_article(article_id: str, db: Session, include: str = "materials") -> ArticleModel:
+    """Charger un article avec sa nomenclature ou lever une 404"""
+    article = (
+        db.query(ArticleModel)
+        .options(*_bom_options(include))
+        .filter(ArticleModel.id == article_id)
+        .first()
+    )
+    
+    if not article:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Article non trouvé"
+        )
+    
+    _resolve_materials([article])
+    return article
+
+
+def _apply_prices(articles: List[ArticleModel], db: Session) -> None:
+    """Recalculer et affecter les prix d'un lot d'articles"""
+    prices = PriceCalculator.calculate_articles_prices(articles, db)
+    rate = ExchangeRateService.get_current_rate(db)
+    
+    for article in articles:
+        article.material_cost = prices[article.id]['material_cost']
+        article.total_price = prices[article.id]['total_price']
+        article.total_price_lei = PriceCalculator.convert_eur_to_lei(article.total_price, rate)
+
 
 @router.get("/", response_model=List[Article])
 async def list_articles(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
+    sort: str = Query("code", pattern=SORT_PATTERN),
+    cursor: Optional[str] = None,
     active_only: bool = True,
     search: Optional[str] = None,
+    include: str = Query("materials", pattern="^(materials|none)$"),
+    etag: str = article_etag,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Lister les articles"""
-    query = db.query(ArticleModel)
+    """
+    Lister les articles
+    
+    - **include**: `materials` (nomenclature chargée en lot avec les
+      matériaux résolus) ou `none` (sans nomenclature, pour les grilles)
+    - **sort**: `code` ou `updated_at`, préfixé de `-` pour l'ordre décroissant
+    - **cursor**: Curseur reçu dans l'en-tête X-Next-Cursor ou X-Prev-Cursor
+    """
+    cached = cached_response(etag)
+    if cached is not None:
+        return cached
+    
+    query = db.query(ArticleModel).options(*_bom_options(include))
     
     if active_only:
         query = query.filter(ArticleModel.is_active == True)
     
     if search:
-        search_filter = f"%{search}%"
-        query = query.filter(
-            (ArticleModel.code.ilike(search_filter)) |
-            (ArticleModel.name.ilike(search_filter))
-        )
+        # Sans accents ni casse, servi par l'index trigrammes de search_text
+        query = query.filter(ArticleModel.search_text.contains(normalized_term(search)))
     
-    articles = query.offset(skip).limit(limit).all()
-    return articles
+    articles = paginate(query, ArticleModel, response, sort, cursor, skip, limit)
+    _resolve_materials(articles)
+    
+    return cache_response(etag, List[Article], articles, response)
 
 
 @router.get("/{article_id}", response_model=Article)
 async def get_article(
     article_id: str,
+    response: Response,
+    include: str = Query("materials", pattern="^(materials|none)$"),
+    etag: str = article_etag,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Récupérer un article par ID"""
-    article = db.query(ArticleModel).filter(ArticleModel.id == article_id).first()
-    
-    if not article:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Article non trouvé"
-        )
+    cached = cached_response(etag)
+    if cached is not None:
+        return cached
     
-    return article
+    article = _get_article(article_id, db, include)
+    return cache_response(etag, Article, article, response)
 
 
 @router.post("/", response_model=Article, status_code=status.HTTP_201_CREATED)
@@ -102,16 +174,22 @@ async def create_article(
     db.add(article)
     db.flush()  # Pour obtenir l'ID
     
-    # Ajouter les matériaux
-    for material_data in article_data.materials:
-        # Vérifier que le matériau existe
-        material = db.query(Material).filter(Material.id == material_data.material_id).first()
-        if not material:
+    # Vérifier que tous les matériaux existent (une seule requête)
+    requested_ids = {str(m.material_id) for m in article_data.materials}
+    if requested_ids:
+        found_ids = {
+            str(material_id)
+            for (material_id,) in db.query(Material.id).filter(Material.id.in_(requested_ids)).all()
+        }
+        missing = requested_ids - found_ids
+        if missing:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Matériau {material_data.material_id} non trouvé"
+                detail=f"Matériau {sorted(missing)[0]} non trouvé"
             )
-        
+    
+    # Ajouter les matériaux
+    for material_data in article_data.materials:
         article_material = ArticleMaterial(
             id=uuid.uuid4(),
             article_id=article.id,
@@ -124,14 +202,11 @@ async def create_article(
     db.flush()
     
     # Calculer les prix
-    prices = PriceCalculator.calculate_article_price(article, db)
-    article.material_cost = prices['material_cost']
-    article.total_price = prices['total_price']
+    _apply_prices([article], db)
     
     db.commit()
-    db.refresh(article)
     
-    return article
+    return _get_article(str(article.id), db)
 
 
 @router.put("/{article_id}", response_model=Article)
@@ -168,14 +243,14 @@ async def update_article(
     article.updated_at = datetime.utcnow().isoformat()
     
     # Recalculer les prix
-    prices = PriceCalculator.calculate_article_price(article, db)
-    article.material_cost = prices['material_cost']
-    article.total_price = prices['total_price']
+    _apply_prices([article], db)
+    
+    # Répercuter sur les compositions qui contiennent l'article
+    RepricingService.reprice_dependents(db, article_ids=[article.id])
     
     db.commit()
-    db.refresh(article)
     
-    return article
+    return _get_article(str(article.id), db)
 
 
 @router.post("/{article_id}/recalculate", response_model=Article)
@@ -198,15 +273,14 @@ async def recalculate_article_price(
         )
     
     # Recalculer
-    prices = PriceCalculator.calculate_article_price(article, db)
-    article.material_cost = prices['material_cost']
-    article.total_price = prices['total_price']
+    _apply_prices([article], db)
     article.updated_at = datetime.utcnow().isoformat()
     
+    RepricingService.reprice_dependents(db, article_ids=[article.id])
+    
     db.commit()
-    db.refresh(article)
     
-    return article
+    return _get_article(str(article.id), db)
 
 
 @router.delete("/{article_id}", status_code=status.HTTP_204_NO_CONTENT)
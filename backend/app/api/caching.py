@@ -0,0 +1,114 @@
+"""
+Requêtes conditionnelles (ETag / If-None-Match) et cache des réponses du catalogue
+"""
+
+from functools import lru_cache
+import hashlib
+from typing import Any, Callable, Optional
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.models.user import User
+from app.services.catalog_cache import CatalogCache
+from app.services.catalog_versions import CatalogVersionService
+from app.api.dependencies import get_current_user
+
+
+# Le navigateur garde la réponse mais la revalide à chaque visite
+CACHE_CONTROL = "private, no-cache"
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match contient-il l'ETag (comparaison faible, RFC 9110) ?"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def catalog_etag(*tables: str) -> Callable:
+    """
+    Dépendance qui répond 304 si le client a déjà la réponse à jour
+    
+    L'ETag (fort) dérive du chemin, des paramètres de la requête et des
+    versions des tables lues (une requête sur catalog_versions). S'il
+    figure dans If-None-Match, la route n'est pas exécutée : ni requête
+    sur le catalogue, ni sérialisation. L'utilisateur est authentifié
+    avant toute réponse.
+    
+    Args:
+        tables: Tables dont dépend la réponse
+    """
+    def dependency(
+        request: Request,
+        response: Response,
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user)
+    ) -> str:
+        versions = CatalogVersionService.get(db, tables)
+        key = "|".join([
+            request.url.path,
+            "&".join(sorted(f"{name}={value}" for name, value in request.query_params.multi_items())),
+            *(f"{table}:{version}" for table, version in versions.items())
+        ])
+        etag = f'"{hashlib.sha1(key.encode()).hexdigest()}"'
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        
+        if _matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        
+        response.headers.update(headers)
+        return etag
+    
+    return dependency
+
+
+@lru_cache(maxsize=None)
+def _adapter(response_type: Any) -> TypeAdapter:
+    """Validateur du type de réponse, construit une fois par type"""
+    return TypeAdapter(response_type)
+
+
+def cached_response(etag: str) -> Optional[Response]:
+    """
+    Réponse en cache pour cet ETag, prête à renvoyer
+    
+    Un succès évite la requête sur le catalogue et la validation Pydantic :
+    le corps JSON est renvoyé tel quel, avec ses en-têtes (ETag, curseurs).
+    
+    Returns:
+        Response ou None si l'ETag n'est pas en cache
+    """
+    cached = CatalogCache.get(etag.strip('"'))
+    if cached is None:
+        return None
+    headers, body = cached
+    return Response(content=body, media_type=JSON_MEDIA_TYPE, headers=headers)
+
+
+def cache_response(etag: str, response_type: Any, content: Any, response: Response) -> Response:
+    """
+    Sérialiser une réponse du catalogue et la mettre en cache
+    
+    La sérialisation est celle de response_model ; les en-têtes déjà posés
+    sur `response` (ETag, curseurs de pagination) sont conservés.
+    
+    Args:
+        etag: ETag renvoyé par la dépendance catalog_etag
+        response_type: Type de la réponse (ex. List[Material])
+        content: Objets ORM ou schémas à renvoyer
+        response: Réponse FastAPI de la route
+    """
+    adapter = _adapter(response_type)
+    body = adapter.dump_json(adapter.validate_python(content, from_attributes=True), by_alias=True)
+    headers = dict(response.headers)
+    CatalogCache.set(etag.strip('"'), headers, body)
+    return Response(content=body, media_type=JSON_MEDIA_TYPE, headers=headers)
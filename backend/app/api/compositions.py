@@ -0,0 +1,375 @@
+"""
+Routes API pour les compositions
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.orm import Session, selectinload
+from typing import Dict, List, Optional
+import uuid
+from datetime import datetime
+
+from app.database import get_db
+from app.schemas.catalog import Composition, CompositionCreate, CompositionUpdate, CompositionItemCreate
+from app.models.composition import (
+    Composition as CompositionModel,
+    CompositionItem,
+    CompositionItemType
+)
+from app.models.material import Material
+from app.models.article import Article
+from app.services.price_calculator import PriceCalculator
+from app.services.pricing_graph import PricingCycleError
+from app.services.repricing import RepricingService
+from app.services.exchange_rates import ExchangeRateService
+from app.api.dependencies import get_current_user
+from app.api.pagination import paginate, SORT_PATTERN
+from app.api.caching import cache_response, cached_response, catalog_etag
+from app.models.user import User
+
+
+router = APIRouter()
+
+# Réponses revalidées par ETag et mises en cache sous cet ETag
+composition_etag = Depends(catalog_etag("compositions", "composition_items", "materials", "articles"))
+
+
+# Table, colonne du nom et colonne de prix de chaque type d'item
+ITEM_MODELS = {
+    CompositionItemType.MATERIAL: (Material, Material.name_fr, Material.price_eur),
+    CompositionItemType.ARTICLE: (Article, Article.name, Article.total_price),
+    CompositionItemType.COMPOSITION: (CompositionModel, CompositionModel.name, CompositionModel.total_price),
+}
+
+
+def _get_composition(composition_id: str, db: Session) -> CompositionModel:
+    """Charger une composition avec ses items ou lever une 404"""
+    composition = (
+        db.query(CompositionModel)
+        .options(selectinload(CompositionModel.items))
+        .filter(CompositionModel.id == composition_id)
+        .first()
+    )
+    
+    if not composition:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Composition non trouvée"
+        )
+    
+    return composition
+
+
+def _resolve_items(compositions: List[CompositionModel], db: Session) -> None:
+    """
+    Renseigner code, nom, unité et prix unitaire des éléments référencés
+    
+    Une requête par type d'item présent (au plus 3), quel que soit le
+    nombre de compositions et d'items.
+    """
+    ids_by_type: Dict[CompositionItemType, set] = {}
+    for composition in compositions:
+        for item in composition.items:
+            ids_by_type.setdefault(item.item_type, set()).add(item.item_id)
+    
+    resolved = {}
+    for item_type, item_ids in ids_by_type.items():
+        model, name_column, price_column = ITEM_MODELS[item_type]
+        rows = (
+            db.query(model.id, model.code, name_column, model.unit, price_column)
+            .filter(model.id.in_(list(item_ids)))
+            .all()
+        )
+        for item_id, code, name, unit, price in rows:
+            resolved[(item_type, item_id)] = (code, name, unit, price)
+    
+    for composition in compositions:
+        for item in composition.items:
+            code, name, unit, price = resolved.get((item.item_type, item.item_id), (None, None, None, None))
+            item.item_code = code
+            item.item_name = name
+            item.item_unit = unit
+            item.unit_price = price
+
+
+def _validate_items(items: List[CompositionItemCreate], db: Session, composition_id: Optional[uuid.UUID] = None) -> None:
+    """Vérifier que les éléments référencés existent (une requête par type)"""
+    ids_by_type: Dict[CompositionItemType, set] = {}
+    for item in items:
+        item_type = CompositionItemType(item.item_type)
+        try:
+            item_id = uuid.UUID(str(item.item_id))
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Identifiant invalide: {item.item_id}"
+            )
+        
+        if item_type == CompositionItemType.COMPOSITION and item_id == composition_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Une composition ne peut pas se contenir elle-même"
+            )
+        
+        ids_by_type.setdefault(item_type, set()).add(item_id)
+    
+    for item_type, item_ids in ids_by_type.items():
+        model, _, _ = ITEM_MODELS[item_type]
+        found_ids = {
+            item_id for (item_id,) in
+            db.query(model.id).filter(model.id.in_(list(item_ids))).all()
+        }
+        missing = item_ids - found_ids
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Élément {item_type.value} {sorted(str(m) for m in missing)[0]} non trouvé"
+            )
+
+
+def _replace_items(composition: CompositionModel, items: List[CompositionItemCreate]) -> None:
+    """Remplacer les items d'une composition"""
+    composition.items = [
+        CompositionItem(
+            id=uuid.uuid4(),
+            item_type=CompositionItemType(item.item_type),
+            item_id=uuid.UUID(str(item.item_id)),
+            quantity=item.quantity
+        )
+        for item in items
+    ]
+
+
+def _apply_prices(compositions: List[CompositionModel], db: Session) -> None:
+    """
+    Recalculer et affecter les prix d'un lot de compositions
+    
+    Lève une 400 si les items forment un cycle.
+    """
+    db.flush()
+    
+    try:
+        prices = PriceCalculator.calculate_compositions_prices(compositions, db)
+    except PricingCycleError as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    rate = ExchangeRateService.get_current_rate(db)
+    for composition in compositions:
+        composition.total_price = prices[composition.id]['total_price']
+        composition.total_price_lei = PriceCalculator.convert_eur_to_lei(composition.total_price, rate)
+
+
+@router.get("/", response_model=List[Composition])
+async def list_compositions(
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    sort: str = Query("code", pattern=SORT_PATTERN),
+    cursor: Optional[str] = None,
+    active_only: bool = True,
+    search: Optional[str] = None,
+    etag: str = composition_etag,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Lister les compositions avec leurs items
+    
+    Les items et les éléments référencés sont chargés en lot : le nombre
+    de requêtes ne dépend pas de la taille de la page.
+    
+    - **sort**: `code` ou `updated_at`, préfixé de `-` pour l'ordre décroissant
+    - **cursor**: Curseur reçu dans l'en-tête X-Next-Cursor ou X-Prev-Cursor
+    """
+    cached = cached_response(etag)
+    if cached is not None:
+        return cached
+    
+    query = db.query(CompositionModel).options(selectinload(CompositionModel.items))
+    
+    if active_only:
+        query = query.filter(CompositionModel.is_active == True)
+    
+    if search:
+        search_filter = f"%{search}%"
+        query = query.filter(
+            (CompositionModel.code.ilike(search_filter)) |
+            (CompositionModel.name.ilike(search_filter))
+        )
+    
+    compositions = paginate(query, CompositionModel, response, sort, cursor, skip, limit)
+    _resolve_items(compositions, db)
+    
+    return cache_response(etag, List[Composition], compositions, response)
+
+
+@router.get("/{composition_id}", response_model=Composition)
+async def get_composition(
+    composition_id: str,
+    response: Response,
+    etag: str = composition_etag,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Récupérer une composition par ID avec ses items"""
+    cached = cached_response(etag)
+    if cached is not None:
+        return cached
+    
+    composition = _get_composition(composition_id, db)
+    _resolve_items([composition], db)
+    
+    return cache_response(etag, Composition, composition, response)
+
+
+@router.post("/", response_model=Composition, status_code=status.HTTP_201_CREATED)
+async def create_composition(
+    composition_data: CompositionCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Créer une nouvelle composition
+    
+    Les items peuvent être des matériaux, des articles ou d'autres compositions.
+    Le prix est calculé automatiquement :
+    - total_price = Σ(prix item × quantité) × (1 + overhead) × (1 + margin)
+    """
+    # Vérifier si le code existe déjà
+    existing = db.query(CompositionModel).filter(CompositionModel.code == composition_data.code).first()
+    if existing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Une composition avec le code '{composition_data.code}' existe déjà"
+        )
+    
+    _validate_items(composition_data.items, db)
+    
+    # Créer la composition
+    composition = CompositionModel(
+        id=uuid.uuid4(),
+        code=composition_data.code,
+        name=composition_data.name,
+        description=composition_data.description,
+        unit=composition_data.unit,
+        margin=composition_data.margin,
+        overhead=composition_data.overhead,
+        total_price=0
+    )
+    _replace_items(composition, composition_data.items)
+    
+    db.add(composition)
+    
+    # Calculer le prix
+    _apply_prices([composition], db)
+    
+    db.commit()
+    
+    composition = _get_composition(str(composition.id), db)
+    _resolve_items([composition], db)
+    
+    return composition
+
+
+@router.put("/{composition_id}", response_model=Composition)
+async def update_composition(
+    composition_id: str,
+    composition_data: CompositionUpdate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Mettre à jour une composition et recalculer les prix
+    
+    Si `items` est fourni, il remplace la liste complète des items.
+    Les compositions qui contiennent celle-ci sont recalculées.
+    """
+    composition = _get_composition(composition_id, db)
+    
+    # Vérifier le code unique si modifié
+    if composition_data.code and composition_data.code != composition.code:
+        existing = db.query(CompositionModel).filter(CompositionModel.code == composition_data.code).first()
+        if existing:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Une composition avec le code '{composition_data.code}' existe déjà"
+            )
+    
+    # Mettre à jour les champs
+    update_data = composition_data.model_dump(exclude_unset=True, exclude={'items'})
+    
+    for field, value in update_data.items():
+        setattr(composition, field, value)
+    
+    if composition_data.items is not None:
+        _validate_items(composition_data.items, db, composition.id)
+        _replace_items(composition, composition_data.items)
+    
+    composition.updated_at = datetime.utcnow().isoformat()
+    
+    # Recalculer les prix (et détecter les cycles)
+    _apply_prices([composition], db)
+    
+    # Répercuter sur les compositions parentes
+    RepricingService.reprice_dependents(db, composition_ids=[composition.id])
+    
+    db.commit()
+    
+    composition = _get_composition(composition_id, db)
+    _resolve_items([composition], db)
+    
+    return composition
+
+
+@router.post("/{composition_id}/recalculate", response_model=Composition)
+async def recalculate_composition_price(
+    composition_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Recalculer le prix d'une composition
+    
+    Utile quand les prix des matériaux ou des articles ont changé
+    """
+    composition = _get_composition(composition_id, db)
+    
+    # Recalculer
+    _apply_prices([composition], db)
+    composition.updated_at = datetime.utcnow().isoformat()
+    
+    RepricingService.reprice_dependents(db, composition_ids=[composition.id])
+    
+    db.commit()
+    
+    composition = _get_composition(composition_id, db)
+    _resolve_items([composition], db)
+    
+    return composition
+
+
+@router.delete("/{composition_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_composition(
+    composition_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Supprimer une composition (soft delete)"""
+    composition = db.query(CompositionModel).filter(CompositionModel.id == composition_id).first()
+    
+    if not composition:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Composition non trouvée"
+        )
+    
+    # Soft delete
+    composition.is_active = False
+    composition.updated_at = datetime.utcnow().isoformat()
+    
+    db.commit()
+    
+    return None
@@ -0,0 +1,98 @@
+"""
+Routes API pour l'export du catalogue
+"""
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from datetime import date
+
+from app.services.catalog_export import CatalogExportService
+from app.api.dependencies import get_current_user
+from app.models.user import User
+
+
+router = APIRouter()
+
+
+MEDIA_TYPES = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _export(kind: str, format: str, include: str, active_only: bool) -> StreamingResponse:
+    """
+    Réponse en flux d'un export
+    
+    Le flux ouvre sa propre session : celle de la requête est fermée avant
+    l'envoi de la réponse.
+    """
+    if format == "csv":
+        sheet, = CatalogExportService.sheets(kind, include, active_only, flat=True)
+        content = CatalogExportService.stream_csv(sheet)
+    else:
+        content = CatalogExportService.stream_xlsx(CatalogExportService.sheets(kind, include, active_only))
+    
+    filename = f"{kind}_{date.today().isoformat()}.{format}"
+    return StreamingResponse(
+        content,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/materials")
+def export_materials(
+    format: str = Query("xlsx", pattern="^(xlsx|csv)$"),
+    active_only: bool = True,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Exporter tous les matériaux
+    
+    Les colonnes sont celles de l'import Excel : le fichier peut être
+    modifié puis réimporté.
+    """
+    return _export("materials", format, "none", active_only)
+
+
+@router.get("/articles")
+def export_articles(
+    format: str = Query("xlsx", pattern="^(xlsx|csv)$"),
+    include: str = Query("none", pattern="^(bom|none)$"),
+    active_only: bool = True,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Exporter tous les articles
+    
+    - **include**: `bom` pour ajouter les nomenclatures (feuille
+      Nomenclatures en xlsx, une ligne par ligne de nomenclature en csv)
+    """
+    return _export("articles", format, include, active_only)
+
+
+@router.get("/compositions")
+def export_compositions(
+    format: str = Query("xlsx", pattern="^(xlsx|csv)$"),
+    include: str = Query("none", pattern="^(items|none)$"),
+    active_only: bool = True,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Exporter toutes les compositions
+    
+    - **include**: `items` pour ajouter les éléments (feuille Éléments en
+      xlsx, une ligne par élément en csv)
+    """
+    return _export("compositions", format, include, active_only)
+
+
+@router.get("/services")
+def export_services(
+    format: str = Query("xlsx", pattern="^(xlsx|csv)$"),
+    active_only: bool = True,
+    current_user: User = Depends(get_current_user)
+):
+    """Exporter tous les services"""
+    return _export("services", format, "none", active_only)
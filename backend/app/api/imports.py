@@ -2,13 +2,27 @@
 Routes API pour l'import de données
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query
 from sqlalchemy.orm import Session
+from typing import Dict, Optional, Tuple
+import json
 import os
-import tempfile
+import uuid
 
+from app.config import settings
 from app.database import get_db
 from app.services.excel_import import ExcelImportService
+from app.services.import_jobs import ImportJobService, ImportLockedError, IMPORTS
+from app.services.workbook_import import WorkbookImportService
+from app.services.import_files import ImportFileService
+from app.services.csv_import import CsvImportService
+from app.utils.files import (
+    EXCEL_SIGNATURES,
+    TEXT_SUFFIXES,
+    InvalidFileTypeError,
+    UploadTooLargeError,
+    save_upload_stream
+)
 from app.api.dependencies import get_current_active_admin
 from app.models.user import User
 
@@ -16,8 +30,202 @@ from app.models.user import User
 router = APIRouter()
 
 
+def _save_upload(file: UploadFile) -> Tuple[str, str]:
+    """
+    Copier le fichier envoyé sur disque par blocs, sans le charger en mémoire
+    
+    Le contenu doit correspondre à l'extension (premiers octets) et ne pas
+    dépasser settings.IMPORT_MAX_UPLOAD_MB.
+    
+    Returns:
+        Tuple (chemin du fichier temporaire, empreinte SHA-256)
+    """
+    suffix = os.path.splitext(file.filename or '')[1].lower()
+    if suffix not in EXCEL_SIGNATURES and suffix not in TEXT_SUFFIXES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Le fichier doit être au format Excel (.xlsx ou .xls) ou CSV"
+        )
+    
+    max_bytes = settings.IMPORT_MAX_UPLOAD_MB * 1024 * 1024
+    
+    try:
+        # Taille annoncée : refuser avant toute copie
+        if file.size is not None and file.size > max_bytes:
+            raise UploadTooLargeError(max_bytes)
+        return save_upload_stream(file.file, suffix, max_bytes)
+    except UploadTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+    except InvalidFileTypeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail=str(e)
+        )
+
+
+def _is_csv(file: UploadFile) -> bool:
+    """Liste de prix CSV (import par COPY) plutôt que classeur Excel"""
+    return file.filename.lower().endswith('.csv')
+
+
+def _check_mode(file: UploadFile, mode: str) -> None:
+    """Le mode streaming lit le fichier avec openpyxl : .xlsx uniquement"""
+    if mode == "streaming" and not file.filename.lower().endswith('.xlsx'):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Le mode streaming nécessite un fichier .xlsx"
+        )
+
+
+def _parse_sheet_kinds(sheets: Optional[str]) -> Optional[Dict[str, str]]:
+    """Lire l'association {feuille: type} du paramètre sheets ou lever une 400"""
+    if not sheets:
+        return None
+    
+    invalid = HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Le paramètre sheets doit être un objet JSON"
+    )
+    try:
+        sheet_kinds = json.loads(sheets)
+    except ValueError:
+        raise invalid
+    
+    if not isinstance(sheet_kinds, dict) or not all(
+        isinstance(name, str) and isinstance(kind, str) for name, kind in sheet_kinds.items()
+    ):
+        raise invalid
+    
+    return sheet_kinds
+
+
+def _acquire_table(kind: str, owner: str) -> None:
+    """Réserver la table d'un import ou lever une 409"""
+    try:
+        ImportJobService.acquire_table(IMPORTS[kind][0], owner)
+    except ImportLockedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+
+
+def _check_sheet(tmp_path: str, sheet_name: str, file_hash: Optional[str] = None) -> None:
+    """Vérifier la feuille demandée (structure mise en cache) ou lever une 400"""
+    if tmp_path.endswith('.csv'):
+        # Un CSV n'a qu'une feuille
+        return
+    
+    try:
+        ExcelImportService.check_sheet(tmp_path, sheet_name, file_hash)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+def _record_import(
+    db: Session,
+    file_hash: str,
+    kind: str,
+    sheet_name: Optional[str],
+    filename: str,
+    result: dict,
+    user: User
+) -> None:
+    """Mémoriser un import complet (sans bloc en échec) pour ignorer les ré-envois identiques"""
+    if result.get("failed_chunks"):
+        return
+    
+    ImportFileService.record(db, file_hash, kind, sheet_name, filename, result, str(user.id))
+    db.commit()
+
+
+def _submit_job(
+    kind: str,
+    file: UploadFile,
+    sheet_name: str,
+    mode: str,
+    chunk_size: Optional[int],
+    force: bool,
+    db: Session,
+    user: User,
+    options: Optional[dict] = None
+) -> dict:
+    """Sauvegarder le fichier et soumettre l'import au pool de workers"""
+    tmp_path, file_hash = _save_upload(file)
+    
+    try:
+        previous = None if force else ImportFileService.find(db, file_hash, kind, sheet_name)
+        if previous:
+            os.unlink(tmp_path)
+            return ImportFileService.skipped_response(previous)
+        
+        _check_sheet(tmp_path, sheet_name, file_hash)
+        job = ImportJobService.submit(
+            kind,
+            tmp_path,
+            file.filename,
+            sheet_name,
+            mode=mode,
+            chunk_size=chunk_size,
+            user_id=str(user.id),
+            file_hash=file_hash,
+            options=options
+        )
+    except ImportLockedError as e:
+        os.unlink(tmp_path)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except Exception:
+        os.unlink(tmp_path)
+        raise
+    
+    return {
+        "message": "Import lancé",
+        "job": job
+    }
+
+
+def _dry_run(kind: str, file: UploadFile, sheet_name: str, db: Session) -> dict:
+    """Valider le fichier et retourner le rapport de changements, sans écriture"""
+    tmp_path = None
+    
+    try:
+        tmp_path, file_hash = _save_upload(file)
+        _check_sheet(tmp_path, sheet_name, file_hash)
+        
+        report = ExcelImportService.dry_run(tmp_path, db, kind, sheet_name)
+        
+        return {
+            "message": "Validation terminée, aucune donnée modifiée",
+            "report": report,
+            "file": file.filename
+        }
+    
+    except HTTPException:
+        raise
+    
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erreur lors de la validation: {str(e)}"
+        )
+    
+    finally:
+        db.rollback()
+        if tmp_path and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
 @router.post("/excel/detect-structure")
-async def detect_excel_structure(
+def detect_excel_structure(
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_active_admin)
 ):
@@ -34,35 +242,44 @@ async def detect_excel_structure(
             detail="Le fichier doit être au format Excel (.xlsx ou .xls)"
         )
     
+    tmp_path = None
+    
     try:
         # Sauvegarder temporairement le fichier
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
-            content = await file.read()
-            tmp_file.write(content)
-            tmp_path = tmp_file.name
+        tmp_path, file_hash = _save_upload(file)
         
         #Analyser la structure
-        structure = ExcelImportService.detect_excel_structure(tmp_path)
-        
-        # Nettoyer
-        os.unlink(tmp_path)
+        structure = ExcelImportService.detect_excel_structure(tmp_path, file_hash)
         
         return {
             "filename": file.filename,
             "sheets": structure
         }
     
+    except HTTPException:
+        raise
+    
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erreur lors de l'analyse du fichier: {str(e)}"
         )
+    
+    finally:
+        # Nettoyer
+        if tmp_path and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
 
 
 @router.post("/excel/materials")
-async def import_materials_from_excel(
+def import_materials_from_excel(
     file: UploadFile = File(...),
     sheet_name: str = "Matériaux",
+    mode: str = Query("standard", pattern="^(standard|streaming)$"),
+    chunk_size: Optional[int] = Query(None, ge=100, le=100000),
+    background: bool = False,
+    force: bool = False,
+    dry_run: bool = False,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_admin)
 ):
@@ -72,30 +289,76 @@ async def import_materials_from_excel(
     Format attendu :
     - Code | Nom FR | Nom RO | Unité | Prix EUR | Prix LEI | Fournisseur
     
+    - **mode**: `standard` (feuille chargée en entier, une transaction) ou
+      `streaming` (.xlsx lu par blocs de chunk_size lignes, un commit par bloc)
+    - **background**: exécuter l'import dans un worker et retourner un job
+      à suivre via /api/import/jobs/{job_id}
+    - **force**: réimporter même si ce fichier a déjà été importé à l'identique
+    - **dry_run**: valider toute la feuille et retourner les erreurs par ligne
+      et les changements prévus, sans rien écrire
+    
+    Seules les lignes nouvelles ou modifiées sont écrites (statistiques
+    created / updated / unchanged).
+    
+    Un fichier .csv (mêmes colonnes, séparateur `;` `,` ou tabulation) est
+    chargé par COPY dans une table de staging puis fusionné en SQL.
+    
+    Un seul import à la fois par table (409 sinon).
+    
     Requiert: Admin seulement
     """
-    if not file.filename.endswith(('.xlsx', '.xls')):
+    if not file.filename.lower().endswith(('.xlsx', '.xls', '.csv')):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Le fichier doit être au format Excel (.xlsx ou .xls)"
+            detail="Le fichier doit être au format Excel (.xlsx ou .xls) ou CSV"
         )
     
+    _check_mode(file, mode)
+    
+    if dry_run:
+        if _is_csv(file):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Le mode dry_run nécessite un fichier Excel"
+            )
+        return _dry_run("materials", file, sheet_name, db)
+    
+    if background:
+        return _submit_job("materials", file, sheet_name, mode, chunk_size, force, db, current_user)
+    
+    owner = str(uuid.uuid4())
+    _acquire_table("materials", owner)
+    tmp_path = None
+    
     try:
         # Sauvegarder temporairement le fichier
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
-            content = await file.read()
-            tmp_file.write(content)
-            tmp_path = tmp_file.name
+        tmp_path, file_hash = _save_upload(file)
+        
+        # Fichier identique déjà importé : rien à faire
+        previous = None if force else ImportFileService.find(db, file_hash, "materials", sheet_name)
+        if previous:
+            return ImportFileService.skipped_response(previous)
+        
+        _check_sheet(tmp_path, sheet_name, file_hash)
         
         # Importer
-        result = ExcelImportService.import_materials_from_excel(
-            tmp_path,
-            db,
-            sheet_name=sheet_name
-        )
+        if _is_csv(file):
+            result = CsvImportService.import_materials(tmp_path, db)
+        elif mode == "streaming":
+            result = ExcelImportService.import_materials_streaming(
+                tmp_path,
+                db,
+                sheet_name=sheet_name,
+                chunk_size=chunk_size
+            )
+        else:
+            result = ExcelImportService.import_materials_from_excel(
+                tmp_path,
+                db,
+                sheet_name=sheet_name
+            )
         
-        # Nettoyer
-        os.unlink(tmp_path)
+        _record_import(db, file_hash, "materials", sheet_name, file.filename, result, current_user)
         
         return {
             "message": "Import réussi",
@@ -104,17 +367,31 @@ async def import_materials_from_excel(
             "sheet": sheet_name
         }
     
+    except HTTPException:
+        raise
+    
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erreur lors de l'import: {str(e)}"
         )
+    
+    finally:
+        # Nettoyer
+        ImportJobService.release_table("materials", owner)
+        if tmp_path and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
 
 
 @router.post("/excel/services")
-async def import_services_from_excel(
+def import_services_from_excel(
     file: UploadFile = File(...),
     sheet_name: str = "Services",
+    mode: str = Query("standard", pattern="^(standard|streaming)$"),
+    chunk_size: Optional[int] = Query(None, ge=100, le=100000),
+    background: bool = False,
+    force: bool = False,
+    dry_run: bool = False,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_admin)
 ):
@@ -124,6 +401,128 @@ async def import_services_from_excel(
     Format attendu :
     - Code | Nom | Unité | Prix Net | Prix Brut
     
+    - **mode**: `standard` (feuille chargée en entier, une transaction) ou
+      `streaming` (.xlsx lu par blocs de chunk_size lignes, un commit par bloc)
+    - **background**: exécuter l'import dans un worker et retourner un job
+      à suivre via /api/import/jobs/{job_id}
+    - **force**: réimporter même si ce fichier a déjà été importé à l'identique
+    - **dry_run**: valider toute la feuille et retourner les erreurs par ligne
+      et les changements prévus, sans rien écrire
+    
+    Seules les lignes nouvelles ou modifiées sont écrites (statistiques
+    created / updated / unchanged).
+    
+    Un fichier .csv (mêmes colonnes, séparateur `;` `,` ou tabulation) est
+    chargé par COPY dans une table de staging puis fusionné en SQL.
+    
+    Un seul import à la fois par table (409 sinon).
+    
+    Requiert: Admin seulement
+    """
+    if not file.filename.lower().endswith(('.xlsx', '.xls', '.csv')):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Le fichier doit être au format Excel (.xlsx ou .xls) ou CSV"
+        )
+    
+    _check_mode(file, mode)
+    
+    if dry_run:
+        if _is_csv(file):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Le mode dry_run nécessite un fichier Excel"
+            )
+        return _dry_run("services", file, sheet_name, db)
+    
+    if background:
+        return _submit_job("services", file, sheet_name, mode, chunk_size, force, db, current_user)
+    
+    owner = str(uuid.uuid4())
+    _acquire_table("services", owner)
+    tmp_path = None
+    
+    try:
+        # Sauvegarder temporairement le fichier
+        tmp_path, file_hash = _save_upload(file)
+        
+        # Fichier identique déjà importé : rien à faire
+        previous = None if force else ImportFileService.find(db, file_hash, "services", sheet_name)
+        if previous:
+            return ImportFileService.skipped_response(previous)
+        
+        _check_sheet(tmp_path, sheet_name, file_hash)
+        
+        # Importer
+        if _is_csv(file):
+            result = CsvImportService.import_services(tmp_path, db)
+        elif mode == "streaming":
+            result = ExcelImportService.import_services_streaming(
+                tmp_path,
+                db,
+                sheet_name=sheet_name,
+                chunk_size=chunk_size
+            )
+        else:
+            result = ExcelImportService.import_services_from_excel(
+                tmp_path,
+                db,
+                sheet_name=sheet_name
+            )
+        
+        _record_import(db, file_hash, "services", sheet_name, file.filename, result, current_user)
+        
+        return {
+            "message": "Import réussi",
+            "statistics": result,
+            "file": file.filename,
+            "sheet": sheet_name
+        }
+    
+    except HTTPException:
+        raise
+    
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erreur lors de l'import: {str(e)}"
+        )
+    
+    finally:
+        # Nettoyer
+        ImportJobService.release_table("services", owner)
+        if tmp_path and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+@router.post("/excel/articles")
+def import_articles_from_excel(
+    file: UploadFile = File(...),
+    sheet_name: str = "Articles",
+    bom_sheet_name: Optional[str] = "Nomenclatures",
+    background: bool = False,
+    force: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_admin)
+):
+    """
+    Importer des articles et leurs nomenclatures depuis un fichier Excel
+    
+    Format attendu :
+    - Feuille Articles : Code | Nom | Description | Unité | Main d'œuvre | Frais généraux | Marge
+    - Feuille Nomenclatures : Code article | Code matériau | Quantité | Perte
+    
+    La nomenclature d'un article présent dans la feuille remplace la
+    nomenclature existante. Les prix sont recalculés une seule fois pour
+    tous les articles importés.
+    
+    - **bom_sheet_name**: feuille des nomenclatures (vide = en-têtes seuls)
+    - **background**: exécuter l'import dans un worker et retourner un job
+      à suivre via /api/import/jobs/{job_id}
+    - **force**: réimporter même si ce fichier a déjà été importé à l'identique
+    
+    Un seul import à la fois par table (409 sinon).
+    
     Requiert: Admin seulement
     """
     if not file.filename.endswith(('.xlsx', '.xls')):
@@ -132,22 +531,40 @@ async def import_services_from_excel(
             detail="Le fichier doit être au format Excel (.xlsx ou .xls)"
         )
     
+    bom_sheet_name = bom_sheet_name or None
+    
+    if background:
+        return _submit_job(
+            "articles", file, sheet_name, "standard", None, force, db, current_user,
+            options={"bom_sheet_name": bom_sheet_name}
+        )
+    
+    owner = str(uuid.uuid4())
+    _acquire_table("articles", owner)
+    tmp_path = None
+    
     try:
         # Sauvegarder temporairement le fichier
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx') as tmp_file:
-            content = await file.read()
-            tmp_file.write(content)
-            tmp_path = tmp_file.name
+        tmp_path, file_hash = _save_upload(file)
+        
+        # Fichier identique déjà importé : rien à faire
+        previous = None if force else ImportFileService.find(db, file_hash, "articles", sheet_name)
+        if previous:
+            return ImportFileService.skipped_response(previous)
+        
+        _check_sheet(tmp_path, sheet_name, file_hash)
+        if bom_sheet_name:
+            _check_sheet(tmp_path, bom_sheet_name, file_hash)
         
         # Importer
-        result = ExcelImportService.import_services_from_excel(
+        result = ExcelImportService.import_articles_from_excel(
             tmp_path,
             db,
-            sheet_name=sheet_name
+            sheet_name=sheet_name,
+            bom_sheet_name=bom_sheet_name
         )
         
-        # Nettoyer
-        os.unlink(tmp_path)
+        _record_import(db, file_hash, "articles", sheet_name, file.filename, result, current_user)
         
         return {
             "message": "Import réussi",
@@ -156,8 +573,151 @@ async def import_services_from_excel(
             "sheet": sheet_name
         }
     
+    except HTTPException:
+        raise
+    
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Erreur lors de l'import: {str(e)}"
+        )
+    
+    finally:
+        # Nettoyer
+        ImportJobService.release_table("articles", owner)
+        if tmp_path and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+@router.post("/excel/workbook")
+def import_workbook(
+    file: UploadFile = File(...),
+    sheets: Optional[str] = None,
+    force: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_admin)
+):
+    """
+    Importer toutes les feuilles de la matrice de prix en une opération
+    
+    Les feuilles sont reconnues d'après leurs en-têtes (Prix EUR → matériaux,
+    Main d'œuvre → articles, Code article / Code matériau → nomenclatures,
+    Prix Net / Prix Brut → services), lues en parallèle puis appliquées dans
+    l'ordre des dépendances, en une seule transaction.
+    
+    - **sheets**: association explicite en JSON, ex: `{"Matériaux": "materials"}`
+    - **force**: réimporter même si ce classeur a déjà été importé à l'identique
+    
+    Retourne les statistiques et durées de chaque feuille.
+    
+    Requiert: Admin seulement
+    """
+    if not file.filename.endswith(('.xlsx', '.xls')):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Le fichier doit être au format Excel (.xlsx ou .xls)"
+        )
+    
+    sheet_kinds = _parse_sheet_kinds(sheets)
+    
+    owner = str(uuid.uuid4())
+    locked = []
+    tmp_path = None
+    
+    try:
+        for kind in IMPORTS:
+            _acquire_table(kind, owner)
+            locked.append(kind)
+        
+        # Sauvegarder temporairement le fichier
+        tmp_path, file_hash = _save_upload(file)
+        
+        # Classeur identique déjà importé : rien à faire
+        previous = None if force else ImportFileService.find(db, file_hash, "workbook", sheets)
+        if previous:
+            return ImportFileService.skipped_response(previous)
+        
+        try:
+            WorkbookImportService.plan(tmp_path, sheet_kinds)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        
+        # Importer
+        result = WorkbookImportService.import_workbook(tmp_path, db, sheet_kinds)
+        _record_import(db, file_hash, "workbook", sheets, file.filename, result, current_user)
+        
+        return {
+            "message": "Import réussi",
+            "statistics": result,
+            "file": file.filename
+        }
+    
+    except HTTPException:
+        raise
+    
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Erreur lors de l'import: {str(e)}"
         )
+    
+    finally:
+        # Nettoyer
+        for kind in locked:
+            ImportJobService.release_table(IMPORTS[kind][0], owner)
+        if tmp_path and os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+# ========== JOBS ==========
+
+@router.get("/jobs/{job_id}")
+def get_import_job(
+    job_id: str,
+    current_user: User = Depends(get_current_active_admin)
+):
+    """
+    Suivre un import en arrière-plan
+    
+    Retourne le statut (queued, running, completed, failed, cancelled),
+    la progression en %, les lignes traitées et les statistiques.
+    
+    Requiert: Admin seulement
+    """
+    job = ImportJobService.get(job_id)
+    
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import non trouvé"
+        )
+    
+    return job
+
+
+@router.post("/jobs/{job_id}/cancel")
+def cancel_import_job(
+    job_id: str,
+    current_user: User = Depends(get_current_active_admin)
+):
+    """
+    Annuler un import en arrière-plan
+    
+    En mode streaming, l'import s'arrête à la fin du bloc en cours ; les
+    blocs déjà validés restent en base. En mode standard, seul un job pas
+    encore démarré peut être annulé.
+    
+    Requiert: Admin seulement
+    """
+    job = ImportJobService.cancel(job_id)
+    
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import non trouvé"
+        )
+    
+    return job
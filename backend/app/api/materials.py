@@ -2,63 +2,107 @@
 Routes API pour les matériaux
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 import uuid
 from datetime import datetime
 
 from app.database import get_db
-from app.schemas.catalog import Material, MaterialCreate, MaterialUpdate
+from app.schemas.catalog import Material, MaterialCreate, MaterialUpdate, MaterialPricePoint, MaterialPriceAt
 from app.models.material import Material as MaterialModel
+from app.services.repricing import RepricingService
+from app.services.price_calculator import PriceCalculator
+from app.services.exchange_rates import ExchangeRateService
+from app.services.catalog_search import normalized_term
+from app.services.price_history import PriceHistoryService
 from app.api.dependencies import get_current_user
+from app.api.pagination import paginate, SORT_PATTERN
+from app.api.caching import cache_response, cached_response, catalog_etag
 from app.models.user import User
 
 
 router = APIRouter()
 
+# Réponses revalidées par ETag et mises en cache sous cet ETag
+material_etag = Depends(catalog_etag("materials"))
+
 
 @router.get("/", response_model=List[Material])
 async def list_materials(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
+    sort: str = Query("code", pattern=SORT_PATTERN),
+    cursor: Optional[str] = None,
     active_only: bool = True,
     search: Optional[str] = None,
+    etag: str = material_etag,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Lister les matériaux
     
-    - **skip**: Nombre d'éléments à sauter (pagination)
+    - **skip**: Nombre d'éléments à sauter (compatibilité, préférer `cursor`)
     - **limit**: Nombre maximum d'éléments à retourner
+    - **sort**: `code` ou `updated_at`, préfixé de `-` pour l'ordre décroissant
+    - **cursor**: Curseur reçu dans l'en-tête X-Next-Cursor ou X-Prev-Cursor
     - **active_only**: Ne retourner que les matériaux actifs
     - **search**: Rechercher dans le code ou le nom
     """
+    cached = cached_response(etag)
+    if cached is not None:
+        return cached
+    
     query = db.query(MaterialModel)
     
     if active_only:
         query = query.filter(MaterialModel.is_active == True)
     
     if search:
-        search_filter = f"%{search}%"
-        query = query.filter(
-            (MaterialModel.code.ilike(search_filter)) |
-            (MaterialModel.name_fr.ilike(search_filter)) |
-            (MaterialModel.name_ro.ilike(search_filter))
-        )
+        # Sans accents ni casse, servi par l'index trigrammes de search_text
+        query = query.filter(MaterialModel.search_text.contains(normalized_term(search)))
+    
+    materials = paginate(query, MaterialModel, response, sort, cursor, skip, limit)
+    return cache_response(etag, List[Material], materials, response)
+
+
+@router.get("/prices-at", response_model=List[MaterialPriceAt])
+async def get_prices_at(
+    at: datetime,
+    material_ids: List[str] = Query(...),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Prix de plusieurs matériaux en vigueur à une date
     
-    materials = query.offset(skip).limit(limit).all()
-    return materials
+    - **at**: Date de référence (ex. date d'un devis)
+    - **material_ids**: Matériaux recherchés (paramètre répété)
+    
+    Les matériaux sans prix à cette date sont absents de la réponse.
+    """
+    prices = PriceHistoryService.prices_at(db, material_ids, at)
+    return [
+        MaterialPriceAt(material_id=str(material_id), **price)
+        for material_id, price in prices.items()
+    ]
 
 
 @router.get("/{material_id}", response_model=Material)
 async def get_material(
     material_id: str,
+    response: Response,
+    etag: str = material_etag,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Récupérer un matériau par ID"""
+    cached = cached_response(etag)
+    if cached is not None:
+        return cached
+    
     material = db.query(MaterialModel).filter(MaterialModel.id == material_id).first()
     
     if not material:
@@ -67,7 +111,33 @@ async def get_material(
             detail="Matériau non trouvé"
         )
     
-    return material
+    return cache_response(etag, Material, material, response)
+
+
+@router.get("/{material_id}/price-history", response_model=List[MaterialPricePoint])
+async def get_price_history(
+    material_id: str,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Série chronologique des prix d'un matériau
+    
+    - **start**: Début de la période ; la série commence par le prix en
+      vigueur à cette date
+    - **end**: Fin de la période
+    """
+    material = db.query(MaterialModel.id).filter(MaterialModel.id == material_id).first()
+    
+    if not material:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Matériau non trouvé"
+        )
+    
+    return PriceHistoryService.series(db, material_id, start, end)
 
 
 @router.post("/", response_model=Material, status_code=status.HTTP_201_CREATED)
@@ -95,7 +165,20 @@ async def create_material(
         **material_data.model_dump()
     )
     
+    # Calculer le prix LEI si non fourni
+    if material.price_lei is None:
+        material.price_lei = PriceCalculator.convert_eur_to_lei(
+            material.price_eur,
+            ExchangeRateService.get_current_rate(db)
+        )
+    
     db.add(material)
+    db.flush()
+    PriceHistoryService.record(
+        db,
+        [{"id": material.id, "price_eur": material.price_eur, "price_lei": material.price_lei}],
+        "api"
+    )
     db.commit()
     db.refresh(material)
     
@@ -138,11 +221,32 @@ async def update_material(
     if 'price_eur' in update_data or 'price_lei' in update_data:
         update_data['price_date'] = datetime.utcnow().isoformat()
     
+    # Recalculer le prix LEI si seul le prix EUR est fourni
+    if update_data.get('price_eur') is not None and 'price_lei' not in update_data:
+        update_data['price_lei'] = PriceCalculator.convert_eur_to_lei(
+            update_data['price_eur'],
+            ExchangeRateService.get_current_rate(db)
+        )
+    
+    previous_price = (material.price_eur, material.price_lei)
+    
     for field, value in update_data.items():
         setattr(material, field, value)
     
+    # Historiser le prix s'il a changé
+    if (material.price_eur, material.price_lei) != previous_price:
+        PriceHistoryService.record(
+            db,
+            [{"id": material.id, "price_eur": material.price_eur, "price_lei": material.price_lei}],
+            "api"
+        )
+    
     material.updated_at = datetime.utcnow().isoformat()
     
+    # Répercuter le nouveau prix sur les articles et compositions dépendants
+    if 'price_eur' in update_data:
+        RepricingService.reprice_dependents(db, material_ids=[material.id])
+    
     db.commit()
     db.refresh(material)
     
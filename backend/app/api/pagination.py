@@ -0,0 +1,125 @@
+"""
+Pagination par curseur (keyset) des listes du catalogue
+"""
+
+import base64
+import binascii
+import json
+from typing import Any, List, Optional, Tuple
+import uuid
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+
+# Tri -> colonnes de la clé (uniques ensemble, couvertes par un index)
+SORT_KEYS = {
+    "code": ("code",),
+    "updated_at": ("updated_at", "id"),
+}
+
+# Valeurs acceptées pour le paramètre sort ("-" = décroissant)
+SORT_PATTERN = "^-?(code|updated_at)$"
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+PREV_CURSOR_HEADER = "X-Prev-Cursor"
+
+
+def _encode_cursor(sort: str, direction: str, item: Any) -> str:
+    """Curseur opaque : tri, sens et clé de l'élément en JSON base64url"""
+    key = [str(getattr(item, name)) for name in SORT_KEYS[sort.lstrip("-")]]
+    raw = json.dumps({"s": sort, "d": direction, "k": key}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort: str) -> Tuple[str, List[Any]]:
+    """
+    Lire un curseur produit par _encode_cursor
+    
+    Returns:
+        Tuple (sens "next" ou "prev", valeurs de la clé)
+    
+    Raises:
+        HTTPException 400 si le curseur est invalide ou d'un autre tri
+    """
+    invalid = HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Curseur de pagination invalide"
+    )
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        direction, key = data["d"], data["k"]
+        names = SORT_KEYS[sort.lstrip("-")]
+        if data["s"] != sort or direction not in ("next", "prev") or len(key) != len(names):
+            raise invalid
+        values = [uuid.UUID(value) if name == "id" else value for name, value in zip(names, key)]
+    except (binascii.Error, ValueError, KeyError, TypeError, AttributeError):
+        raise invalid
+    
+    return direction, values
+
+
+def paginate(
+    query: Query,
+    model,
+    response: Response,
+    sort: str = "code",
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100
+) -> List[Any]:
+    """
+    Lire une page d'une liste dans un ordre déterministe
+    
+    Avec un curseur, la page commence après (ou avant) la clé qu'il
+    contient : un parcours d'index, de coût constant quelle que soit la
+    profondeur. Sans curseur, `skip` reste accepté pour compatibilité.
+    Les curseurs des pages suivante et précédente sont renvoyés dans les
+    en-têtes X-Next-Cursor et X-Prev-Cursor (absents en bout de liste).
+    
+    Args:
+        query: Requête filtrée, sans tri ni limite
+        model: Modèle listé
+        response: Réponse FastAPI (en-têtes des curseurs)
+        sort: code, updated_at, -code ou -updated_at
+        cursor: Curseur reçu d'une page précédente
+        skip: Nombre d'éléments à sauter (sans curseur)
+        limit: Taille de la page
+    
+    Returns:
+        Éléments de la page, dans l'ordre demandé
+    """
+    descending = sort.startswith("-")
+    columns = [getattr(model, name) for name in SORT_KEYS[sort.lstrip("-")]]
+    key = tuple_(*columns) if len(columns) > 1 else columns[0]
+    
+    direction, values = _decode_cursor(cursor, sort) if cursor else ("next", None)
+    
+    # Page précédente : parcours en sens inverse, remis dans l'ordre ensuite
+    backwards = (direction == "prev") != descending
+    if values is not None:
+        value = tuple_(*values) if len(values) > 1 else values[0]
+        query = query.filter(key < value if backwards else key > value)
+    
+    query = query.order_by(*[column.desc() if backwards else column.asc() for column in columns])
+    if not cursor and skip:
+        query = query.offset(skip)
+    
+    items = query.limit(limit + 1).all()
+    has_more = len(items) > limit
+    items = items[:limit]
+    
+    if direction == "next":
+        has_next, has_prev = has_more, bool(cursor or skip)
+    else:
+        items.reverse()
+        has_next, has_prev = True, has_more
+    
+    if items and has_next:
+        response.headers[NEXT_CURSOR_HEADER] = _encode_cursor(sort, "next", items[-1])
+    if items and has_prev:
+        response.headers[PREV_CURSOR_HEADER] = _encode_cursor(sort, "prev", items[0])
+    
+    return items
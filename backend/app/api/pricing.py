@@ -0,0 +1,147 @@
+"""
+Routes API pour le calcul des prix du catalogue
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import List
+from datetime import date
+
+from app.database import get_db
+from app.schemas.pricing import (
+    SimulationRequest, SimulationResponse,
+    ExchangeRate, ExchangeRateCreate, ExchangeRatePublished
+)
+from app.services.catalog_reprice import CatalogRepriceService
+from app.services.exchange_rates import ExchangeRateService
+from app.services.price_simulation import PriceSimulationService
+from app.services.pricing_graph import PricingCycleError
+from app.api.dependencies import get_current_user, get_current_active_admin
+from app.models.user import User
+
+
+router = APIRouter()
+
+
+@router.post("/reprice-all")
+async def reprice_all(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_admin)
+):
+    """
+    Recalculer les prix de tout le catalogue
+    
+    Calcul vectorisé de tous les articles puis de toutes les compositions,
+    écrit en une requête UPDATE par table. Retourne les durées de chaque étape.
+    
+    Requiert: Admin seulement
+    """
+    result = CatalogRepriceService.reprice_all(db)
+    db.commit()
+    
+    return {
+        "message": "Recalcul terminé",
+        "statistics": result
+    }
+
+
+@router.post("/simulate", response_model=SimulationResponse)
+async def simulate_prices(
+    request: SimulationRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Simuler des prix sans modifier la base de données
+    
+    Exemple : « OSB +12 % et marge des cabanes à 25 % » :
+    - **material_prices**: [{"code": "OSB18", "change_percent": 12}]
+    - **article_markups**: [{"code_prefix": "CAB", "margin": 0.25}]
+    
+    Retourne l'écart de prix de chaque article/composition impacté,
+    trié par écart absolu décroissant.
+    """
+    try:
+        return PriceSimulationService.simulate(db, request)
+    except PricingCycleError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+# ========== TAUX DE CHANGE ==========
+
+@router.get("/exchange-rates", response_model=List[ExchangeRate])
+async def list_exchange_rates(
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Lister l'historique des taux EUR → LEI, du plus récent au plus ancien
+    """
+    return ExchangeRateService.list_rates(db, limit=limit)
+
+
+@router.get("/exchange-rates/current")
+async def get_current_exchange_rate(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Récupérer le taux EUR → LEI en vigueur aujourd'hui
+    """
+    return {"currency": "LEI", "rate": ExchangeRateService.get_current_rate(db)}
+
+
+@router.post("/exchange-rates", response_model=ExchangeRatePublished, status_code=status.HTTP_201_CREATED)
+async def publish_exchange_rate(
+    rate_data: ExchangeRateCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_admin)
+):
+    """
+    Publier un taux EUR → LEI
+    
+    - **rate**: 1 EUR = rate LEI
+    - **effective_date**: Date d'effet (aujourd'hui par défaut)
+    
+    Les prix LEI des matériaux, articles, compositions et services sont
+    recalculés avec le taux en vigueur, en une requête UPDATE par table.
+    Un taux à date future sera appliqué via /exchange-rates/apply.
+    
+    Requiert: Admin seulement
+    """
+    result = ExchangeRateService.publish_rate(db, rate_data.rate, rate_data.effective_date)
+    db.commit()
+    db.refresh(result["exchange_rate"])
+    
+    return result
+
+
+@router.post("/exchange-rates/apply")
+async def apply_exchange_rate(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_admin)
+):
+    """
+    Recalculer tous les prix LEI avec le taux en vigueur aujourd'hui
+    
+    Requiert: Admin seulement
+    """
+    rate = ExchangeRateService.get_rate_at(db, date.today())
+    if rate is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Aucun taux de change en vigueur"
+        )
+    
+    updated = ExchangeRateService.apply_rate(db, rate)
+    db.commit()
+    
+    return {
+        "message": "Prix LEI recalculés",
+        "rate": rate,
+        "updated": updated
+    }
@@ -0,0 +1,99 @@
+"""
+Routes API pour la recherche dans le catalogue
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
+from sqlalchemy.orm import Session
+from typing import List
+
+from app.database import get_db
+from app.schemas.catalog import SearchResult, Suggestion
+from app.services.catalog_search import CatalogSearchService
+from app.services.typeahead import TypeaheadService, SUGGEST_SOURCES
+from app.api.caching import cache_response, cached_response, catalog_etag
+from app.api.dependencies import get_current_user
+from app.models.user import User
+
+
+router = APIRouter()
+
+# Résultats revalidés par ETag et mis en cache sous cet ETag
+search_etag = Depends(catalog_etag("materials", "articles", "services"))
+
+
+@router.get("/", response_model=List[SearchResult])
+async def search_catalog(
+    response: Response,
+    q: str = Query(..., min_length=2),
+    types: List[str] = Query(["materials", "articles", "services"]),
+    limit: int = Query(20, ge=1, le=100),
+    active_only: bool = True,
+    etag: str = search_etag,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Rechercher dans les matériaux, articles et services
+    
+    - **q**: Terme recherché (code ou nom, sans tenir compte des accents
+      ni des fautes de frappe légères)
+    - **types**: Types interrogés (paramètre répété)
+    - **limit**: Nombre maximum de résultats, tous types confondus
+    
+    Les résultats sont classés par similarité ; un code commençant par le
+    terme passe en tête.
+    """
+    cached = cached_response(etag)
+    if cached is not None:
+        return cached
+    
+    try:
+        results = CatalogSearchService.search(db, q, types, limit, active_only)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    results = [SearchResult(**{**result, "id": str(result["id"])}) for result in results]
+    return cache_response(etag, List[SearchResult], results, response)
+
+
+@router.get("/suggest", response_model=List[Suggestion])
+def suggest(
+    q: str = Query(..., min_length=1),
+    types: List[str] = Query(list(SUGGEST_SOURCES)),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Autocomplétion sur les éléments actifs du catalogue
+    
+    Servie par un index en mémoire (codes et noms FR/RO, sans accents) :
+    pas d'aller-retour avec la base à chaque frappe. Route synchrone : le
+    rechargement des lignes modifiées s'exécute dans le pool de threads.
+    
+    - **q**: Saisie en cours
+    - **types**: materials, articles, compositions et/ou services (paramètre répété)
+    - **limit**: Nombre maximum de suggestions
+    """
+    unknown = [kind for kind in types if kind not in SUGGEST_SOURCES]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Type de suggestion '{unknown[0]}' non pris en charge"
+        )
+    
+    return [
+        Suggestion(
+            type=entry.type,
+            id=str(entry.id),
+            code=entry.code,
+            name=entry.name,
+            name_ro=entry.name_ro,
+            unit=entry.unit,
+            score=score
+        )
+        for entry, score in TypeaheadService.suggest(db, q, types, limit)
+    ]
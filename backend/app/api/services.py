@@ -2,7 +2,7 @@
 Routes API pour les services
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 import uuid
@@ -12,46 +12,76 @@ from app.database import get_db
 from app.schemas.catalog import Service, ServiceCreate, ServiceUpdate
 from app.models.service import Service as ServiceModel
 from app.services.price_calculator import PriceCalculator
+from app.services.exchange_rates import ExchangeRateService
+from app.services.catalog_search import normalized_term
 from app.api.dependencies import get_current_user
+from app.api.pagination import paginate, SORT_PATTERN
+from app.api.caching import cache_response, cached_response, catalog_etag
 from app.models.user import User
 
 
 router = APIRouter()
 
+# Réponses revalidées par ETag et mises en cache sous cet ETag
+service_etag = Depends(catalog_etag("services"))
+
+
+def _apply_lei_prices(service: ServiceModel, db: Session) -> None:
+    """Calculer les prix LEI d'un service au taux en vigueur"""
+    rate = ExchangeRateService.get_current_rate(db)
+    service.price_net_lei = PriceCalculator.convert_eur_to_lei(service.price_net, rate)
+    service.price_gross_lei = PriceCalculator.convert_eur_to_lei(service.price_gross, rate)
+
 
 @router.get("/", response_model=List[Service])
 async def list_services(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
+    sort: str = Query("code", pattern=SORT_PATTERN),
+    cursor: Optional[str] = None,
     active_only: bool = True,
     search: Optional[str] = None,
+    etag: str = service_etag,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Lister les services"""
+    """
+    Lister les services
+    
+    - **sort**: `code` ou `updated_at`, préfixé de `-` pour l'ordre décroissant
+    - **cursor**: Curseur reçu dans l'en-tête X-Next-Cursor ou X-Prev-Cursor
+    """
+    cached = cached_response(etag)
+    if cached is not None:
+        return cached
+    
     query = db.query(ServiceModel)
     
     if active_only:
         query = query.filter(ServiceModel.is_active == True)
     
     if search:
-        search_filter = f"%{search}%"
-        query = query.filter(
-            (ServiceModel.code.ilike(search_filter)) |
-            (ServiceModel.name.ilike(search_filter))
-        )
+        # Sans accents ni casse, servi par l'index trigrammes de search_text
+        query = query.filter(ServiceModel.search_text.contains(normalized_term(search)))
     
-    services = query.offset(skip).limit(limit).all()
-    return services
+    services = paginate(query, ServiceModel, response, sort, cursor, skip, limit)
+    return cache_response(etag, List[Service], services, response)
 
 
 @router.get("/{service_id}", response_model=Service)
 async def get_service(
     service_id: str,
+    response: Response,
+    etag: str = service_etag,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Récupérer un service par ID"""
+    cached = cached_response(etag)
+    if cached is not None:
+        return cached
+    
     service = db.query(ServiceModel).filter(ServiceModel.id == service_id).first()
     
     if not service:
@@ -60,7 +90,7 @@ async def get_service(
             detail="Service non trouvé"
         )
     
-    return service
+    return cache_response(etag, Service, service, response)
 
 
 @router.post("/", response_model=Service, status_code=status.HTTP_201_CREATED)
@@ -94,6 +124,7 @@ async def create_service(
         **service_data.model_dump(),
         margin=margin
     )
+    _apply_lei_prices(service, db)
     
     db.add(service)
     db.commit()
@@ -139,6 +170,7 @@ async def update_service(
             service.price_net,
             service.price_gross
         )
+        _apply_lei_prices(service, db)
     
     service.updated_at = datetime.utcnow().isoformat()
     
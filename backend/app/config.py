@@ -40,6 +40,25 @@ class Settings(BaseSettings):
     DEFAULT_OVERHEAD: float = 0.10
     DEFAULT_VAT_RATE: float = 0.19
     
+    # Pricing
+    PRICING_SNAPSHOT_TTL_SECONDS: int = 300
+    
+    # Import
+    IMPORT_CHUNK_SIZE: int = 5000
+    IMPORT_MAX_UPLOAD_MB: int = 50
+    IMPORT_WORKERS: int = 2
+    IMPORT_PARSE_PROCESSES: int = 0  # 0 = nombre de CPU
+    IMPORT_JOB_TTL_SECONDS: int = 86400
+    IMPORT_LOCK_TIMEOUT_SECONDS: int = 3600
+    
+    # Search
+    SEARCH_SIMILARITY_THRESHOLD: float = 0.4
+    TYPEAHEAD_REFRESH_SECONDS: int = 300
+    
+    # Catalog cache
+    CATALOG_CACHE_TTL_SECONDS: int = 600
+    CATALOG_CACHE_MAX_ENTRIES: int = 256
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -9,7 +9,8 @@ from contextlib import asynccontextmanager
 
 from app.config import settings
 from app.database import engine, Base
-from app.api import auth, materials, imports, articles, services
+from app.services.typeahead import TypeaheadService
+from app.api import auth, materials, imports, exports, articles, compositions, services, pricing, search
 
 
 @asynccontextmanager
@@ -22,6 +23,12 @@ async def lifespan(app: FastAPI):
     # Créer les tables (pour le dev, en prod utiliser Alembic)
     # Base.metadata.create_all(bind=engine)
     
+    # Index d'autocomplétion (sinon construit à la première suggestion)
+    try:
+        TypeaheadService.build()
+    except Exception as e:
+        print(f"⚠️ Index d'autocomplétion non construit: {e}")
+    
     yield
     
     # Shutdown
@@ -43,6 +50,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Prev-Cursor", "ETag"],
 )
 
 
@@ -71,8 +79,12 @@ async def health_check():
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(materials.router, prefix="/api/materials", tags=["Materials"])
 app.include_router(articles.router, prefix="/api/articles", tags=["Articles"])
+app.include_router(compositions.router, prefix="/api/compositions", tags=["Compositions"])
 app.include_router(services.router, prefix="/api/services", tags=["Services"])
 app.include_router(imports.router, prefix="/api/import", tags=["Import"])
+app.include_router(exports.router, prefix="/api/export", tags=["Export"])
+app.include_router(pricing.router, prefix="/api/pricing", tags=["Pricing"])
+app.include_router(search.router, prefix="/api/search", tags=["Search"])
 # app.include_router(clients.router, prefix="/api/clients", tags=["Clients"])
 # app.include_router(quotes.router, prefix="/api/quotes", tags=["Quotes"])
 # app.include_router(invoices.router, prefix="/api/invoices", tags=["Invoices"])
@@ -8,6 +8,10 @@ from app.models.article import Article, ArticleMaterial
 from app.models.composition import Composition, CompositionItem, CompositionItemType
 from app.models.service import Service
 from app.models.client import Client, ClientType
+from app.models.exchange_rate import ExchangeRate
+from app.models.import_file import ImportFile
+from app.models.material_price import MaterialPrice
+from app.models.catalog_version import CatalogVersion
 
 __all__ = [
     "User",
@@ -20,5 +24,9 @@ __all__ = [
     "CompositionItemType",
     "Service",
     "Client",
-    "ClientType"
+    "ClientType",
+    "ExchangeRate",
+    "ImportFile",
+    "MaterialPrice",
+    "CatalogVersion"
 ]
@@ -3,7 +3,7 @@ Modèle Article - Articles composés
 Articles fabriqués à partir de matériaux et main d'œuvre
 """
 
-from sqlalchemy import Column, String, Numeric, Boolean, ForeignKey, Index
+from sqlalchemy import Column, String, Numeric, Boolean, Computed, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -29,11 +29,15 @@ class Article(Base):
     total_price = Column(Numeric(10, 2), nullable=False)
     material_cost = Column(Numeric(10, 2), nullable=False)
     labor_cost = Column(Numeric(10, 2), nullable=False)
+    total_price_lei = Column(Numeric(10, 2), nullable=True)
     
     # Marges (en pourcentage décimal, ex: 0.30 pour 30%)
     margin = Column(Numeric(5, 4), nullable=False, default=0.30)
     overhead = Column(Numeric(5, 4), nullable=False, default=0.10)
     
+    # Recherche : code et noms sans accents, en minuscules (index trigrammes)
+    search_text = Column(String, Computed("lower(f_unaccent(code || ' ' || coalesce(name, '')))", persisted=True))
+    
     # Statut
     is_active = Column(Boolean, default=True)
     
@@ -73,4 +77,7 @@ class ArticleMaterial(Base):
 
 # Index pour améliorer les performances
 Index('ix_articles_active', Article.is_active)
+Index('ix_articles_updated_at_id', Article.updated_at, Article.id)
+Index('ix_articles_search_text', Article.search_text, postgresql_using='gin', postgresql_ops={'search_text': 'gin_trgm_ops'})
 Index('ix_article_materials_article', ArticleMaterial.article_id)
+Index('ix_article_materials_material', ArticleMaterial.material_id)
@@ -0,0 +1,24 @@
+"""
+Modèle CatalogVersion - Versions du catalogue
+Compteur par table incrémenté à chaque écriture (ETag des réponses)
+"""
+
+from sqlalchemy import Column, String, BigInteger
+from datetime import datetime
+
+from app.database import Base
+
+
+class CatalogVersion(Base):
+    """Modèle pour la version d'une table du catalogue"""
+    
+    __tablename__ = "catalog_versions"
+    
+    table_name = Column(String, primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    
+    # Timestamps
+    updated_at = Column(String, default=lambda: datetime.utcnow().isoformat())
+    
+    def __repr__(self):
+        return f"<CatalogVersion {self.table_name} v{self.version}>"
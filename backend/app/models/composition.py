@@ -1,6 +1,6 @@
 """
 Modèle Composition - Compositions complexes
-Assemblages d'articles et/ou matériaux
+Assemblages d'articles, de matériaux et/ou d'autres compositions
 """
 
 from sqlalchemy import Column, String, Numeric, Boolean, ForeignKey, Enum as SQLEnum, Index
@@ -17,6 +17,7 @@ class CompositionItemType(str, enum.Enum):
     """Types d'items dans une composition"""
     MATERIAL = "material"
     ARTICLE = "article"
+    COMPOSITION = "composition"
 
 
 class Composition(Base):
@@ -34,6 +35,7 @@ class Composition(Base):
     
     # Prix calculés
     total_price = Column(Numeric(10, 2), nullable=False)
+    total_price_lei = Column(Numeric(10, 2), nullable=True)
     
     # Marges
     margin = Column(Numeric(5, 4), nullable=False, default=0.30)
@@ -54,17 +56,24 @@ class Composition(Base):
 
 
 class CompositionItem(Base):
-    """Items dans une composition (peut être un article ou un matériau)"""
+    """Items dans une composition (article, matériau ou sous-composition)"""
     
     __tablename__ = "composition_items"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     composition_id = Column(UUID(as_uuid=True), ForeignKey("compositions.id", ondelete="CASCADE"), nullable=False)
     
-    # Type d'item (material ou article)
-    item_type = Column(SQLEnum(CompositionItemType), nullable=False)
-    
-    # ID de l'item (soit material_id soit article_id)
+    # Type d'item (material, article ou composition), stocké par valeur comme dans les migrations
+    item_type = Column(
+        SQLEnum(
+            CompositionItemType,
+            name="compositionitemtype",
+            values_callable=lambda e: [member.value for member in e]
+        ),
+        nullable=False
+    )
+    
+    # ID de l'item (material_id, article_id ou composition_id)
     item_id = Column(UUID(as_uuid=True), nullable=False)
     
     # Quantité
@@ -79,4 +88,6 @@ class CompositionItem(Base):
 
 # Index
 Index('ix_compositions_active', Composition.is_active)
+Index('ix_compositions_updated_at_id', Composition.updated_at, Composition.id)
 Index('ix_composition_items_composition', CompositionItem.composition_id)
+Index('ix_composition_items_item', CompositionItem.item_type, CompositionItem.item_id)
@@ -0,0 +1,36 @@
+"""
+Modèle ExchangeRate - Taux de change
+Historique des taux EUR → devise avec date d'effet
+"""
+
+from sqlalchemy import Column, String, Numeric, Date, Index
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+import uuid
+
+from app.database import Base
+
+
+class ExchangeRate(Base):
+    """Modèle pour les taux de change (base EUR)"""
+    
+    __tablename__ = "exchange_rates"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    
+    # Devise cible (1 EUR = rate devise)
+    currency = Column(String, nullable=False, default="LEI")
+    rate = Column(Numeric(10, 4), nullable=False)
+    
+    # Date à partir de laquelle le taux s'applique
+    effective_date = Column(Date, nullable=False)
+    
+    # Timestamps
+    created_at = Column(String, default=lambda: datetime.utcnow().isoformat())
+    
+    def __repr__(self):
+        return f"<ExchangeRate EUR/{self.currency} {self.rate} au {self.effective_date}>"
+
+
+# Index pour la recherche du taux en vigueur
+Index('ix_exchange_rates_currency_date', ExchangeRate.currency, ExchangeRate.effective_date, unique=True)
@@ -0,0 +1,40 @@
+"""
+Modèle ImportFile - Fichiers importés
+Empreinte des fichiers déjà importés pour ignorer les ré-envois identiques
+"""
+
+from sqlalchemy import Column, String, Index
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from datetime import datetime
+import uuid
+
+from app.database import Base
+
+
+class ImportFile(Base):
+    """Modèle pour l'historique des fichiers importés"""
+    
+    __tablename__ = "import_files"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    
+    # Empreinte SHA-256 du contenu
+    sha256 = Column(String(64), nullable=False)
+    
+    # Type d'import (materials, services, workbook) et feuille importée
+    kind = Column(String, nullable=False)
+    sheet_name = Column(String, nullable=False, default="")
+    
+    filename = Column(String, nullable=True)
+    statistics = Column(JSONB, nullable=True)
+    user_id = Column(UUID(as_uuid=True), nullable=True)
+    
+    # Timestamps
+    imported_at = Column(String, default=lambda: datetime.utcnow().isoformat())
+    
+    def __repr__(self):
+        return f"<ImportFile {self.kind} {self.filename} {self.sha256[:12]}>"
+
+
+# Un même contenu n'est importé qu'une fois par type et par feuille
+Index('ix_import_files_hash', ImportFile.sha256, ImportFile.kind, ImportFile.sheet_name, unique=True)
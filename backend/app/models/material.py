@@ -3,7 +3,7 @@ Modèle Material - Matériaux
 Gestion des matériaux de base (bois, quincaillerie, isolants, etc.)
 """
 
-from sqlalchemy import Column, String, Numeric, Boolean, Index
+from sqlalchemy import Column, String, Numeric, Boolean, Computed, Index
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
 import uuid
@@ -33,6 +33,9 @@ class Material(Base):
     price_date = Column(String, default=lambda: datetime.utcnow().isoformat())
     supplier = Column(String, nullable=True)
     
+    # Recherche : code et noms sans accents, en minuscules (index trigrammes)
+    search_text = Column(String, Computed("lower(f_unaccent(code || ' ' || coalesce(name_fr, '') || ' ' || coalesce(name_ro, '')))", persisted=True))
+    
     # Statut
     is_active = Column(Boolean, default=True)
     
@@ -46,3 +49,5 @@ class Material(Base):
 
 # Index supplémentaire pour les requêtes fréquentes
 Index('ix_materials_active', Material.is_active)
+Index('ix_materials_updated_at_id', Material.updated_at, Material.id)
+Index('ix_materials_search_text', Material.search_text, postgresql_using='gin', postgresql_ops={'search_text': 'gin_trgm_ops'})
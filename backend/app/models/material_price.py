@@ -0,0 +1,35 @@
+"""
+Modèle MaterialPrice - Historique des prix matériaux
+Un enregistrement par changement de prix, daté de sa prise d'effet
+"""
+
+from sqlalchemy import Column, String, Numeric, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+import uuid
+
+from app.database import Base
+
+
+class MaterialPrice(Base):
+    """Modèle pour l'historique des prix d'un matériau"""
+    
+    __tablename__ = "material_prices"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    material_id = Column(UUID(as_uuid=True), ForeignKey("materials.id", ondelete="CASCADE"), nullable=False)
+    
+    # Prix en vigueur à partir de valid_from
+    price_eur = Column(Numeric(10, 2), nullable=False)
+    price_lei = Column(Numeric(10, 2), nullable=True)
+    valid_from = Column(DateTime, nullable=False, default=datetime.utcnow)
+    
+    # Origine du changement (api, excel, csv, migration)
+    source = Column(String, nullable=True)
+    
+    def __repr__(self):
+        return f"<MaterialPrice {self.material_id} {self.price_eur} EUR au {self.valid_from}>"
+
+
+# Index pour les recherches "prix au ..." et les séries par matériau
+Index('ix_material_prices_material_valid_from', MaterialPrice.material_id, MaterialPrice.valid_from)
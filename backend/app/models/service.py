@@ -3,7 +3,7 @@ Modèle Service - Services et prestations
 Services forfaitaires (transport, études, etc.)
 """
 
-from sqlalchemy import Column, String, Numeric, Boolean, Index
+from sqlalchemy import Column, String, Numeric, Boolean, Computed, Index
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
 import uuid
@@ -27,10 +27,15 @@ class Service(Base):
     # Prix
     price_net = Column(Numeric(10, 2), nullable=False)  # Prix net (coût)
     price_gross = Column(Numeric(10, 2), nullable=False)  # Prix brut (vente)
+    price_net_lei = Column(Numeric(10, 2), nullable=True)
+    price_gross_lei = Column(Numeric(10, 2), nullable=True)
     
     # Marge calculée (gross - net)
     margin = Column(Numeric(10, 2), nullable=False, default=0.0)
     
+    # Recherche : code et noms sans accents, en minuscules (index trigrammes)
+    search_text = Column(String, Computed("lower(f_unaccent(code || ' ' || coalesce(name, '')))", persisted=True))
+    
     # Statut
     is_active = Column(Boolean, default=True)
     
@@ -44,3 +49,5 @@ class Service(Base):
 
 # Index
 Index('ix_services_active', Service.is_active)
+Index('ix_services_updated_at_id', Service.updated_at, Service.id)
+Index('ix_services_search_text', Service.search_text, postgresql_using='gin', postgresql_ops={'search_text': 'gin_trgm_ops'})
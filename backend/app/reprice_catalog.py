@@ -0,0 +1,49 @@
+"""
+Script pour recalculer les prix de tout le catalogue
+"""
+
+import sys
+import os
+
+# Ajouter le path du backend pour les imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal
+from app.services.catalog_reprice import CatalogRepriceService
+
+
+def reprice_catalog():
+    """Recalculer tous les articles et compositions"""
+    
+    db = SessionLocal()
+    
+    try:
+        result = CatalogRepriceService.reprice_all(db)
+        db.commit()
+        
+        timings = result["timings"]
+        
+        print("=" * 60)
+        print("✅ Recalcul du catalogue terminé")
+        print("=" * 60)
+        print(f"Matériaux:             {result['materials']}")
+        print(f"Lignes de nomenclature: {result['article_lines']}")
+        print(f"Articles mis à jour:   {result['updated_articles']} / {result['articles']}")
+        print(f"Compositions mises à jour: {result['updated_compositions']} / {result['compositions']}")
+        print("-" * 60)
+        print(f"Chargement:    {timings['load_ms']} ms")
+        print(f"Calcul:        {timings['compute_ms']} ms")
+        print(f"Écriture:      {timings['write_ms']} ms")
+        print(f"Compositions:  {timings['compositions_ms']} ms")
+        print(f"Total:         {timings['total_ms']} ms")
+        print("=" * 60)
+    
+    except Exception as e:
+        print(f"❌ Erreur lors du recalcul: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    reprice_catalog()
@@ -5,6 +5,7 @@ Schémas Pydantic pour le catalogue
 from pydantic import BaseModel, Field
 from typing import Optional, List
 from decimal import Decimal
+from datetime import datetime
 
 
 # ========== MATERIALS ==========
@@ -51,6 +52,25 @@ class Material(MaterialBase):
         from_attributes = True
 
 
+class MaterialPricePoint(BaseModel):
+    """Schéma pour un point de l'historique des prix"""
+    price_eur: Decimal
+    price_lei: Optional[Decimal] = None
+    valid_from: datetime
+    source: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class MaterialPriceAt(BaseModel):
+    """Schéma pour le prix d'un matériau en vigueur à une date"""
+    material_id: str
+    price_eur: Decimal
+    price_lei: Optional[Decimal] = None
+    valid_from: datetime
+
+
 # ========== ARTICLES ==========
 
 class ArticleMaterialBase(BaseModel):
@@ -70,6 +90,12 @@ class ArticleMaterial(ArticleMaterialBase):
     article_id: str
     material: Optional[Material] = None
     
+    # Matériau résolu (évite de recharger les matériaux côté client)
+    material_code: Optional[str] = None
+    material_name: Optional[str] = None
+    material_unit: Optional[str] = None
+    material_price_eur: Optional[Decimal] = None
+    
     class Config:
         from_attributes = True
 
@@ -106,6 +132,7 @@ class Article(ArticleBase):
     """Schéma pour le retour d'un article"""
     id: str
     total_price: Decimal
+    total_price_lei: Optional[Decimal] = None
     material_cost: Decimal
     labor_cost: Decimal
     is_active: bool
@@ -121,7 +148,7 @@ class Article(ArticleBase):
 
 class CompositionItemBase(BaseModel):
     """Schéma pour les items de composition"""
-    item_type: str = Field(..., pattern='^(material|article)$')
+    item_type: str = Field(..., pattern='^(material|article|composition)$')
     item_id: str
     quantity: Decimal = Field(..., gt=0)
 
@@ -135,6 +162,12 @@ class CompositionItem(CompositionItemBase):
     id: str
     composition_id: str
     
+    # Élément référencé (matériau, article ou sous-composition)
+    item_code: Optional[str] = None
+    item_name: Optional[str] = None
+    item_unit: Optional[str] = None
+    unit_price: Optional[Decimal] = None
+    
     class Config:
         from_attributes = True
 
@@ -163,12 +196,14 @@ class CompositionUpdate(BaseModel):
     margin: Optional[Decimal] = Field(None, ge=0, le=1)
     overhead: Optional[Decimal] = Field(None, ge=0, le=1)
     is_active: Optional[bool] = None
+    items: Optional[List[CompositionItemCreate]] = None
 
 
 class Composition(CompositionBase):
     """Schéma pour le retour d'une composition"""
     id: str
     total_price: Decimal
+    total_price_lei: Optional[Decimal] = None
     is_active: bool
     created_at: str
     updated_at: str
@@ -210,9 +245,35 @@ class Service(ServiceBase):
     """Schéma pour le retour d'un service"""
     id: str
     margin: Decimal
+    price_net_lei: Optional[Decimal] = None
+    price_gross_lei: Optional[Decimal] = None
     is_active: bool
     created_at: str
     updated_at: str
     
     class Config:
         from_attributes = True
+
+
+# ========== RECHERCHE ==========
+
+class SearchResult(BaseModel):
+    """Schéma pour un résultat de recherche dans le catalogue"""
+    type: str
+    id: str
+    code: str
+    name: str
+    unit: Optional[str] = None
+    price_eur: Optional[Decimal] = None
+    score: float
+
+
+class Suggestion(BaseModel):
+    """Schéma pour une suggestion d'autocomplétion"""
+    type: str
+    id: str
+    code: str
+    name: str
+    name_ro: Optional[str] = None
+    unit: Optional[str] = None
+    score: float
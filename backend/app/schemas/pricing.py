@@ -0,0 +1,98 @@
+"""
+Schémas Pydantic pour le calcul et la simulation des prix
+"""
+
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional, List, Dict
+from decimal import Decimal
+from datetime import date
+from uuid import UUID
+
+
+# ========== SIMULATION ==========
+
+class MaterialPriceOverride(BaseModel):
+    """Prix hypothétique d'un matériau (prix absolu ou variation en %)"""
+    material_id: Optional[str] = None
+    code: Optional[str] = None
+    price_eur: Optional[Decimal] = Field(None, ge=0)
+    change_percent: Optional[Decimal] = Field(None, gt=-100)
+    
+    @model_validator(mode="after")
+    def check_target_and_value(self):
+        if not self.material_id and not self.code:
+            raise ValueError("material_id ou code requis")
+        if (self.price_eur is None) == (self.change_percent is None):
+            raise ValueError("Indiquer soit price_eur soit change_percent")
+        return self
+
+
+class MarkupOverride(BaseModel):
+    """Marge / frais généraux hypothétiques pour des articles ou compositions"""
+    item_id: Optional[str] = None
+    code_prefix: Optional[str] = None
+    margin: Optional[Decimal] = Field(None, ge=0, le=1)
+    overhead: Optional[Decimal] = Field(None, ge=0, le=1)
+    
+    @model_validator(mode="after")
+    def check_target_and_value(self):
+        if not self.item_id and self.code_prefix is None:
+            raise ValueError("item_id ou code_prefix requis")
+        if self.margin is None and self.overhead is None:
+            raise ValueError("Indiquer margin et/ou overhead")
+        return self
+
+
+class SimulationRequest(BaseModel):
+    """Hypothèses de prix à simuler"""
+    material_prices: List[MaterialPriceOverride] = []
+    article_markups: List[MarkupOverride] = []
+    composition_markups: List[MarkupOverride] = []
+    limit: int = Field(default=1000, ge=1, le=50000)
+
+
+class SimulationItem(BaseModel):
+    """Écart de prix simulé pour un article ou une composition"""
+    item_type: str
+    id: str
+    code: str
+    current_price: Decimal
+    simulated_price: Decimal
+    delta: Decimal
+    delta_percent: Optional[Decimal] = None
+
+
+class SimulationResponse(BaseModel):
+    """Résultat d'une simulation"""
+    affected_articles: int
+    affected_compositions: int
+    changed_items: int
+    items: List[SimulationItem]
+    duration_ms: float
+
+
+# ========== TAUX DE CHANGE ==========
+
+class ExchangeRateCreate(BaseModel):
+    """Schéma pour publier un taux EUR → LEI"""
+    rate: Decimal = Field(..., gt=0, le=999999)
+    effective_date: Optional[date] = None
+
+
+class ExchangeRate(BaseModel):
+    """Schéma de réponse pour un taux de change"""
+    id: UUID
+    currency: str
+    rate: Decimal
+    effective_date: date
+    created_at: Optional[str] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class ExchangeRatePublished(BaseModel):
+    """Résultat de la publication d'un taux"""
+    exchange_rate: ExchangeRate
+    current_rate: Optional[Decimal] = None
+    updated: Dict[str, int]
@@ -0,0 +1,85 @@
+"""
+Cache des lectures du catalogue
+Réponses JSON déjà sérialisées dans Redis, avec repli sur un LRU en mémoire
+"""
+
+import json
+from typing import Dict, Optional, Tuple
+import redis
+
+from app.config import settings
+from app.utils.lru import LRUCache
+from app.utils.redis_client import get_redis, mark_redis_failed
+
+
+KEY_PREFIX = "catalog_cache:"
+
+# (en-têtes, corps JSON)
+CachedResponse = Tuple[Dict[str, str], bytes]
+
+
+def _encode(headers: Dict[str, str], body: bytes) -> bytes:
+    """En-têtes JSON sur la première ligne, corps ensuite"""
+    return json.dumps(headers).encode() + b"\n" + body
+
+
+def _decode(raw: bytes) -> CachedResponse:
+    headers, _, body = raw.partition(b"\n")
+    return json.loads(headers), body
+
+
+class CatalogCache:
+    """
+    Cache partagé des réponses du catalogue
+    
+    Les clés dérivent de l'ETag de la réponse (chemin, paramètres et
+    versions des tables lues) : une écriture incrémente la version de ses
+    tables dans la même transaction, et les entrées qui en dépendent ne
+    sont plus jamais lues dès le commit, dans tous les processus. Les
+    entrées orphelines expirent après CATALOG_CACHE_TTL_SECONDS.
+    
+    Redis est utilisé s'il répond ; sinon le cache LRU du processus prend
+    le relais. Une erreur Redis en cours d'utilisation bascule sur ce
+    cache pendant RETRY_SECONDS (voir mark_redis_failed).
+    """
+    
+    _memory = LRUCache(maxsize=settings.CATALOG_CACHE_MAX_ENTRIES, ttl=settings.CATALOG_CACHE_TTL_SECONDS)
+    
+    @classmethod
+    def get(cls, key: str) -> Optional[CachedResponse]:
+        """
+        Lire une réponse en cache
+        
+        Returns:
+            Tuple (en-têtes, corps) ou None
+        """
+        client = get_redis()
+        if client is not None:
+            try:
+                raw = client.get(KEY_PREFIX + key)
+                return _decode(raw) if raw is not None else None
+            except redis.RedisError as e:
+                mark_redis_failed(e)
+        
+        raw = cls._memory.get(key)
+        return _decode(raw) if raw is not None else None
+    
+    @classmethod
+    def set(cls, key: str, headers: Dict[str, str], body: bytes) -> None:
+        """Mettre une réponse en cache (TTL CATALOG_CACHE_TTL_SECONDS)"""
+        raw = _encode(headers, body)
+        
+        client = get_redis()
+        if client is not None:
+            try:
+                client.set(KEY_PREFIX + key, raw, ex=settings.CATALOG_CACHE_TTL_SECONDS)
+                return
+            except redis.RedisError as e:
+                mark_redis_failed(e)
+        
+        cls._memory.set(key, raw)
+    
+    @classmethod
+    def clear_memory(cls) -> None:
+        """Vider le cache en mémoire du processus"""
+        cls._memory.clear()
@@ -0,0 +1,134 @@
+"""
+Événements de modification du catalogue
+Notifier les caches en mémoire après chaque commit qui touche le catalogue
+"""
+
+from datetime import datetime
+from itertools import chain
+from typing import Callable, Dict, Iterable, List, Optional, Set
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.catalog_version import CatalogVersion
+
+
+# Tables dont les modifications sont suivies
+CATALOG_TABLES = (
+    "materials",
+    "articles",
+    "article_materials",
+    "compositions",
+    "composition_items",
+    "services",
+    "exchange_rates",
+)
+
+# {table: ids modifiés, ou None si toute la table est concernée}
+CatalogChanges = Dict[str, Optional[Set]]
+
+_CHANGES_KEY = "catalog_changes"
+_listeners: List[Callable[[CatalogChanges], None]] = []
+
+
+def register_listener(listener: Callable[[CatalogChanges], None]) -> None:
+    """
+    Enregistrer une fonction appelée après chaque commit modifiant le catalogue
+    
+    Args:
+        listener: Fonction recevant {table: ids modifiés ou None}
+    """
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def mark_changed(db: Session, table: str, ids: Optional[Iterable] = None) -> None:
+    """
+    Signaler une modification faite hors ORM (UPDATE ou INSERT en masse)
+    
+    Les modifications faites via des objets ORM sont détectées automatiquement.
+    La version (catalog_versions) de chaque table modifiée est incrémentée
+    juste avant le commit.
+    
+    Args:
+        db: Session de base de données
+        table: Nom de la table modifiée
+        ids: Ids des lignes modifiées (None = toute la table)
+    """
+    changes = db.info.setdefault(_CHANGES_KEY, {})
+    
+    if table in changes and changes[table] is None:
+        return
+    
+    if ids is None:
+        changes[table] = None
+    else:
+        changes.setdefault(table, set()).update(ids)
+
+
+def _bump_versions(db: Session, tables: Iterable[str]) -> None:
+    """
+    Incrémenter les versions de plusieurs tables en une requête
+    
+    Les lignes sont verrouillées dans l'ordre des noms de tables : deux
+    transactions concurrentes ne peuvent pas s'interbloquer.
+    """
+    now = datetime.utcnow().isoformat()
+    stmt = insert(CatalogVersion).values([
+        {"table_name": table, "version": 1, "updated_at": now}
+        for table in sorted(tables)
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[CatalogVersion.table_name],
+        set_={"version": CatalogVersion.version + 1, "updated_at": stmt.excluded.updated_at}
+    )
+    db.connection().execute(stmt)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_orm_changes(session: Session, flush_context) -> None:
+    """Relever les objets du catalogue créés, modifiés ou supprimés"""
+    for obj in chain(session.new, session.dirty, session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table in CATALOG_TABLES:
+            mark_changed(session, table, [obj.id])
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_changed_versions(session: Session) -> None:
+    """
+    Incrémenter les versions des tables modifiées, dernière requête avant le commit
+    
+    Les nouvelles versions deviennent visibles au commit, en même temps que
+    les données, et les lignes de catalog_versions ne restent verrouillées
+    que le temps du commit (pas pendant tout un import ou un recalcul).
+    """
+    if session.in_nested_transaction():
+        return
+    
+    # Relever les modifications ORM encore en attente
+    session.flush()
+    
+    changes = session.info.get(_CHANGES_KEY)
+    if changes:
+        _bump_versions(session, changes)
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_listeners(session: Session) -> None:
+    """Prévenir les abonnés une fois les modifications validées"""
+    changes = session.info.pop(_CHANGES_KEY, None)
+    if not changes:
+        return
+    
+    for listener in list(_listeners):
+        try:
+            listener(changes)
+        except Exception as e:
+            print(f"Erreur dans un abonné aux modifications du catalogue: {e}")
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changes(session: Session) -> None:
+    """Oublier les modifications annulées"""
+    session.info.pop(_CHANGES_KEY, None)
@@ -0,0 +1,229 @@
+"""
+Service d'export du catalogue
+Exporter matériaux, articles, compositions et services en Excel ou CSV, en flux
+"""
+
+import csv
+import enum
+import io
+import tempfile
+from typing import Any, Iterator, List, Tuple
+from openpyxl import Workbook
+from sqlalchemy import Select, and_, func, select
+from sqlalchemy.orm import aliased
+
+from app.database import SessionLocal
+from app.models.material import Material
+from app.models.article import Article, ArticleMaterial
+from app.models.composition import Composition, CompositionItem, CompositionItemType
+from app.models.service import Service
+
+
+# Lignes lues par aller-retour avec le curseur serveur
+EXPORT_BATCH_SIZE = 1000
+
+# Taille des blocs envoyés pour un classeur Excel
+XLSX_CHUNK_SIZE = 1024 * 1024
+
+# (titre de la feuille, en-têtes, requête)
+Sheet = Tuple[str, List[str], Select]
+
+# En-têtes identiques à ceux de l'import : un export peut être réimporté
+MATERIAL_HEADERS = ["Code", "Nom FR", "Nom RO", "Unité", "Prix EUR", "Prix LEI", "Fournisseur", "Date prix"]
+ARTICLE_HEADERS = [
+    "Code", "Nom", "Description", "Unité", "Main d'œuvre", "Frais généraux", "Marge",
+    "Coût matériaux", "Prix EUR", "Prix LEI"
+]
+BOM_HEADERS = ["Code article", "Code matériau", "Quantité", "Perte"]
+COMPOSITION_HEADERS = ["Code", "Nom", "Description", "Unité", "Frais généraux", "Marge", "Prix EUR", "Prix LEI"]
+COMPOSITION_ITEM_HEADERS = ["Code composition", "Type", "Code élément", "Quantité"]
+SERVICE_HEADERS = [
+    "Code", "Nom", "Description", "Unité", "Prix Net", "Prix Brut", "Marge", "Prix Net LEI", "Prix Brut LEI"
+]
+
+
+def _cell(value: Any) -> Any:
+    """Valeur écrite dans une cellule (énumérations par leur valeur)"""
+    return value.value if isinstance(value, enum.Enum) else value
+
+
+def _active(statement: Select, model, active_only: bool) -> Select:
+    """Filtrer les éléments actifs si demandé"""
+    return statement.where(model.is_active == True) if active_only else statement
+
+
+class CatalogExportService:
+    """Service d'export du catalogue"""
+    
+    @staticmethod
+    def sheets(kind: str, include: str = "none", active_only: bool = True, flat: bool = False) -> List[Sheet]:
+        """
+        Feuilles d'un export
+        
+        Args:
+            kind: materials, articles, compositions ou services
+            include: `bom` (articles) ou `items` (compositions) pour ajouter
+                les lignes de détail, `none` sinon
+            active_only: Exclure les éléments désactivés
+            flat: Une seule feuille (CSV) : le détail est joint aux en-têtes,
+                une ligne par ligne de détail
+        
+        Returns:
+            Liste de (titre, en-têtes, requête)
+        """
+        if kind == "materials":
+            statement = select(
+                Material.code, Material.name_fr, Material.name_ro, Material.unit,
+                Material.price_eur, Material.price_lei, Material.supplier, Material.price_date
+            )
+            return [("Matériaux", MATERIAL_HEADERS, _active(statement, Material, active_only).order_by(Material.code))]
+        
+        if kind == "services":
+            statement = select(
+                Service.code, Service.name, Service.description, Service.unit, Service.price_net,
+                Service.price_gross, Service.margin, Service.price_net_lei, Service.price_gross_lei
+            )
+            return [("Services", SERVICE_HEADERS, _active(statement, Service, active_only).order_by(Service.code))]
+        
+        if kind == "articles":
+            columns = [
+                Article.code, Article.name, Article.description, Article.unit, Article.labor_cost,
+                Article.overhead, Article.margin, Article.material_cost, Article.total_price,
+                Article.total_price_lei
+            ]
+            headers = _active(select(*columns), Article, active_only).order_by(Article.code)
+            if include != "bom":
+                return [("Articles", ARTICLE_HEADERS, headers)]
+            
+            lines = (
+                select(ArticleMaterial.quantity, ArticleMaterial.waste_percent, Material.code.label("material_code"))
+                .join(Material, Material.id == ArticleMaterial.material_id)
+            )
+            if flat:
+                lines = lines.add_columns(ArticleMaterial.article_id).subquery()
+                statement = (
+                    select(*columns, lines.c.material_code, lines.c.quantity, lines.c.waste_percent)
+                    .outerjoin(lines, lines.c.article_id == Article.id)
+                    .order_by(Article.code, lines.c.material_code)
+                )
+                return [("Articles", ARTICLE_HEADERS + BOM_HEADERS[1:], _active(statement, Article, active_only))]
+            
+            bom = (
+                select(Article.code, Material.code, ArticleMaterial.quantity, ArticleMaterial.waste_percent)
+                .join(ArticleMaterial, ArticleMaterial.article_id == Article.id)
+                .join(Material, Material.id == ArticleMaterial.material_id)
+                .order_by(Article.code, Material.code)
+            )
+            return [
+                ("Articles", ARTICLE_HEADERS, headers),
+                ("Nomenclatures", BOM_HEADERS, _active(bom, Article, active_only))
+            ]
+        
+        if kind == "compositions":
+            columns = [
+                Composition.code, Composition.name, Composition.description, Composition.unit,
+                Composition.overhead, Composition.margin, Composition.total_price, Composition.total_price_lei
+            ]
+            headers = _active(select(*columns), Composition, active_only).order_by(Composition.code)
+            if include != "items":
+                return [("Compositions", COMPOSITION_HEADERS, headers)]
+            
+            # Code de l'élément référencé, quel que soit son type
+            child = aliased(Composition)
+            item_code = func.coalesce(Material.code, Article.code, child.code).label("item_code")
+            items = (
+                select(CompositionItem.composition_id, CompositionItem.item_type, item_code, CompositionItem.quantity)
+                .outerjoin(Material, and_(
+                    CompositionItem.item_type == CompositionItemType.MATERIAL,
+                    Material.id == CompositionItem.item_id
+                ))
+                .outerjoin(Article, and_(
+                    CompositionItem.item_type == CompositionItemType.ARTICLE,
+                    Article.id == CompositionItem.item_id
+                ))
+                .outerjoin(child, and_(
+                    CompositionItem.item_type == CompositionItemType.COMPOSITION,
+                    child.id == CompositionItem.item_id
+                ))
+                .subquery()
+            )
+            
+            if flat:
+                statement = (
+                    select(*columns, items.c.item_type, items.c.item_code, items.c.quantity)
+                    .outerjoin(items, items.c.composition_id == Composition.id)
+                    .order_by(Composition.code, items.c.item_code)
+                )
+                return [(
+                    "Compositions",
+                    COMPOSITION_HEADERS + COMPOSITION_ITEM_HEADERS[1:],
+                    _active(statement, Composition, active_only)
+                )]
+            
+            detail = (
+                select(Composition.code, items.c.item_type, items.c.item_code, items.c.quantity)
+                .join(items, items.c.composition_id == Composition.id)
+                .order_by(Composition.code, items.c.item_code)
+            )
+            return [
+                ("Compositions", COMPOSITION_HEADERS, headers),
+                ("Éléments", COMPOSITION_ITEM_HEADERS, _active(detail, Composition, active_only))
+            ]
+        
+        raise ValueError(f"Type d'export '{kind}' non pris en charge")
+    
+    @staticmethod
+    def stream_csv(sheet: Sheet) -> Iterator[bytes]:
+        """
+        Produire un CSV (UTF-8 avec BOM, séparateur `;`) par blocs de lignes
+        
+        Les en-têtes partent avant l'exécution de la requête ; les lignes
+        sont lues par un curseur serveur (yield_per) dans une session propre
+        au flux, fermée à la fin de l'envoi.
+        """
+        _, headers, statement = sheet
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, delimiter=';')
+        
+        buffer.write('\ufeff')
+        writer.writerow(headers)
+        yield buffer.getvalue().encode('utf-8')
+        
+        db = SessionLocal()
+        try:
+            result = db.execute(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+            for rows in result.partitions():
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows([_cell(value) for value in row] for row in rows)
+                yield buffer.getvalue().encode('utf-8')
+        finally:
+            db.close()
+    
+    @staticmethod
+    def stream_xlsx(sheets: List[Sheet]) -> Iterator[bytes]:
+        """
+        Produire un classeur Excel feuille par feuille
+        
+        openpyxl en mode write-only écrit les lignes au fil de l'eau dans
+        des fichiers temporaires ; le classeur (une archive zip) est ensuite
+        envoyé par blocs. La mémoire reste constante quelle que soit la
+        taille du catalogue.
+        """
+        db = SessionLocal()
+        try:
+            workbook = Workbook(write_only=True)
+            for title, headers, statement in sheets:
+                worksheet = workbook.create_sheet(title)
+                worksheet.append(headers)
+                result = db.execute(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+                for row in result:
+                    worksheet.append([_cell(value) for value in row])
+        finally:
+            db.close()
+        
+        with tempfile.TemporaryFile() as tmp_file:
+            workbook.save(tmp_file)
+            tmp_file.seek(0)
+            for block in iter(lambda: tmp_file.read(XLSX_CHUNK_SIZE), b''):
+                yield block
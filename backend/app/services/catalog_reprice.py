@@ -0,0 +1,279 @@
+"""
+Service de recalcul complet du catalogue
+Calcul vectorisé des prix de tous les articles en entiers (centimes)
+"""
+
+import time
+import numpy as np
+import pandas as pd
+from decimal import Decimal
+from typing import Dict, Any
+from sqlalchemy import BigInteger, cast, select, text
+from sqlalchemy.orm import Session
+from datetime import datetime
+
+from app.models.material import Material
+from app.models.article import Article, ArticleMaterial
+from app.models.composition import Composition
+from app.services.catalog_events import mark_changed
+from app.services.exchange_rates import ExchangeRateService
+from app.services.pricing_graph import PricingGraph
+
+
+# Échelles des colonnes Numeric : prix (10, 2), quantités (10, 4), taux (5, 4)
+PRICE_SCALE = 100
+QUANTITY_SCALE = 10_000
+RATE_SCALE = 10_000
+
+INT64_MAX = np.iinfo(np.int64).max
+
+
+def _round_half_even(numerator: np.ndarray, divisor: int) -> np.ndarray:
+    """
+    Division entière arrondie au pair le plus proche
+    
+    Reproduit `round(Decimal, 2)` (ROUND_HALF_EVEN) utilisé par PriceCalculator.
+    """
+    quotient = numerator // divisor
+    remainder = numerator - quotient * divisor
+    twice = remainder * 2
+    round_up = (twice > divisor) | ((twice == divisor) & (quotient % 2 == 1))
+    return quotient + round_up.astype(np.int64)
+
+
+def _exact_dtype(*bounds: int) -> Any:
+    """Choisir int64 si le produit des bornes tient, sinon des entiers Python"""
+    product = 1
+    for bound in bounds:
+        product *= max(int(bound), 1)
+    return np.int64 if product <= INT64_MAX else object
+
+
+class CatalogRepriceService:
+    """Service de recalcul de tout le catalogue"""
+    
+    @staticmethod
+    def _load_frames(db: Session):
+        """Charger matériaux, nomenclatures et articles en colonnes (entiers mis à l'échelle)"""
+        connection = db.connection()
+        
+        materials = pd.read_sql_query(
+            select(
+                Material.id.label("material_id"),
+                cast(Material.price_eur * PRICE_SCALE, BigInteger).label("price")
+            ),
+            connection
+        )
+        lines = pd.read_sql_query(
+            select(
+                ArticleMaterial.article_id,
+                ArticleMaterial.material_id,
+                cast(ArticleMaterial.quantity * QUANTITY_SCALE, BigInteger).label("quantity"),
+                cast(ArticleMaterial.waste_percent * RATE_SCALE, BigInteger).label("waste")
+            ),
+            connection
+        )
+        articles = pd.read_sql_query(
+            select(
+                Article.id.label("article_id"),
+                cast(Article.labor_cost * PRICE_SCALE, BigInteger).label("labor_cost"),
+                cast(Article.overhead * RATE_SCALE, BigInteger).label("overhead"),
+                cast(Article.margin * RATE_SCALE, BigInteger).label("margin"),
+                cast(Article.material_cost * PRICE_SCALE, BigInteger).label("current_material_cost"),
+                cast(Article.total_price * PRICE_SCALE, BigInteger).label("current_total_price")
+            ),
+            connection
+        )
+        
+        lines["waste"] = lines["waste"].fillna(0).astype(np.int64)
+        return materials, lines, articles
+    
+    @staticmethod
+    def compute_article_prices(
+        materials: pd.DataFrame,
+        lines: pd.DataFrame,
+        articles: pd.DataFrame
+    ) -> pd.DataFrame:
+        """
+        Calculer material_cost et total_price de tous les articles
+        
+        material_cost = Σ prix × quantité × (1 + perte)
+        total_price = (material_cost + MO) × (1 + overhead) × (1 + margin)
+        
+        Tous les calculs se font en entiers exacts, l'arrondi n'intervient
+        qu'à la fin comme dans PriceCalculator.
+        
+        Args:
+            materials: Colonnes material_id, price (centimes)
+            lines: Colonnes article_id, material_id, quantity, waste (×10 000)
+            articles: Colonnes article_id, labor_cost (centimes), overhead, margin (×10 000)
+        
+        Returns:
+            DataFrame articles avec material_cost et total_price en centimes
+        """
+        lines = lines.merge(materials, on="material_id", how="inner")
+        
+        # Coût exact d'une ligne, à l'échelle 10^10 (centimes × 10^4 × 10^4)
+        line_dtype = _exact_dtype(
+            lines["price"].max() if len(lines) else 0,
+            lines["quantity"].max() if len(lines) else 0,
+            RATE_SCALE + (lines["waste"].max() if len(lines) else 0),
+            lines.groupby("article_id").size().max() if len(lines) else 1
+        )
+        line_cost = (
+            lines["price"].to_numpy(dtype=line_dtype)
+            * lines["quantity"].to_numpy(dtype=line_dtype)
+            * (RATE_SCALE + lines["waste"].to_numpy(dtype=line_dtype))
+        )
+        material_cost_exact = (
+            pd.Series(line_cost, index=lines["article_id"].to_numpy())
+            .groupby(level=0)
+            .sum()
+        )
+        
+        result = articles.copy()
+        exact = (
+            material_cost_exact.reindex(result["article_id"].to_numpy(), fill_value=0)
+            .to_numpy()
+            .astype(object)
+        )
+        
+        # Arrondis au centime (échelle 10^10 → 10^2)
+        result["material_cost"] = _round_half_even(exact, QUANTITY_SCALE * RATE_SCALE)
+        
+        # Chaîne frais généraux / marge en entiers Python (pas de débordement)
+        labor = result["labor_cost"].to_numpy(dtype=object) * (QUANTITY_SCALE * RATE_SCALE)
+        overhead = RATE_SCALE + result["overhead"].to_numpy(dtype=object)
+        margin = RATE_SCALE + result["margin"].to_numpy(dtype=object)
+        total_price_exact = (exact + labor) * overhead * margin
+        result["total_price"] = _round_half_even(
+            total_price_exact,
+            QUANTITY_SCALE * RATE_SCALE * RATE_SCALE * RATE_SCALE
+        )
+        
+        return result
+    
+    @staticmethod
+    def _write_articles(db: Session, changed: pd.DataFrame, rate: Decimal, now: str) -> None:
+        """Écrire les prix modifiés en une seule requête UPDATE ... FROM unnest(...)"""
+        db.execute(
+            text(
+                "UPDATE articles AS a "
+                "SET material_cost = v.material_cost::numeric / 100, "
+                "    total_price = v.total_price::numeric / 100, "
+                "    total_price_lei = ROUND(v.total_price::numeric / 100 * :rate, 2), "
+                "    updated_at = :now "
+                "FROM unnest(CAST(:ids AS uuid[]), CAST(:material_costs AS bigint[]), "
+                "            CAST(:total_prices AS bigint[])) "
+                "     AS v(id, material_cost, total_price) "
+                "WHERE a.id = v.id"
+            ),
+            {
+                "ids": [str(i) for i in changed["article_id"]],
+                "material_costs": [int(v) for v in changed["material_cost"]],
+                "total_prices": [int(v) for v in changed["total_price"]],
+                "rate": rate,
+                "now": now
+            }
+        )
+        mark_changed(db, "articles", changed["article_id"])
+    
+    @staticmethod
+    def _reprice_compositions(db: Session, article_totals: Dict, rate: Decimal, now: str) -> Dict[str, int]:
+        """Recalculer toutes les compositions à partir des nouveaux prix d'articles"""
+        graph = PricingGraph()
+        graph.load_compositions(db)
+        graph.load_materials(db)
+        
+        if not graph.compositions:
+            return {"compositions": 0, "updated_compositions": 0}
+        
+        result = graph.evaluate(
+            composition_ids=list(graph.compositions),
+            article_totals=article_totals
+        )
+        
+        current = dict(db.query(Composition.id, Composition.total_price).all())
+        changed = {
+            composition_id: prices["total_price"]
+            for composition_id, prices in result.compositions.items()
+            if current.get(composition_id) != prices["total_price"]
+        }
+        
+        if changed:
+            db.execute(
+                text(
+                    "UPDATE compositions AS c "
+                    "SET total_price = v.total_price, "
+                    "    total_price_lei = ROUND(v.total_price * :rate, 2), "
+                    "    updated_at = :now "
+                    "FROM unnest(CAST(:ids AS uuid[]), CAST(:total_prices AS numeric[])) "
+                    "     AS v(id, total_price) "
+                    "WHERE c.id = v.id"
+                ),
+                {
+                    "ids": [str(i) for i in changed],
+                    "total_prices": list(changed.values()),
+                    "rate": rate,
+                    "now": now
+                }
+            )
+            mark_changed(db, "compositions", changed)
+        
+        return {"compositions": len(result.compositions), "updated_compositions": len(changed)}
+    
+    @staticmethod
+    def reprice_all(db: Session) -> Dict[str, Any]:
+        """
+        Recalculer tous les articles puis toutes les compositions
+        
+        Les modifications sont faites dans la transaction en cours : l'appelant
+        est responsable du commit. Seules les lignes dont le prix change
+        sont réécrites.
+        
+        Args:
+            db: Session de base de données
+        
+        Returns:
+            Dict avec statistiques et durées (ms) de chaque étape
+        """
+        timings = {}
+        started = time.perf_counter()
+        now = datetime.utcnow().isoformat()
+        rate = ExchangeRateService.get_current_rate(db)
+        
+        step = time.perf_counter()
+        materials, lines, articles = CatalogRepriceService._load_frames(db)
+        timings["load_ms"] = round((time.perf_counter() - step) * 1000, 1)
+        
+        step = time.perf_counter()
+        priced = CatalogRepriceService.compute_article_prices(materials, lines, articles)
+        changed = priced[
+            (priced["material_cost"] != priced["current_material_cost"])
+            | (priced["total_price"] != priced["current_total_price"])
+        ]
+        timings["compute_ms"] = round((time.perf_counter() - step) * 1000, 1)
+        
+        step = time.perf_counter()
+        if len(changed):
+            CatalogRepriceService._write_articles(db, changed, rate, now)
+        timings["write_ms"] = round((time.perf_counter() - step) * 1000, 1)
+        
+        step = time.perf_counter()
+        article_totals = {
+            article_id: Decimal(int(total_price)) / PRICE_SCALE
+            for article_id, total_price in zip(priced["article_id"], priced["total_price"])
+        }
+        composition_stats = CatalogRepriceService._reprice_compositions(db, article_totals, rate, now)
+        timings["compositions_ms"] = round((time.perf_counter() - step) * 1000, 1)
+        
+        timings["total_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        
+        return {
+            "materials": len(materials),
+            "article_lines": len(lines),
+            "articles": len(priced),
+            "updated_articles": len(changed),
+            **composition_stats,
+            "timings": timings
+        }
@@ -0,0 +1,107 @@
+"""
+Service de recherche dans le catalogue
+Recherche tolérante aux fautes et aux accents (pg_trgm + unaccent), classée par similarité
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+
+# Terme normalisé comme les colonnes search_text (constant pour le planificateur)
+TERM_SQL = "lower(f_unaccent(:q))"
+
+# Terme échappé pour LIKE
+PATTERN_SQL = rf"replace(replace(replace({TERM_SQL}, '\', '\\'), '%', '\%'), '_', '\_')"
+
+# Type -> (table, colonne du nom, colonne du prix EUR)
+SEARCH_SOURCES = {
+    "materials": ("materials", "name_fr", "price_eur"),
+    "articles": ("articles", "name", "total_price"),
+    "services": ("services", "name", "price_gross"),
+}
+
+
+def normalized_term(search: str):
+    """Expression SQL du terme normalisé (filtres `search` des listes)"""
+    return func.lower(func.f_unaccent(search))
+
+
+def _branch(kind: str, active_only: bool) -> str:
+    """
+    Requête d'un type : correspondances trigrammes ou sous-chaîne
+    
+    Les deux conditions sont servies par l'index GIN gin_trgm_ops. Le
+    score est la similarité du terme avec le meilleur extrait du texte,
+    augmentée de 1 quand le code commence par le terme.
+    """
+    table, name, price = SEARCH_SOURCES[kind]
+    active = "AND is_active" if active_only else ""
+    return f"""
+        (SELECT '{kind}' AS type, id, code, {name} AS name, unit, {price} AS price_eur,
+                word_similarity({TERM_SQL}, search_text)
+                + CASE WHEN search_text LIKE {PATTERN_SQL} || '%' THEN 1 ELSE 0 END AS score
+         FROM {table}
+         WHERE ({TERM_SQL} <% search_text OR search_text LIKE '%' || {PATTERN_SQL} || '%') {active}
+         ORDER BY score DESC
+         LIMIT :limit)
+    """
+
+
+class CatalogSearchService:
+    """Service de recherche dans le catalogue"""
+    
+    @staticmethod
+    def search(
+        db: Session,
+        q: str,
+        types: Optional[Sequence[str]] = None,
+        limit: int = 20,
+        active_only: bool = True,
+        threshold: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Rechercher dans les matériaux, articles et services en une requête
+        
+        Le terme et les colonnes search_text sont comparés sans accents ni
+        casse ("panou" trouve "panoù") ; les fautes de frappe sont tolérées
+        par la similarité des trigrammes (seuil SEARCH_SIMILARITY_THRESHOLD).
+        
+        Args:
+            db: Session de base de données
+            q: Terme recherché
+            types: Types à interroger (materials, articles, services), tous par défaut
+            limit: Nombre maximum de résultats
+            active_only: Exclure les éléments désactivés
+            threshold: Seuil de similarité (0 à 1)
+        
+        Returns:
+            Liste de dicts (type, id, code, name, unit, price_eur, score),
+            du plus pertinent au moins pertinent
+        
+        Raises:
+            ValueError si un type n'est pas pris en charge
+        """
+        types = list(types or SEARCH_SOURCES)
+        for kind in types:
+            if kind not in SEARCH_SOURCES:
+                raise ValueError(f"Type de recherche '{kind}' non pris en charge")
+        
+        # Seuil de l'opérateur <%, limité à la transaction en cours
+        db.execute(
+            text("SELECT set_config('pg_trgm.word_similarity_threshold', :threshold, true)"),
+            {"threshold": str(threshold if threshold is not None else settings.SEARCH_SIMILARITY_THRESHOLD)}
+        )
+        
+        union = " UNION ALL ".join(_branch(kind, active_only) for kind in types)
+        rows = db.execute(
+            text(f"SELECT * FROM ({union}) AS results ORDER BY score DESC, code LIMIT :limit"),
+            {"q": q, "limit": limit}
+        ).mappings().all()
+        
+        return [
+            {**row, "score": round(float(row["score"]), 4)}
+            for row in rows
+        ]
@@ -0,0 +1,34 @@
+"""
+Service des versions du catalogue
+Lire les compteurs par table incrémentés par catalog_events
+"""
+
+from typing import Dict, Iterable
+from sqlalchemy.orm import Session
+
+from app.models.catalog_version import CatalogVersion
+
+
+class CatalogVersionService:
+    """Service de lecture des versions du catalogue"""
+    
+    @staticmethod
+    def get(db: Session, tables: Iterable[str]) -> Dict[str, int]:
+        """
+        Versions courantes de plusieurs tables (une requête sur la clé primaire)
+        
+        Args:
+            db: Session de base de données
+            tables: Tables du catalogue
+        
+        Returns:
+            Dict {table: version}, 0 pour une table jamais modifiée
+        """
+        tables = list(tables)
+        rows = (
+            db.query(CatalogVersion.table_name, CatalogVersion.version)
+            .filter(CatalogVersion.table_name.in_(tables))
+            .all()
+        )
+        versions = dict(rows)
+        return {table: versions.get(table, 0) for table in tables}
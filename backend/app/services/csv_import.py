@@ -0,0 +1,402 @@
+"""
+Service d'import CSV
+Charger les listes de prix fournisseurs par COPY dans une table de staging
+"""
+
+import csv
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+import uuid
+
+from app.services.catalog_events import mark_changed
+from app.services.catalog_reprice import CatalogRepriceService
+from app.services.excel_import import (
+    MATERIAL_COLUMNS,
+    SERVICE_COLUMNS,
+    _material_update_columns,
+    _service_update_columns
+)
+from app.services.exchange_rates import ExchangeRateService
+from app.services.repricing import RepricingService
+
+
+# Octets lus pour détecter l'encodage et le séparateur
+SNIFF_BYTES = 64 * 1024
+
+# Nombre positif, séparateur décimal point ou virgule, au plus 8 chiffres
+# avant la virgule (colonnes Numeric(10, 2))
+NUMBER_PATTERN = r'^[0-9]{1,8}([.,][0-9]+)?$'
+
+# Lignes en erreur détaillées dans le résultat
+ERROR_ROWS_LIMIT = 100
+
+# Au-delà de ce nombre de matériaux dont le prix change, recalculer tout le
+# catalogue plutôt que les seuls articles impactés
+FULL_REPRICE_THRESHOLD = 10_000
+
+
+def _read_header(file_path: str) -> Tuple[List[str], str, str]:
+    """
+    Lire l'en-tête d'un CSV et détecter son format
+    
+    Returns:
+        Tuple (noms de colonnes, séparateur, encodage PostgreSQL)
+    """
+    with open(file_path, 'rb') as f:
+        sample = f.read(SNIFF_BYTES)
+    
+    try:
+        decoded = sample.decode('utf-8-sig')
+        encoding = 'UTF8'
+    except UnicodeDecodeError as e:
+        if len(sample) == SNIFF_BYTES and e.start >= len(sample) - 3:
+            # Caractère multi-octets coupé en fin d'échantillon
+            decoded = sample[:e.start].decode('utf-8-sig')
+            encoding = 'UTF8'
+        else:
+            # Export Excel « CSV (séparateur : point-virgule) » sous Windows
+            decoded = sample.decode('cp1252', errors='replace')
+            encoding = 'WIN1252'
+    
+    lines = decoded.splitlines()
+    if not lines:
+        raise ValueError("Fichier CSV vide")
+    
+    try:
+        delimiter = csv.Sniffer().sniff(lines[0], delimiters=';,\t').delimiter
+    except csv.Error:
+        delimiter = ','
+    
+    header = next(csv.reader([lines[0]], delimiter=delimiter))
+    return [name.strip() for name in header], delimiter, encoding
+
+
+def _field_sql(header: List[str], names: Tuple[str, ...], default: Optional[str] = None) -> str:
+    """Expression SQL d'un champ (colonne de staging nettoyée, sinon défaut)"""
+    for name in names:
+        if name in header:
+            return f"NULLIF(btrim(c{header.index(name)}), '')"
+    return f"'{default}'" if default is not None else "NULL::text"
+
+
+def _number_sql(header: List[str], names: Tuple[str, ...], default: Optional[str] = None) -> str:
+    """Expression SQL d'un nombre en texte, virgule décimale remplacée par un point"""
+    return f"replace({_field_sql(header, names, default)}, ',', '.')"
+
+
+def _provided(header: List[str], columns: Dict[str, Tuple[str, ...]]) -> set:
+    """Champs présents dans l'en-tête"""
+    return {field for field, names in columns.items() if any(name in header for name in names)}
+
+
+class CsvImportService:
+    """Service pour importer des listes de prix CSV en masse"""
+    
+    @staticmethod
+    def _load_staging(file_path: str, db: Session) -> Tuple[str, List[str]]:
+        """
+        Créer une table de staging UNLOGGED et y copier le fichier (COPY FROM STDIN)
+        
+        Toutes les colonnes sont en texte : les conversions et contrôles sont
+        faits ensuite en SQL. La table est créée dans la transaction en
+        cours et supprimée par _drop_staging.
+        
+        Returns:
+            Tuple (nom de la table, en-têtes du fichier)
+        """
+        header, delimiter, encoding = _read_header(file_path)
+        table = f"import_staging_{uuid.uuid4().hex}"
+        columns = [f"c{i}" for i in range(len(header))]
+        
+        db.execute(text(
+            f"CREATE UNLOGGED TABLE {table} ("
+            f"line_no bigint GENERATED ALWAYS AS IDENTITY, "
+            + ", ".join(f"{column} text" for column in columns)
+            + ")"
+        ))
+        
+        delimiter_sql = "E'\\t'" if delimiter == '\t' else f"'{delimiter}'"
+        cursor = db.connection().connection.cursor()
+        try:
+            with open(file_path, 'rb') as f:
+                cursor.copy_expert(
+                    f"COPY {table} ({', '.join(columns)}) FROM STDIN "
+                    f"WITH (FORMAT csv, HEADER true, DELIMITER {delimiter_sql}, ENCODING '{encoding}')",
+                    f
+                )
+        finally:
+            cursor.close()
+        
+        return table, header
+    
+    @staticmethod
+    def _drop_staging(db: Session, table: str) -> None:
+        """Supprimer la table de staging (annulée aussi avec la transaction)"""
+        db.execute(text(f"DROP TABLE IF EXISTS {table}"))
+    
+    @staticmethod
+    def _statistics(row) -> Dict[str, Any]:
+        """Statistiques d'import à partir de la ligne de résultat de la fusion"""
+        return {
+            "created": row.created,
+            "updated": row.updated,
+            "unchanged": row.valid - row.created - row.updated,
+            "errors": row.errors,
+            "error_rows": list(row.error_rows or []),
+            "total": row.created + row.updated
+        }
+    
+    @staticmethod
+    def import_materials(file_path: str, db: Session) -> Dict[str, Any]:
+        """
+        Importer une liste de prix de matériaux CSV
+        
+        Colonnes reconnues : celles de l'import Excel (Code, Nom FR, Nom RO,
+        Unité, Prix EUR, Prix LEI, Fournisseur). Le fichier est copié dans une
+        table de staging, puis fusionné dans `materials` par une seule requête
+        (UPDATE des lignes modifiées + INSERT ... ON CONFLICT des nouvelles).
+        Le prix LEI absent est calculé en SQL au taux courant ; pour un même
+        code, la dernière ligne l'emporte. Les prix créés ou modifiés sont
+        ajoutés à l'historique par la même requête ; les articles impactés
+        sont recalculés avant le commit.
+        
+        Args:
+            file_path: Chemin du fichier CSV
+            db: Session de base de données
+        
+        Returns:
+            Dict avec statistiques d'import
+        """
+        try:
+            table, header = CsvImportService._load_staging(file_path, db)
+            provided = _provided(header, MATERIAL_COLUMNS)
+            if "code" not in provided:
+                raise ValueError("Colonne Code absente du fichier")
+            
+            update_columns = _material_update_columns(provided)
+            assignments = ", ".join(f"{column} = v.{column}" for column in update_columns)
+            current = ", ".join(f"m.{column}" for column in update_columns)
+            incoming = ", ".join(f"v.{column}" for column in update_columns)
+            now = datetime.utcnow()
+            
+            row = db.execute(
+                text(f"""
+                WITH parsed AS (
+                    SELECT line_no,
+                           {_field_sql(header, MATERIAL_COLUMNS["code"])} AS code,
+                           {_field_sql(header, MATERIAL_COLUMNS["name_fr"])} AS name_fr,
+                           {_field_sql(header, MATERIAL_COLUMNS["name_ro"])} AS name_ro,
+                           {_field_sql(header, MATERIAL_COLUMNS["unit"])} AS unit,
+                           {_field_sql(header, MATERIAL_COLUMNS["supplier"])} AS supplier,
+                           {_number_sql(header, MATERIAL_COLUMNS["price_eur"], "0")} AS price_eur,
+                           {_number_sql(header, MATERIAL_COLUMNS["price_lei"])} AS price_lei
+                    FROM {table}
+                ),
+                checked AS (
+                    SELECT *,
+                           COALESCE(code IS NOT NULL
+                                    AND price_eur ~ :number
+                                    AND (price_lei IS NULL OR price_lei ~ :number), false) AS valid
+                    FROM parsed
+                ),
+                v AS (
+                    SELECT DISTINCT ON (code)
+                           code,
+                           COALESCE(name_fr, code) AS name_fr,
+                           name_ro,
+                           COALESCE(unit, 'u') AS unit,
+                           supplier,
+                           ROUND(price_eur::numeric, 2) AS price_eur,
+                           COALESCE(ROUND(price_lei::numeric, 2),
+                                    ROUND(ROUND(price_eur::numeric, 2) * :rate, 2)) AS price_lei
+                    FROM checked
+                    WHERE valid
+                    ORDER BY code, line_no DESC
+                ),
+                upd AS (
+                    UPDATE materials AS m
+                    SET {assignments}, price_date = :now, updated_at = :now
+                    FROM v, materials AS old
+                    WHERE m.code = v.code AND old.id = m.id
+                      AND ({current}) IS DISTINCT FROM ({incoming})
+                    RETURNING m.id, m.price_eur, m.price_lei,
+                              old.price_eur IS DISTINCT FROM v.price_eur AS repriced,
+                              (old.price_eur, old.price_lei) IS DISTINCT FROM (v.price_eur, v.price_lei) AS new_price
+                ),
+                ins AS (
+                    INSERT INTO materials (id, code, name_fr, name_ro, unit, price_eur, price_lei,
+                                           supplier, price_date, is_active, created_at, updated_at)
+                    SELECT gen_random_uuid(), v.code, v.name_fr, v.name_ro, v.unit, v.price_eur,
+                           v.price_lei, v.supplier, :now, true, :now, :now
+                    FROM v
+                    WHERE NOT EXISTS (SELECT 1 FROM materials WHERE materials.code = v.code)
+                    ON CONFLICT (code) DO NOTHING
+                    RETURNING id, price_eur, price_lei
+                ),
+                history AS (
+                    INSERT INTO material_prices (id, material_id, price_eur, price_lei, valid_from, source)
+                    SELECT gen_random_uuid(), p.id, p.price_eur, p.price_lei, :valid_from, 'csv'
+                    FROM (
+                        SELECT id, price_eur, price_lei FROM upd WHERE new_price
+                        UNION ALL
+                        SELECT id, price_eur, price_lei FROM ins
+                    ) p
+                    RETURNING 1
+                )
+                SELECT (SELECT count(*) FROM v) AS valid,
+                       (SELECT count(*) FROM checked WHERE NOT valid) AS errors,
+                       (SELECT count(*) FROM ins) AS created,
+                       (SELECT count(*) FROM upd) AS updated,
+                       (SELECT array_agg(id) FROM upd WHERE repriced) AS repriced_ids,
+                       (SELECT array_agg(n) FROM (
+                            SELECT line_no + 1 AS n FROM checked WHERE NOT valid
+                            ORDER BY line_no LIMIT {ERROR_ROWS_LIMIT}
+                        ) e) AS error_rows
+                """),
+                {
+                    "number": NUMBER_PATTERN,
+                    "rate": ExchangeRateService.get_current_rate(db),
+                    "now": now.isoformat(),
+                    "valid_from": now
+                }
+            ).one()
+            
+            CsvImportService._drop_staging(db, table)
+            
+            if row.created or row.updated:
+                mark_changed(db, "materials")
+            
+            # Recalculer les articles/compositions impactés
+            repriced_ids = row.repriced_ids or []
+            if len(repriced_ids) > FULL_REPRICE_THRESHOLD:
+                result = CatalogRepriceService.reprice_all(db)
+                repriced = {"articles": result["updated_articles"], "compositions": result["updated_compositions"]}
+            else:
+                repriced = RepricingService.reprice_dependents(db, material_ids=repriced_ids)
+            
+            db.commit()
+            
+            return {
+                **CsvImportService._statistics(row),
+                "repriced_articles": repriced["articles"],
+                "repriced_compositions": repriced["compositions"]
+            }
+        
+        except Exception as e:
+            db.rollback()
+            raise Exception(f"Erreur lors de l'import CSV: {str(e)}")
+    
+    @staticmethod
+    def import_services(file_path: str, db: Session) -> Dict[str, Any]:
+        """
+        Importer une liste de prix de services CSV
+        
+        Colonnes reconnues : celles de l'import Excel (Code, Nom, Description,
+        Unité, Prix Net, Prix Brut). Même principe que import_materials ;
+        la marge et les prix LEI sont calculés en SQL.
+        
+        Args:
+            file_path: Chemin du fichier CSV
+            db: Session de base de données
+        
+        Returns:
+            Dict avec statistiques d'import
+        """
+        try:
+            table, header = CsvImportService._load_staging(file_path, db)
+            provided = _provided(header, SERVICE_COLUMNS)
+            if "code" not in provided:
+                raise ValueError("Colonne Code absente du fichier")
+            
+            update_columns = _service_update_columns(provided)
+            assignments = ", ".join(f"{column} = v.{column}" for column in update_columns)
+            current = ", ".join(f"s.{column}" for column in update_columns)
+            incoming = ", ".join(f"v.{column}" for column in update_columns)
+            
+            row = db.execute(
+                text(f"""
+                WITH parsed AS (
+                    SELECT line_no,
+                           {_field_sql(header, SERVICE_COLUMNS["code"])} AS code,
+                           {_field_sql(header, SERVICE_COLUMNS["name"])} AS name,
+                           {_field_sql(header, SERVICE_COLUMNS["description"])} AS description,
+                           {_field_sql(header, SERVICE_COLUMNS["unit"])} AS unit,
+                           {_number_sql(header, SERVICE_COLUMNS["price_net"], "0")} AS price_net,
+                           {_number_sql(header, SERVICE_COLUMNS["price_gross"], "0")} AS price_gross
+                    FROM {table}
+                ),
+                checked AS (
+                    SELECT *,
+                           COALESCE(code IS NOT NULL
+                                    AND price_net ~ :number
+                                    AND price_gross ~ :number, false) AS valid
+                    FROM parsed
+                ),
+                prices AS (
+                    SELECT DISTINCT ON (code)
+                           code,
+                           COALESCE(name, code) AS name,
+                           description,
+                           COALESCE(unit, 'ft') AS unit,
+                           ROUND(price_net::numeric, 2) AS price_net,
+                           ROUND(price_gross::numeric, 2) AS price_gross
+                    FROM checked
+                    WHERE valid
+                    ORDER BY code, line_no DESC
+                ),
+                v AS (
+                    SELECT *,
+                           price_gross - price_net AS margin,
+                           ROUND(price_net * :rate, 2) AS price_net_lei,
+                           ROUND(price_gross * :rate, 2) AS price_gross_lei
+                    FROM prices
+                ),
+                upd AS (
+                    UPDATE services AS s
+                    SET {assignments}, updated_at = :now
+                    FROM v
+                    WHERE s.code = v.code
+                      AND ({current}) IS DISTINCT FROM ({incoming})
+                    RETURNING s.id
+                ),
+                ins AS (
+                    INSERT INTO services (id, code, name, description, unit, price_net, price_gross,
+                                          price_net_lei, price_gross_lei, margin, is_active,
+                                          created_at, updated_at)
+                    SELECT gen_random_uuid(), v.code, v.name, v.description, v.unit, v.price_net,
+                           v.price_gross, v.price_net_lei, v.price_gross_lei, v.margin, true, :now, :now
+                    FROM v
+                    WHERE NOT EXISTS (SELECT 1 FROM services WHERE services.code = v.code)
+                    ON CONFLICT (code) DO NOTHING
+                    RETURNING id
+                )
+                SELECT (SELECT count(*) FROM v) AS valid,
+                       (SELECT count(*) FROM checked WHERE NOT valid) AS errors,
+                       (SELECT count(*) FROM ins) AS created,
+                       (SELECT count(*) FROM upd) AS updated,
+                       (SELECT array_agg(n) FROM (
+                            SELECT line_no + 1 AS n FROM checked WHERE NOT valid
+                            ORDER BY line_no LIMIT {ERROR_ROWS_LIMIT}
+                        ) e) AS error_rows
+                """),
+                {
+                    "number": NUMBER_PATTERN,
+                    "rate": ExchangeRateService.get_current_rate(db),
+                    "now": datetime.utcnow().isoformat()
+                }
+            ).one()
+            
+            CsvImportService._drop_staging(db, table)
+            
+            if row.created or row.updated:
+                mark_changed(db, "services")
+            
+            db.commit()
+            
+            return CsvImportService._statistics(row)
+        
+        except Exception as e:
+            db.rollback()
+            raise Exception(f"Erreur lors de l'import CSV: {str(e)}")
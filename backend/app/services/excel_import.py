@@ -4,8 +4,13 @@ Importer la matrice de prix depuis un fichier Excel
 """
 
 import pandas as pd
-from typing import List, Dict, Optional
-from decimal import Decimal
+import time
+import zipfile
+from openpyxl import load_workbook
+from typing import Any, Callable, Iterator, List, Dict, Optional, Tuple
+from decimal import Decimal, ROUND_HALF_UP
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 import uuid
 from datetime import datetime
@@ -13,12 +18,805 @@ from datetime import datetime
 from app.models.material import Material
 from app.models.article import Article, ArticleMaterial
 from app.models.service import Service
+from app.config import settings
+from app.utils.files import sha256_file
+from app.utils.lru import LRUCache
+from app.services.catalog_events import mark_changed
 from app.services.price_calculator import PriceCalculator
+from app.services.price_history import PriceHistoryService
+from app.services.repricing import RepricingService
+from app.services.exchange_rates import ExchangeRateService
+
+
+# Nombre de lignes par requête INSERT ... ON CONFLICT
+UPSERT_BATCH_SIZE = 1000
+
+# Nombre maximal de lignes détaillées par liste du rapport de validation
+DRY_RUN_REPORT_LIMIT = 1000
+
+# Unités courantes, complétées par celles déjà présentes dans la table
+KNOWN_UNITS = {"u", "ft", "m", "ml", "m2", "m3", "kg", "t", "l", "h", "ens"}
+
+CENT = Decimal('0.01')
+
+# Échelle des quantités et taux (Numeric(10, 4) et Numeric(5, 4))
+TEN_THOUSANDTH = Decimal('0.0001')
+
+# Structures détectées, par empreinte SHA-256 du fichier
+_structure_cache = LRUCache(maxsize=64)
+
+# Suivi d'un import par blocs : (lignes lues, statistiques cumulées)
+ProgressCallback = Callable[[int, Dict[str, Any]], None]
+
+# Colonnes acceptées pour chaque champ (en-tête Excel, nom technique)
+MATERIAL_COLUMNS = {
+    "code": ("Code", "code"),
+    "name_fr": ("Nom FR", "name_fr"),
+    "name_ro": ("Nom RO", "name_ro"),
+    "unit": ("Unité", "unit"),
+    "price_eur": ("Prix EUR", "price_eur"),
+    "price_lei": ("Prix LEI", "price_lei"),
+    "supplier": ("Fournisseur", "supplier"),
+}
+
+SERVICE_COLUMNS = {
+    "code": ("Code", "code"),
+    "name": ("Nom", "name"),
+    "description": ("Description", "description"),
+    "unit": ("Unité", "unit"),
+    "price_net": ("Prix Net", "price_net"),
+    "price_gross": ("Prix Brut", "price_gross"),
+}
+
+ARTICLE_COLUMNS = {
+    "code": ("Code", "code"),
+    "name": ("Nom", "name"),
+    "description": ("Description", "description"),
+    "unit": ("Unité", "unit"),
+    "labor_cost": ("Main d'œuvre", "Main d'oeuvre", "labor_cost"),
+    "overhead": ("Frais généraux", "overhead"),
+    "margin": ("Marge", "margin"),
+}
+
+BOM_COLUMNS = {
+    "article_code": ("Code article", "article_code"),
+    "material_code": ("Code matériau", "material_code"),
+    "quantity": ("Quantité", "quantity"),
+    "waste_percent": ("Perte", "waste_percent"),
+}
+
+
+def _column(df: pd.DataFrame, names: Tuple[str, ...]) -> Optional[pd.Series]:
+    """Première colonne présente parmi les noms acceptés"""
+    for name in names:
+        if name in df.columns:
+            return df[name]
+    return None
+
+
+def _text_column(df: pd.DataFrame, names: Tuple[str, ...], default: Any = None) -> pd.Series:
+    """Colonne texte nettoyée (espaces retirés, vide -> défaut)"""
+    values = _column(df, names)
+    if values is None:
+        values = pd.Series(None, index=df.index, dtype=object)
+    
+    values = values.astype(object).where(values.notna(), None)
+    values = values.map(lambda v: str(v).strip() if v is not None else None)
+    values = values.where(values != "", None)
+    
+    if default is not None:
+        values = values.where(values.notna(), default)
+    
+    return values
+
+
+def _decimal_column(
+    df: pd.DataFrame,
+    names: Tuple[str, ...],
+    default: Any = None,
+    exponent: Decimal = CENT
+) -> Tuple[pd.Series, pd.Series]:
+    """
+    Colonne numérique positive en Decimal arrondis à l'exposant donné
+    
+    Returns:
+        Tuple (valeurs ou None, masque des valeurs non numériques ou négatives)
+    """
+    raw = _column(df, names)
+    if raw is None:
+        raw = pd.Series(default, index=df.index, dtype=object)
+    
+    numeric = pd.to_numeric(raw, errors="coerce")
+    invalid = (numeric.isna() & raw.notna()) | (numeric < 0)
+    
+    values = numeric.astype(object).map(
+        lambda v: Decimal(str(v)).quantize(exponent, ROUND_HALF_UP) if pd.notna(v) else None
+    )
+    return values, invalid
+
+
+def _price_column(df: pd.DataFrame, names: Tuple[str, ...], default: Any = None) -> Tuple[pd.Series, pd.Series]:
+    """Colonne de prix en Decimal arrondis au centime (voir _decimal_column)"""
+    return _decimal_column(df, names, default, CENT)
+
+
+def _read_sheet(file_path: str, sheet_name: str) -> pd.DataFrame:
+    """Lire une feuille avec pandas, noms de colonnes sans espaces autour (comme _column_names)"""
+    df = pd.read_excel(file_path, sheet_name=sheet_name)
+    df.columns = df.columns.map(lambda c: str(c).strip())
+    return df
+
+
+def _column_names(header: tuple) -> List[str]:
+    """Noms de colonnes d'une ligne d'en-tête, comme _read_sheet ("Unnamed: i" si vide)"""
+    header = list(header)
+    while header and header[-1] is None:
+        header.pop()
+    return [str(name).strip() if name is not None else f"Unnamed: {i}" for i, name in enumerate(header)]
+
+
+def _canonical(value: Any) -> str:
+    """Représentation stable d'une valeur pour le calcul d'empreinte"""
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return ""
+    if isinstance(value, Decimal):
+        # Même représentation quelle que soit l'échelle (10.00 et 10.0000)
+        return format(value.normalize(), "f")
+    return str(value)
+
+
+def _fingerprint(frame: pd.DataFrame, columns: List[str]) -> pd.Series:
+    """Empreinte (uint64) de chaque ligne sur les colonnes données"""
+    canonical = pd.DataFrame({column: frame[column].map(_canonical) for column in columns})
+    return pd.util.hash_pandas_object(canonical, index=False)
+
+
+def _provided(df: pd.DataFrame, columns: Dict[str, Tuple[str, ...]]) -> set:
+    """Champs présents dans la feuille"""
+    return {field for field, names in columns.items() if _column(df, names) is not None}
+
+
+def _material_update_columns(provided: Optional[set]) -> List[str]:
+    """Colonnes d'un matériau existant réécrites par l'import"""
+    columns = ["name_ro", "price_eur", "price_lei", "supplier"]
+    return columns + [field for field in ("name_fr", "unit") if provided is None or field in provided]
+
+
+def _service_update_columns(provided: Optional[set]) -> List[str]:
+    """Colonnes d'un service existant réécrites par l'import"""
+    columns = ["price_net", "price_gross", "margin", "price_net_lei", "price_gross_lei"]
+    return columns + [field for field in ("name", "unit") if provided is None or field in provided]
+
+
+def _article_update_columns(provided: Optional[set]) -> List[str]:
+    """Colonnes d'un article existant réécrites par l'import (seulement celles fournies)"""
+    columns = ("name", "description", "unit", "labor_cost", "overhead", "margin")
+    return [field for field in columns if provided is None or field in provided]
+
+
+def _validation_issues(
+    df: pd.DataFrame,
+    columns: Dict[str, Tuple[str, ...]],
+    required_prices: Tuple[str, ...],
+    optional_prices: Tuple[str, ...],
+    known_units: set
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Contrôler une feuille colonne par colonne
+    
+    Les erreurs écartent la ligne de l'import (code manquant, prix absent,
+    non numérique ou négatif) ; les avertissements ne l'empêchent pas
+    (code en double, unité inconnue).
+    
+    Returns:
+        Tuple (erreurs, avertissements), colonnes row (ligne Excel), code, field, message
+    """
+    code = _text_column(df, columns["code"])
+    rows = pd.Series(df.index + 2, index=df.index)  # ligne 1 = en-têtes
+    errors, warnings = [], []
+    
+    def add(target: List[pd.DataFrame], mask: pd.Series, field: str, message: str) -> None:
+        if mask.any():
+            target.append(pd.DataFrame({"row": rows[mask], "code": code[mask], "field": field, "message": message}))
+    
+    add(errors, code.isna(), "code", "Code manquant")
+    
+    for field in required_prices + optional_prices:
+        raw = _column(df, columns[field])
+        if raw is None:
+            continue
+        numeric = pd.to_numeric(raw, errors="coerce")
+        if field in required_prices:
+            add(errors, raw.isna(), field, "Prix manquant")
+        add(errors, numeric.isna() & raw.notna(), field, "Prix non numérique")
+        add(errors, numeric < 0, field, "Prix négatif")
+    
+    # Doublons parmi les lignes retenues, comme normalize_* (la dernière l'emporte)
+    rejected = rows.isin(pd.concat(errors)["row"]) if errors else pd.Series(False, index=df.index)
+    accepted = ~rejected
+    add(warnings, accepted & code.where(accepted).duplicated(keep="last"), "code",
+        "Code en double dans le fichier (la dernière ligne l'emporte)")
+    
+    if _column(df, columns["unit"]) is not None:
+        unit = _text_column(df, columns["unit"])
+        add(warnings, unit.notna() & ~unit.isin(known_units), "unit", "Unité inconnue")
+    
+    def collect(frames: List[pd.DataFrame]) -> pd.DataFrame:
+        if not frames:
+            return pd.DataFrame(columns=["row", "code", "field", "message"])
+        return pd.concat(frames).sort_values("row", kind="stable")
+    
+    return collect(errors), collect(warnings)
+
+
+def _report(frame: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Lignes d'un rapport de validation, limitées à DRY_RUN_REPORT_LIMIT"""
+    frame = frame.head(DRY_RUN_REPORT_LIMIT).astype(object)
+    return frame.where(frame.notna(), None).to_dict("records")
 
 
 class ExcelImportService:
     """Service pour importer des données depuis Excel"""
     
+    @staticmethod
+    def normalize_materials(df: pd.DataFrame, rate: Decimal) -> Tuple[pd.DataFrame, int]:
+        """
+        Normaliser une feuille de matériaux colonne par colonne
+        
+        Les lignes sans code ou avec un prix non numérique ou négatif sont
+        comptées en erreur. Pour un même code, la dernière ligne l'emporte. Le prix LEI
+        est calculé au taux fourni s'il est absent.
+        
+        Args:
+            df: Feuille brute
+            rate: Taux EUR → LEI
+        
+        Returns:
+            Tuple (DataFrame normalisé, nombre de lignes en erreur)
+        """
+        code = _text_column(df, MATERIAL_COLUMNS["code"])
+        price_eur, eur_invalid = _price_column(df, MATERIAL_COLUMNS["price_eur"], default=0)
+        price_lei, lei_invalid = _price_column(df, MATERIAL_COLUMNS["price_lei"])
+        
+        records = pd.DataFrame({
+            "code": code,
+            "name_fr": _text_column(df, MATERIAL_COLUMNS["name_fr"], default=code),
+            "name_ro": _text_column(df, MATERIAL_COLUMNS["name_ro"]),
+            "unit": _text_column(df, MATERIAL_COLUMNS["unit"], default="u"),
+            "price_eur": price_eur,
+            "price_lei": price_lei,
+            "supplier": _text_column(df, MATERIAL_COLUMNS["supplier"]),
+        })
+        
+        valid = code.notna() & price_eur.notna() & ~eur_invalid & ~lei_invalid
+        records = records[valid].drop_duplicates("code", keep="last")
+        
+        # Calculer automatiquement le prix LEI si non fourni
+        missing_lei = records["price_lei"].isna()
+        records.loc[missing_lei, "price_lei"] = records.loc[missing_lei, "price_eur"].map(
+            lambda price: PriceCalculator.convert_eur_to_lei(price, rate)
+        )
+        
+        return records, int((~valid).sum())
+    
+    @staticmethod
+    def normalize_services(df: pd.DataFrame, rate: Decimal) -> Tuple[pd.DataFrame, int]:
+        """
+        Normaliser une feuille de services colonne par colonne
+        
+        Calcule la marge et les prix LEI. Les lignes sans code ou avec un prix
+        non numérique ou négatif sont comptées en erreur ; pour un même code,
+        la dernière ligne l'emporte.
+        
+        Args:
+            df: Feuille brute
+            rate: Taux EUR → LEI
+        
+        Returns:
+            Tuple (DataFrame normalisé, nombre de lignes en erreur)
+        """
+        code = _text_column(df, SERVICE_COLUMNS["code"])
+        price_net, net_invalid = _price_column(df, SERVICE_COLUMNS["price_net"], default=0)
+        price_gross, gross_invalid = _price_column(df, SERVICE_COLUMNS["price_gross"], default=0)
+        
+        records = pd.DataFrame({
+            "code": code,
+            "name": _text_column(df, SERVICE_COLUMNS["name"], default=code),
+            "description": _text_column(df, SERVICE_COLUMNS["description"]),
+            "unit": _text_column(df, SERVICE_COLUMNS["unit"], default="ft"),
+            "price_net": price_net,
+            "price_gross": price_gross,
+        })
+        
+        valid = code.notna() & price_net.notna() & price_gross.notna() & ~net_invalid & ~gross_invalid
+        records = records[valid].drop_duplicates("code", keep="last")
+        
+        records["margin"] = [
+            PriceCalculator.calculate_service_margin(net, gross)
+            for net, gross in zip(records["price_net"], records["price_gross"])
+        ]
+        records["price_net_lei"] = records["price_net"].map(lambda price: PriceCalculator.convert_eur_to_lei(price, rate))
+        records["price_gross_lei"] = records["price_gross"].map(lambda price: PriceCalculator.convert_eur_to_lei(price, rate))
+        
+        return records, int((~valid).sum())
+    
+    @staticmethod
+    def normalize_articles(df: pd.DataFrame, rate: Optional[Decimal] = None) -> Tuple[pd.DataFrame, int]:
+        """
+        Normaliser une feuille d'en-têtes d'articles colonne par colonne
+        
+        Les lignes sans code ou avec un montant non numérique ou négatif sont
+        comptées en erreur ; pour un même code, la dernière ligne l'emporte.
+        Les prix sont calculés après l'import des nomenclatures.
+        
+        Args:
+            df: Feuille brute
+            rate: Inutilisé (signature commune des normalisations)
+        
+        Returns:
+            Tuple (DataFrame normalisé, nombre de lignes en erreur)
+        """
+        code = _text_column(df, ARTICLE_COLUMNS["code"])
+        labor_cost, labor_invalid = _price_column(df, ARTICLE_COLUMNS["labor_cost"], default=0)
+        overhead, overhead_invalid = _decimal_column(
+            df, ARTICLE_COLUMNS["overhead"], settings.DEFAULT_OVERHEAD, TEN_THOUSANDTH
+        )
+        margin, margin_invalid = _decimal_column(
+            df, ARTICLE_COLUMNS["margin"], settings.DEFAULT_MARGIN, TEN_THOUSANDTH
+        )
+        
+        records = pd.DataFrame({
+            "code": code,
+            "name": _text_column(df, ARTICLE_COLUMNS["name"], default=code),
+            "description": _text_column(df, ARTICLE_COLUMNS["description"]),
+            "unit": _text_column(df, ARTICLE_COLUMNS["unit"], default="u"),
+            "labor_cost": labor_cost.where(labor_cost.notna(), Decimal("0.00")),
+            "overhead": overhead.where(
+                overhead.notna(), Decimal(str(settings.DEFAULT_OVERHEAD)).quantize(TEN_THOUSANDTH)
+            ),
+            "margin": margin.where(
+                margin.notna(), Decimal(str(settings.DEFAULT_MARGIN)).quantize(TEN_THOUSANDTH)
+            ),
+        })
+        
+        valid = code.notna() & ~labor_invalid & ~overhead_invalid & ~margin_invalid
+        records = records[valid].drop_duplicates("code", keep="last")
+        
+        return records, int((~valid).sum())
+    
+    @staticmethod
+    def normalize_bom(df: pd.DataFrame, rate: Optional[Decimal] = None) -> Tuple[pd.DataFrame, int]:
+        """
+        Normaliser une feuille de nomenclatures (une ligne par matériau d'article)
+        
+        Les lignes sans code article, sans code matériau ou sans quantité
+        strictement positive sont comptées en erreur. La perte est une
+        fraction (0.1 pour 10 %), 0 par défaut.
+        
+        Args:
+            df: Feuille brute
+            rate: Inutilisé (signature commune des normalisations)
+        
+        Returns:
+            Tuple (DataFrame normalisé, nombre de lignes en erreur)
+        """
+        article_code = _text_column(df, BOM_COLUMNS["article_code"])
+        material_code = _text_column(df, BOM_COLUMNS["material_code"])
+        quantity, quantity_invalid = _decimal_column(df, BOM_COLUMNS["quantity"], exponent=TEN_THOUSANDTH)
+        waste, waste_invalid = _decimal_column(df, BOM_COLUMNS["waste_percent"], 0, TEN_THOUSANDTH)
+        
+        lines = pd.DataFrame({
+            "article_code": article_code,
+            "material_code": material_code,
+            "quantity": quantity,
+            "waste_percent": waste.where(waste.notna(), Decimal("0.0000")),
+        })
+        
+        positive = quantity.map(lambda v: v is not None and v > 0).astype(bool)
+        valid = article_code.notna() & material_code.notna() & positive & ~quantity_invalid & ~waste_invalid
+        
+        return lines[valid], int((~valid).sum())
+    
+    @staticmethod
+    def _upsert(db: Session, model, records: List[Dict], update_columns: List[str]) -> None:
+        """INSERT ... ON CONFLICT (code) DO UPDATE par lots de UPSERT_BATCH_SIZE lignes"""
+        for start in range(0, len(records), UPSERT_BATCH_SIZE):
+            stmt = insert(model).values(records[start:start + UPSERT_BATCH_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[model.code],
+                set_={column: stmt.excluded[column] for column in update_columns}
+            )
+            db.execute(stmt)
+    
+    @staticmethod
+    def diff_existing(
+        records: pd.DataFrame,
+        db: Session,
+        model,
+        compared: List[str]
+    ) -> Tuple[pd.DataFrame, pd.Series, pd.Series]:
+        """
+        Comparer des lignes normalisées aux lignes existantes (une requête)
+        
+        Chaque ligne est réduite à une empreinte (hash_pandas_object) des
+        colonnes comparées, calculée de la même façon des deux côtés.
+        
+        Args:
+            records: Lignes normalisées (colonne code + colonnes comparées)
+            db: Session de base de données
+            model: Modèle cible (Material, Service)
+            compared: Colonnes dont un changement justifie une écriture
+        
+        Returns:
+            Tuple (lignes existantes indexées par code avec id et colonnes
+            comparées, masque des nouvelles lignes, masque des lignes modifiées)
+        """
+        codes = records["code"].tolist()
+        rows = (
+            db.query(model.code, model.id, *[getattr(model, column) for column in compared])
+            .filter(model.code.in_(codes))
+            .all()
+        )
+        existing = pd.DataFrame(rows, columns=["code", "id", *compared]).set_index("code")
+        
+        is_new = ~records["code"].isin(existing.index)
+        if not compared:
+            return existing, is_new, pd.Series(False, index=records.index)
+        
+        incoming = pd.Series(_fingerprint(records, compared).to_numpy(), index=records.index)
+        current = pd.Series(_fingerprint(existing, compared).to_numpy(), index=existing.index)
+        is_changed = ~is_new & (incoming != current.reindex(records["code"], fill_value=0).to_numpy())
+        
+        return existing, is_new, is_changed
+    
+    @staticmethod
+    def upsert_materials(records: pd.DataFrame, db: Session, provided: Optional[set] = None) -> Dict[str, Any]:
+        """
+        Créer ou mettre à jour des matériaux normalisés en masse
+        
+        Une requête pour les lignes existantes, puis des INSERT ... ON CONFLICT
+        par lots pour les seules lignes nouvelles ou dont une valeur diffère
+        (les lignes inchangées gardent leurs dates). Nom FR et unité ne sont
+        mis à jour que s'ils sont fournis par la feuille. Les prix créés ou
+        modifiés sont ajoutés à l'historique. L'appelant est responsable du
+        commit.
+        
+        Args:
+            records: Résultat de normalize_materials
+            db: Session de base de données
+            provided: Champs présents dans la feuille (None = tous)
+        
+        Returns:
+            Dict avec created, updated, unchanged et les ids dont le prix EUR a changé
+        """
+        if records.empty:
+            return {"created": 0, "updated": 0, "unchanged": 0, "repriced_material_ids": []}
+        
+        update_columns = _material_update_columns(provided)
+        existing, is_new, is_changed = ExcelImportService.diff_existing(records, db, Material, update_columns)
+        
+        now = datetime.utcnow().isoformat()
+        rows = []
+        repriced_material_ids = []
+        new_prices = []
+        for record in records[is_new | is_changed].to_dict("records"):
+            if record["code"] in existing.index:
+                current = existing.loc[record["code"]]
+                record["id"] = current["id"]
+                if current["price_eur"] != record["price_eur"]:
+                    repriced_material_ids.append(current["id"])
+                if current["price_eur"] != record["price_eur"] or current["price_lei"] != record["price_lei"]:
+                    new_prices.append(record)
+            else:
+                record["id"] = uuid.uuid4()
+                new_prices.append(record)
+            record["price_date"] = now
+            record["updated_at"] = now
+            rows.append(record)
+        
+        if rows:
+            ExcelImportService._upsert(db, Material, rows, update_columns + ["price_date", "updated_at"])
+            PriceHistoryService.record(db, new_prices, "excel")
+            mark_changed(db, "materials", [row["id"] for row in rows])
+        
+        return {
+            "created": int(is_new.sum()),
+            "updated": int(is_changed.sum()),
+            "unchanged": int((~is_new & ~is_changed).sum()),
+            "repriced_material_ids": repriced_material_ids
+        }
+    
+    @staticmethod
+    def upsert_services(records: pd.DataFrame, db: Session, provided: Optional[set] = None) -> Dict[str, int]:
+        """
+        Créer ou mettre à jour des services normalisés en masse
+        
+        Seules les lignes nouvelles ou dont une valeur diffère sont écrites.
+        Nom et unité ne sont mis à jour que s'ils sont fournis par la feuille,
+        la description seulement à la création. L'appelant est responsable
+        du commit.
+        
+        Args:
+            records: Résultat de normalize_services
+            db: Session de base de données
+            provided: Champs présents dans la feuille (None = tous)
+        
+        Returns:
+            Dict avec created, updated, unchanged
+        """
+        if records.empty:
+            return {"created": 0, "updated": 0, "unchanged": 0}
+        
+        update_columns = _service_update_columns(provided)
+        existing, is_new, is_changed = ExcelImportService.diff_existing(records, db, Service, update_columns)
+        
+        now = datetime.utcnow().isoformat()
+        rows = []
+        for record in records[is_new | is_changed].to_dict("records"):
+            record["id"] = existing.at[record["code"], "id"] if record["code"] in existing.index else uuid.uuid4()
+            record["updated_at"] = now
+            rows.append(record)
+        
+        if rows:
+            ExcelImportService._upsert(db, Service, rows, update_columns + ["updated_at"])
+            mark_changed(db, "services", [row["id"] for row in rows])
+        
+        return {
+            "created": int(is_new.sum()),
+            "updated": int(is_changed.sum()),
+            "unchanged": int((~is_new & ~is_changed).sum())
+        }
+    
+    @staticmethod
+    def upsert_articles(records: pd.DataFrame, db: Session, provided: Optional[set] = None) -> Dict[str, Any]:
+        """
+        Créer ou mettre à jour des en-têtes d'articles normalisés en masse
+        
+        Seules les lignes nouvelles ou dont une valeur diffère sont écrites :
+        INSERT ... ON CONFLICT pour les nouveaux articles (créés à prix nul,
+        recalculés après l'import des nomenclatures), UPDATE en masse par id
+        des seules colonnes fournies pour les articles existants. L'appelant
+        est responsable du commit.
+        
+        Args:
+            records: Résultat de normalize_articles
+            db: Session de base de données
+            provided: Champs présents dans la feuille (None = tous)
+        
+        Returns:
+            Dict avec created, updated, unchanged et les ids des articles à recalculer
+        """
+        if records.empty:
+            return {"created": 0, "updated": 0, "unchanged": 0, "repriced_article_ids": []}
+        
+        update_columns = _article_update_columns(provided)
+        existing, is_new, is_changed = ExcelImportService.diff_existing(records, db, Article, update_columns)
+        
+        now = datetime.utcnow().isoformat()
+        
+        new_rows = [
+            {
+                **record,
+                "id": uuid.uuid4(),
+                "material_cost": Decimal("0.00"),
+                "total_price": Decimal("0.00"),
+                "total_price_lei": Decimal("0.00"),
+                "created_at": now,
+                "updated_at": now
+            }
+            for record in records[is_new].to_dict("records")
+        ]
+        updated_rows = [
+            {
+                "id": existing.at[record["code"], "id"],
+                **{column: record[column] for column in update_columns},
+                "updated_at": now
+            }
+            for record in records[is_changed].to_dict("records")
+        ]
+        
+        if new_rows:
+            ExcelImportService._upsert(db, Article, new_rows, update_columns + ["updated_at"])
+        if updated_rows:
+            db.execute(update(Article), updated_rows)
+        
+        article_ids = [row["id"] for row in new_rows + updated_rows]
+        if article_ids:
+            mark_changed(db, "articles", article_ids)
+        
+        return {
+            "created": len(new_rows),
+            "updated": len(updated_rows),
+            "unchanged": int((~is_new & ~is_changed).sum()),
+            "repriced_article_ids": article_ids
+        }
+    
+    @staticmethod
+    def replace_bom(lines: pd.DataFrame, db: Session) -> Dict[str, Any]:
+        """
+        Remplacer les nomenclatures des articles présents dans la feuille
+        
+        Les codes articles et matériaux sont résolus en ids par une requête
+        chacun ; les nomenclatures actuelles sont chargées en une requête et
+        seuls les articles dont la liste de lignes diffère sont réécrits
+        (DELETE puis INSERT en masse). Les lignes dont un code est inconnu
+        sont comptées en erreur. L'appelant est responsable du commit et du
+        recalcul des prix.
+        
+        Args:
+            lines: Résultat de normalize_bom
+            db: Session de base de données
+        
+        Returns:
+            Dict avec created / updated / unchanged (articles), lines (lignes
+            écrites), errors, codes inconnus et ids des articles à recalculer
+        """
+        stats = {
+            "created": 0, "updated": 0, "unchanged": 0, "lines": 0, "errors": 0,
+            "unknown_articles": [], "unknown_materials": [], "repriced_article_ids": []
+        }
+        if lines.empty:
+            return stats
+        
+        # Tables de correspondance code -> id (une requête chacune)
+        article_codes = lines["article_code"].unique().tolist()
+        material_codes = lines["material_code"].unique().tolist()
+        article_ids = dict(db.query(Article.code, Article.id).filter(Article.code.in_(article_codes)).all())
+        material_ids = dict(db.query(Material.code, Material.id).filter(Material.code.in_(material_codes)).all())
+        
+        lines = lines.assign(
+            article_id=lines["article_code"].map(article_ids),
+            material_id=lines["material_code"].map(material_ids)
+        )
+        unresolved = lines["article_id"].isna() | lines["material_id"].isna()
+        stats["errors"] = int(unresolved.sum())
+        stats["unknown_articles"] = sorted(set(lines.loc[lines["article_id"].isna(), "article_code"]))
+        stats["unknown_materials"] = sorted(set(lines.loc[lines["material_id"].isna(), "material_code"]))
+        lines = lines[~unresolved]
+        
+        # Nomenclature = liste triée de (matériau, quantité, perte)
+        def bom_key(rows) -> tuple:
+            return tuple(sorted(
+                (str(material_id), quantity, waste_percent or Decimal("0"))
+                for material_id, quantity, waste_percent in rows
+            ))
+        
+        incoming = {
+            article_id: bom_key(group[["material_id", "quantity", "waste_percent"]].itertuples(index=False))
+            for article_id, group in lines.groupby("article_id", sort=False)
+        }
+        
+        current: Dict[uuid.UUID, list] = {}
+        for article_id, material_id, quantity, waste_percent in (
+            db.query(
+                ArticleMaterial.article_id,
+                ArticleMaterial.material_id,
+                ArticleMaterial.quantity,
+                ArticleMaterial.waste_percent
+            )
+            .filter(ArticleMaterial.article_id.in_(list(incoming)))
+            .all()
+        ):
+            current.setdefault(article_id, []).append((material_id, quantity, waste_percent))
+        
+        changed = [
+            article_id for article_id, key in incoming.items()
+            if article_id not in current or bom_key(current[article_id]) != key
+        ]
+        stats["created"] = sum(1 for article_id in changed if article_id not in current)
+        stats["updated"] = len(changed) - stats["created"]
+        stats["unchanged"] = len(incoming) - len(changed)
+        
+        if changed:
+            db.query(ArticleMaterial).filter(
+                ArticleMaterial.article_id.in_(changed)
+            ).delete(synchronize_session=False)
+            
+            rows = [
+                {
+                    "id": uuid.uuid4(),
+                    "article_id": article_id,
+                    "material_id": material_id,
+                    "quantity": quantity,
+                    "waste_percent": waste_percent
+                }
+                for article_id, material_id, quantity, waste_percent in (
+                    lines[lines["article_id"].isin(changed)]
+                    [["article_id", "material_id", "quantity", "waste_percent"]]
+                    .itertuples(index=False)
+                )
+            ]
+            for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+                db.execute(insert(ArticleMaterial).values(rows[start:start + UPSERT_BATCH_SIZE]))
+            
+            stats["lines"] = len(rows)
+            stats["repriced_article_ids"] = changed
+            mark_changed(db, "article_materials")
+        
+        return stats
+    
+    @staticmethod
+    def dry_run(file_path: str, db: Session, kind: str, sheet_name: str) -> Dict[str, Any]:
+        """
+        Valider une feuille et calculer les changements sans rien écrire
+        
+        Toute la feuille est contrôlée colonne par colonne, puis les lignes
+        valides sont comparées au catalogue en une requête (diff_existing).
+        Les listes détaillées sont limitées à DRY_RUN_REPORT_LIMIT lignes.
+        
+        Args:
+            file_path: Chemin du fichier Excel
+            db: Session de base de données (lecture seule)
+            kind: Type d'import ("materials" ou "services")
+            sheet_name: Feuille à valider
+        
+        Returns:
+            Dict avec compteurs, erreurs et avertissements par ligne, codes
+            créés et champs modifiés par code
+        """
+        model, columns, normalize, update_columns, required_prices, optional_prices = {
+            "materials": (
+                Material, MATERIAL_COLUMNS, ExcelImportService.normalize_materials,
+                _material_update_columns, ("price_eur",), ("price_lei",)
+            ),
+            "services": (
+                Service, SERVICE_COLUMNS, ExcelImportService.normalize_services,
+                _service_update_columns, ("price_net", "price_gross"), ()
+            ),
+        }[kind]
+        
+        started = time.perf_counter()
+        df = _read_sheet(file_path, sheet_name)
+        
+        known_units = KNOWN_UNITS | {unit for (unit,) in db.query(model.unit).distinct().all()}
+        errors, warnings = _validation_issues(df, columns, required_prices, optional_prices, known_units)
+        
+        rate = ExchangeRateService.get_current_rate(db)
+        records, _ = normalize(df, rate)
+        provided = _provided(df, columns)
+        compared = update_columns(provided)
+        
+        created, updated = [], []
+        updated_count = unchanged = 0
+        if not records.empty:
+            existing, is_new, is_changed = ExcelImportService.diff_existing(records, db, model, compared)
+            unchanged = int((~is_new & ~is_changed).sum())
+            created = records.loc[is_new, "code"].tolist()
+            
+            # Champs modifiés : comparaison des valeurs canoniques, colonne par colonne
+            changed = records[is_changed].set_index("code")
+            before = existing.loc[changed.index]
+            differs = pd.DataFrame({
+                column: changed[column].map(_canonical) != before[column].map(_canonical)
+                for column in compared
+            })
+            for code in changed.index[:DRY_RUN_REPORT_LIMIT]:
+                fields = differs.columns[differs.loc[code].to_numpy()]
+                updated.append({
+                    "code": code,
+                    "changes": {
+                        column: {"old": _canonical(before.at[code, column]), "new": _canonical(changed.at[code, column])}
+                        for column in fields
+                    }
+                })
+            updated_count = int(is_changed.sum())
+        
+        return {
+            "dry_run": True,
+            "rows": len(df),
+            "valid": len(df) - int(errors["row"].nunique()),
+            "errors": int(errors["row"].nunique()),
+            "warnings": len(warnings),
+            "created": len(created),
+            "updated": updated_count,
+            "unchanged": unchanged,
+            "error_rows": _report(errors),
+            "warning_rows": _report(warnings),
+            "created_codes": created[:DRY_RUN_REPORT_LIMIT],
+            "updated_rows": updated,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)
+        }
+    
     @staticmethod
     def import_materials_from_excel(
         file_path: str,
@@ -35,78 +833,32 @@ class ExcelImportService:
             file_path: Chemin du fichier Excel
             db: Session de base de données
             sheet_name: Nom de la feuille à lire
-            
+        
         Returns:
             Dict avec statistiques d'import
         """
         try:
             # Lire le fichier Excel
-            df = pd.read_excel(file_path, sheet_name=sheet_name)
+            df = _read_sheet(file_path, sheet_name)
             
-            created = 0
-            updated = 0
-            errors = 0
+            rate = ExchangeRateService.get_current_rate(db)
+            records, errors = ExcelImportService.normalize_materials(df, rate)
+            result = ExcelImportService.upsert_materials(records, db, _provided(df, MATERIAL_COLUMNS))
             
-            for _, row in df.iterrows():
-                try:
-                    # Vérifier si le matériau existe déjà
-                    code = str(row.get('Code', row.get('code', ''))).strip()
-                    
-                    if not code:
-                        errors += 1
-                        continue
-                    
-                    existing = db.query(Material).filter(Material.code == code).first()
-                    
-                    # Prix
-                    price_eur = Decimal(str(row.get('Prix EUR', row.get('price_eur', 0))))
-                    price_lei = row.get('Prix LEI', row.get('price_lei', None))
-                    if price_lei is not None and pd.notna(price_lei):
-                        price_lei = Decimal(str(price_lei))
-                    else:
-                        # Calculer automatiquement si non fourni
-                        price_lei = PriceCalculator.convert_eur_to_lei(price_eur)
-                    
-                    if existing:
-                        # Mettre à jour
-                        existing.name_fr = str(row.get('Nom FR', row.get('name_fr', existing.name_fr)))
-                        existing.name_ro = str(row.get('Nom RO', row.get('name_ro', ''))) or None
-                        existing.unit = str(row.get('Unité', row.get('unit', existing.unit)))
-                        existing.price_eur = price_eur
-                        existing.price_lei = price_lei
-                        existing.price_date = datetime.utcnow().isoformat()
-                        existing.supplier = str(row.get('Fournisseur', row.get('supplier', ''))) or None
-                        existing.updated_at = datetime.utcnow().isoformat()
-                        
-                        updated += 1
-                    else:
-                        # Créer
-                        material = Material(
-                            id=uuid.uuid4(),
-                            code=code,
-                            name_fr=str(row.get('Nom FR', row.get('name_fr', code))),
-                            name_ro=str(row.get('Nom RO', row.get('name_ro', ''))) or None,
-                            unit=str(row.get('Unité', row.get('unit', 'u'))),
-                            price_eur=price_eur,
-                            price_lei=price_lei,
-                            supplier=str(row.get('Fournisseur', row.get('supplier', ''))) or None,
-                        )
-                        db.add(material)
-                        created += 1
-                    
-                except Exception as e:
-                    print(f"Erreur sur la ligne: {e}")
-                    errors += 1
-                    continue
+            # Recalculer uniquement les articles/compositions impactés
+            repriced = RepricingService.reprice_dependents(db, material_ids=result["repriced_material_ids"])
             
             # Commit tous les changements
             db.commit()
             
             return {
-                "created": created,
-                "updated": updated,
+                "created": result["created"],
+                "updated": result["updated"],
+                "unchanged": result["unchanged"],
                 "errors": errors,
-                "total": created + updated
+                "total": result["created"] + result["updated"],
+                "repriced_articles": repriced["articles"],
+                "repriced_compositions": repriced["compositions"]
             }
         
         except Exception as e:
@@ -129,68 +881,92 @@ class ExcelImportService:
             file_path: Chemin du fichier Excel
             db: Session de base de données
             sheet_name: Nom de la feuille à lire
+        
+        Returns:
+            Dict avec statistiques d'import
+        """
+        try:
+            df = _read_sheet(file_path, sheet_name)
+            
+            rate = ExchangeRateService.get_current_rate(db)
+            records, errors = ExcelImportService.normalize_services(df, rate)
+            result = ExcelImportService.upsert_services(records, db, _provided(df, SERVICE_COLUMNS))
+            
+            db.commit()
             
+            return {
+                "created": result["created"],
+                "updated": result["updated"],
+                "unchanged": result["unchanged"],
+                "errors": errors,
+                "total": result["created"] + result["updated"]
+            }
+        
+        except Exception as e:
+            db.rollback()
+            raise Exception(f"Erreur lors de l'import Excel: {str(e)}")
+    
+    @staticmethod
+    def import_articles_from_excel(
+        file_path: str,
+        db: Session,
+        sheet_name: str = "Articles",
+        bom_sheet_name: Optional[str] = "Nomenclatures"
+    ) -> Dict[str, Any]:
+        """
+        Importer des articles et leurs nomenclatures depuis un fichier Excel
+        
+        Format attendu :
+        - Articles : Code | Nom | Description | Unité | Main d'œuvre | Frais généraux | Marge
+        - Nomenclatures : Code article | Code matériau | Quantité | Perte
+        
+        En-têtes puis nomenclatures sont écrits en masse dans une seule
+        transaction, puis les articles modifiés (et les compositions qui les
+        contiennent) sont recalculés en une seule passe.
+        
+        Args:
+            file_path: Chemin du fichier Excel
+            db: Session de base de données
+            sheet_name: Feuille des en-têtes d'articles
+            bom_sheet_name: Feuille des nomenclatures (None = en-têtes seuls)
+        
         Returns:
             Dict avec statistiques d'import
         """
         try:
-            df = pd.read_excel(file_path, sheet_name=sheet_name)
+            df = _read_sheet(file_path, sheet_name)
+            records, errors = ExcelImportService.normalize_articles(df)
+            result = ExcelImportService.upsert_articles(records, db, _provided(df, ARTICLE_COLUMNS))
             
-            created = 0
-            updated = 0
-            errors = 0
+            lines, bom_errors = pd.DataFrame(columns=list(BOM_COLUMNS)), 0
+            if bom_sheet_name:
+                bom_df = _read_sheet(file_path, bom_sheet_name)
+                lines, bom_errors = ExcelImportService.normalize_bom(bom_df)
+            bom = ExcelImportService.replace_bom(lines, db)
             
-            for _, row in df.iterrows():
-                try:
-                    code = str(row.get('Code', row.get('code', ''))).strip()
-                    
-                    if not code:
-                        errors += 1
-                        continue
-                    
-                    existing = db.query(Service).filter(Service.code == code).first()
-                    
-                    price_net = Decimal(str(row.get('Prix Net', row.get('price_net', 0))))
-                    price_gross = Decimal(str(row.get('Prix Brut', row.get('price_gross', 0))))
-                    margin = PriceCalculator.calculate_service_margin(price_net, price_gross)
-                    
-                    if existing:
-                        # Mettre à jour
-                        existing.name = str(row.get('Nom', row.get('name', existing.name)))
-                        existing.unit = str(row.get('Unité', row.get('unit', existing.unit)))
-                        existing.price_net = price_net
-                        existing.price_gross = price_gross
-                        existing.margin = margin
-                        existing.updated_at = datetime.utcnow().isoformat()
-                        
-                        updated += 1
-                    else:
-                        # Créer
-                        service = Service(
-                            id=uuid.uuid4(),
-                            code=code,
-                            name=str(row.get('Nom', row.get('name', code))),
-                            description=str(row.get('Description', row.get('description', ''))) or None,
-                            unit=str(row.get('Unité', row.get('unit', 'ft'))),
-                            price_net=price_net,
-                            price_gross=price_gross,
-                            margin=margin,
-                        )
-                        db.add(service)
-                        created += 1
-                
-                except Exception as e:
-                    print(f"Erreur sur la ligne: {e}")
-                    errors += 1
-                    continue
+            # Un seul recalcul pour tous les articles touchés
+            repriced = RepricingService.reprice_dependents(
+                db,
+                article_ids=set(result["repriced_article_ids"]) | set(bom["repriced_article_ids"])
+            )
             
             db.commit()
             
             return {
-                "created": created,
-                "updated": updated,
+                "created": result["created"],
+                "updated": result["updated"],
+                "unchanged": result["unchanged"],
                 "errors": errors,
-                "total": created + updated
+                "total": result["created"] + result["updated"],
+                "bom_created": bom["created"],
+                "bom_updated": bom["updated"],
+                "bom_unchanged": bom["unchanged"],
+                "bom_lines": bom["lines"],
+                "bom_errors": bom_errors + bom["errors"],
+                "unknown_articles": bom["unknown_articles"],
+                "unknown_materials": bom["unknown_materials"],
+                "repriced_articles": repriced["articles"],
+                "repriced_compositions": repriced["compositions"]
             }
         
         except Exception as e:
@@ -198,25 +974,251 @@ class ExcelImportService:
             raise Exception(f"Erreur lors de l'import Excel: {str(e)}")
     
     @staticmethod
-    def detect_excel_structure(file_path: str) -> Dict[str, List[str]]:
+    def iter_sheet_chunks(
+        file_path: str,
+        sheet_name: str,
+        chunk_size: Optional[int] = None
+    ) -> Iterator[pd.DataFrame]:
         """
-        Détecter la structure d'un fichier Excel
+        Lire une feuille par blocs de lignes, à mémoire constante
+        
+        Le classeur est ouvert en lecture seule (openpyxl `read_only=True`) :
+        les lignes sont lues au fil de l'eau, jamais toutes en mémoire.
+        Seul le format .xlsx est pris en charge.
         
         Args:
             file_path: Chemin du fichier Excel
+            sheet_name: Nom de la feuille à lire
+            chunk_size: Nombre de lignes par bloc (défaut settings.IMPORT_CHUNK_SIZE)
+        
+        Yields:
+            DataFrame de chunk_size lignes au plus, avec les en-têtes de la feuille
+        """
+        chunk_size = chunk_size or settings.IMPORT_CHUNK_SIZE
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        
+        try:
+            if sheet_name not in workbook.sheetnames:
+                raise ValueError(f"Feuille '{sheet_name}' introuvable")
+            
+            rows = workbook[sheet_name].iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return
+            columns = _column_names(header)
+            
+            buffer = []
+            for row in rows:
+                # Ignorer les lignes entièrement vides
+                if all(value is None for value in row):
+                    continue
+                buffer.append(row[:len(columns)])
+                if len(buffer) >= chunk_size:
+                    yield pd.DataFrame(buffer, columns=columns)
+                    buffer = []
+            
+            if buffer:
+                yield pd.DataFrame(buffer, columns=columns)
+        
+        finally:
+            workbook.close()
+    
+    @staticmethod
+    def count_rows(file_path: str, sheet_name: str) -> Optional[int]:
+        """
+        Nombre de lignes de données d'une feuille, d'après ses dimensions
+        
+        Lu sans parcourir la feuille ; None si le fichier ne les renseigne pas.
+        """
+        workbook = load_workbook(file_path, read_only=True)
+        try:
+            if sheet_name not in workbook.sheetnames:
+                return None
+            max_row = workbook[sheet_name].max_row
+            return max(max_row - 1, 0) if max_row else None
+        finally:
+            workbook.close()
+    
+    @staticmethod
+    def _import_streaming(
+        file_path: str,
+        db: Session,
+        sheet_name: str,
+        import_chunk: Callable[[pd.DataFrame, Session], Dict[str, int]],
+        chunk_size: Optional[int] = None,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Any]:
+        """
+        Importer une feuille bloc par bloc, avec un commit par bloc
+        
+        Un bloc en échec est annulé et ses lignes comptées en erreur ; les
+        blocs déjà validés restent en base. on_progress est appelé après
+        chaque bloc (lignes lues, statistiques) et peut lever une exception
+        pour interrompre l'import.
+        """
+        stats: Dict[str, Any] = {
+            "created": 0, "updated": 0, "unchanged": 0, "errors": 0, "chunks": 0, "failed_chunks": []
+        }
+        processed = 0
+        
+        for number, chunk in enumerate(ExcelImportService.iter_sheet_chunks(file_path, sheet_name, chunk_size), 1):
+            stats["chunks"] = number
+            processed += len(chunk)
             
+            try:
+                result = import_chunk(chunk, db)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                print(f"Erreur sur le bloc {number}: {e}")
+                stats["errors"] += len(chunk)
+                stats["failed_chunks"].append(number)
+            else:
+                for key, value in result.items():
+                    stats[key] = stats.get(key, 0) + value
+            
+            if on_progress:
+                on_progress(processed, stats)
+        
+        stats["total"] = stats["created"] + stats["updated"]
+        return stats
+    
+    @staticmethod
+    def import_materials_streaming(
+        file_path: str,
+        db: Session,
+        sheet_name: str = "Matériaux",
+        chunk_size: Optional[int] = None,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Any]:
+        """
+        Importer des matériaux en flux (mémoire constante)
+        
+        Même format et mêmes règles que import_materials_from_excel ; chaque
+        bloc est normalisé, écrit, répercuté sur les articles/compositions
+        puis validé séparément.
+        
+        Args:
+            file_path: Chemin du fichier Excel (.xlsx)
+            db: Session de base de données
+            sheet_name: Nom de la feuille à lire
+            chunk_size: Nombre de lignes par bloc
+            on_progress: Appelé après chaque bloc avec (lignes lues, statistiques)
+        
+        Returns:
+            Dict avec statistiques d'import (dont chunks et failed_chunks)
+        """
+        rate = ExchangeRateService.get_current_rate(db)
+        
+        def import_chunk(chunk: pd.DataFrame, db: Session) -> Dict[str, int]:
+            records, errors = ExcelImportService.normalize_materials(chunk, rate)
+            result = ExcelImportService.upsert_materials(records, db, _provided(chunk, MATERIAL_COLUMNS))
+            repriced = RepricingService.reprice_dependents(db, material_ids=result["repriced_material_ids"])
+            return {
+                "created": result["created"],
+                "updated": result["updated"],
+                "unchanged": result["unchanged"],
+                "errors": errors,
+                "repriced_articles": repriced["articles"],
+                "repriced_compositions": repriced["compositions"]
+            }
+        
+        return ExcelImportService._import_streaming(file_path, db, sheet_name, import_chunk, chunk_size, on_progress)
+    
+    @staticmethod
+    def import_services_streaming(
+        file_path: str,
+        db: Session,
+        sheet_name: str = "Services",
+        chunk_size: Optional[int] = None,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Any]:
+        """
+        Importer des services en flux (mémoire constante)
+        
+        Args:
+            file_path: Chemin du fichier Excel (.xlsx)
+            db: Session de base de données
+            sheet_name: Nom de la feuille à lire
+            chunk_size: Nombre de lignes par bloc
+            on_progress: Appelé après chaque bloc avec (lignes lues, statistiques)
+        
+        Returns:
+            Dict avec statistiques d'import (dont chunks et failed_chunks)
+        """
+        rate = ExchangeRateService.get_current_rate(db)
+        
+        def import_chunk(chunk: pd.DataFrame, db: Session) -> Dict[str, int]:
+            records, errors = ExcelImportService.normalize_services(chunk, rate)
+            result = ExcelImportService.upsert_services(records, db, _provided(chunk, SERVICE_COLUMNS))
+            return {
+                "created": result["created"],
+                "updated": result["updated"],
+                "unchanged": result["unchanged"],
+                "errors": errors
+            }
+        
+        return ExcelImportService._import_streaming(file_path, db, sheet_name, import_chunk, chunk_size, on_progress)
+    
+    @staticmethod
+    def detect_excel_structure(file_path: str, file_hash: Optional[str] = None) -> Dict[str, List[str]]:
+        """
+        Détecter la structure d'un fichier Excel
+        
+        Seule la ligne d'en-tête de chaque feuille est lue, en une passe sur
+        le classeur ouvert. Le résultat est mis en cache par empreinte du
+        contenu : détecter puis importer le même fichier ne l'analyse qu'une fois.
+        
+        Args:
+            file_path: Chemin du fichier Excel
+            file_hash: Empreinte SHA-256 du fichier si déjà connue
+        
         Returns:
             Dict avec les noms de feuilles et leurs colonnes
         """
         try:
-            xls = pd.ExcelFile(file_path)
+            file_hash = file_hash or sha256_file(file_path)
+            structure = _structure_cache.get(file_hash)
+            if structure is not None:
+                return dict(structure)
+            
             structure = {}
             
-            for sheet_name in xls.sheet_names:
-                df = pd.read_excel(file_path, sheet_name=sheet_name, nrows=5)
-                structure[sheet_name] = list(df.columns)
+            if zipfile.is_zipfile(file_path):
+                # .xlsx : lecture en flux, on s'arrête à la première ligne de chaque feuille
+                workbook = load_workbook(file_path, read_only=True, data_only=True)
+                try:
+                    for worksheet in workbook.worksheets:
+                        header = next(worksheet.iter_rows(max_row=1, values_only=True), ())
+                        structure[worksheet.title] = _column_names(header)
+                finally:
+                    workbook.close()
+            else:
+                # .xls : classeur ouvert une seule fois
+                with pd.ExcelFile(file_path) as xls:
+                    for sheet_name in xls.sheet_names:
+                        structure[sheet_name] = [str(c) for c in xls.parse(sheet_name, nrows=0).columns]
             
-            return structure
+            _structure_cache.set(file_hash, structure)
+            return dict(structure)
         
         except Exception as e:
             raise Exception(f"Erreur lors de la lecture du fichier: {str(e)}")
+    
+    @staticmethod
+    def check_sheet(file_path: str, sheet_name: str, file_hash: Optional[str] = None) -> List[str]:
+        """
+        Vérifier qu'une feuille existe, d'après la structure (en cache)
+        
+        Returns:
+            Colonnes de la feuille
+        
+        Raises:
+            ValueError si la feuille n'existe pas
+        """
+        structure = ExcelImportService.detect_excel_structure(file_path, file_hash)
+        if sheet_name not in structure:
+            raise ValueError(
+                f"Feuille '{sheet_name}' introuvable (feuilles: {', '.join(structure)})"
+            )
+        return structure[sheet_name]
@@ -0,0 +1,201 @@
+"""
+Service des taux de change
+Taux EUR → LEI datés, lecture en cache et mise à jour des prix LEI en masse
+"""
+
+import threading
+import time
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Optional
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+import uuid
+
+from app.config import settings
+from app.models.exchange_rate import ExchangeRate
+from app.services.catalog_events import CatalogChanges, mark_changed, register_listener
+
+
+DEFAULT_CURRENCY = "LEI"
+
+# Durée de validité du taux en cache (secondes)
+RATE_CACHE_SECONDS = 60
+
+# Une requête UPDATE par table : colonne LEI <- colonne EUR × taux
+LEI_COLUMNS = {
+    "materials": [("price_lei", "price_eur")],
+    "articles": [("total_price_lei", "total_price")],
+    "compositions": [("total_price_lei", "total_price")],
+    "services": [("price_net_lei", "price_net"), ("price_gross_lei", "price_gross")],
+}
+
+
+class ExchangeRateService:
+    """Service pour gérer les taux de change"""
+    
+    # {(devise, jour): (taux, expiration)}
+    _cache: Dict = {}
+    _lock = threading.Lock()
+    
+    @staticmethod
+    def get_rate_at(db: Session, at: date, currency: str = DEFAULT_CURRENCY) -> Optional[Decimal]:
+        """
+        Récupérer le taux en vigueur à une date
+        
+        Args:
+            db: Session de base de données
+            at: Date de référence
+            currency: Devise cible
+        
+        Returns:
+            Taux ou None si aucun taux n'est enregistré avant cette date
+        """
+        row = (
+            db.query(ExchangeRate.rate)
+            .filter(ExchangeRate.currency == currency, ExchangeRate.effective_date <= at)
+            .order_by(ExchangeRate.effective_date.desc())
+            .first()
+        )
+        return row[0] if row else None
+    
+    @staticmethod
+    def get_current_rate(db: Session, currency: str = DEFAULT_CURRENCY) -> Decimal:
+        """
+        Récupérer le taux du jour (mis en cache RATE_CACHE_SECONDS)
+        
+        Sans taux enregistré, retombe sur settings.EUR_LEI_RATE.
+        
+        Args:
+            db: Session de base de données
+            currency: Devise cible
+        
+        Returns:
+            Taux EUR → devise
+        """
+        key = (currency, date.today())
+        cached = ExchangeRateService._cache.get(key)
+        if cached and cached[1] > time.monotonic():
+            return cached[0]
+        
+        rate = ExchangeRateService.get_rate_at(db, date.today(), currency)
+        if rate is None:
+            rate = Decimal(str(settings.EUR_LEI_RATE))
+        
+        with ExchangeRateService._lock:
+            ExchangeRateService._cache = {key: (rate, time.monotonic() + RATE_CACHE_SECONDS)}
+        
+        return rate
+    
+    @staticmethod
+    def invalidate_cache() -> None:
+        """Vider le cache du taux courant"""
+        with ExchangeRateService._lock:
+            ExchangeRateService._cache = {}
+    
+    @staticmethod
+    def list_rates(db: Session, currency: str = DEFAULT_CURRENCY, limit: int = 100) -> List[ExchangeRate]:
+        """Lister les taux, du plus récent au plus ancien"""
+        return (
+            db.query(ExchangeRate)
+            .filter(ExchangeRate.currency == currency)
+            .order_by(ExchangeRate.effective_date.desc())
+            .limit(limit)
+            .all()
+        )
+    
+    @staticmethod
+    def apply_rate(db: Session, rate: Decimal) -> Dict[str, int]:
+        """
+        Recalculer tous les prix LEI avec un taux
+        
+        Une requête UPDATE ensembliste par table ; seules les lignes dont le
+        prix LEI change sont réécrites. L'appelant est responsable du commit.
+        
+        Args:
+            db: Session de base de données
+            rate: Taux EUR → LEI
+        
+        Returns:
+            Dict {table: nombre de lignes mises à jour}
+        """
+        updated = {}
+        
+        for table, columns in LEI_COLUMNS.items():
+            assignments = ", ".join(
+                f"{lei} = ROUND({eur} * :rate, 2)" for lei, eur in columns
+            )
+            changed = " OR ".join(
+                f"{lei} IS DISTINCT FROM ROUND({eur} * :rate, 2)" for lei, eur in columns
+            )
+            result = db.execute(
+                text(f"UPDATE {table} SET {assignments} WHERE {changed}"),
+                {"rate": rate}
+            )
+            updated[table] = result.rowcount
+            
+            if result.rowcount:
+                mark_changed(db, table)
+        
+        return updated
+    
+    @staticmethod
+    def publish_rate(
+        db: Session,
+        rate: Decimal,
+        effective_date: Optional[date] = None,
+        currency: str = DEFAULT_CURRENCY
+    ) -> Dict:
+        """
+        Enregistrer un nouveau taux et, s'il est en vigueur, mettre à jour les prix LEI
+        
+        Un taux existant pour la même date est remplacé. L'appelant est
+        responsable du commit.
+        
+        Args:
+            db: Session de base de données
+            rate: Taux EUR → devise
+            effective_date: Date d'effet (aujourd'hui par défaut)
+            currency: Devise cible
+        
+        Returns:
+            Dict avec le taux enregistré, le taux courant et les lignes mises à jour
+        """
+        effective_date = effective_date or date.today()
+        
+        exchange_rate = (
+            db.query(ExchangeRate)
+            .filter(ExchangeRate.currency == currency, ExchangeRate.effective_date == effective_date)
+            .first()
+        )
+        if exchange_rate:
+            exchange_rate.rate = rate
+        else:
+            exchange_rate = ExchangeRate(
+                id=uuid.uuid4(),
+                currency=currency,
+                rate=rate,
+                effective_date=effective_date
+            )
+            db.add(exchange_rate)
+        
+        db.flush()
+        
+        current_rate = ExchangeRateService.get_rate_at(db, date.today(), currency)
+        updated = {}
+        if currency == DEFAULT_CURRENCY and current_rate is not None:
+            updated = ExchangeRateService.apply_rate(db, current_rate)
+        
+        return {
+            "exchange_rate": exchange_rate,
+            "current_rate": current_rate,
+            "updated": updated
+        }
+
+
+def _invalidate_on_commit(changes: CatalogChanges) -> None:
+    if "exchange_rates" in changes:
+        ExchangeRateService.invalidate_cache()
+
+
+register_listener(_invalidate_on_commit)
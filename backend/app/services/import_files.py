@@ -0,0 +1,89 @@
+"""
+Service d'historique des fichiers importés
+Ignorer un fichier déjà importé à l'identique (empreinte SHA-256)
+"""
+
+from typing import Any, Dict, Optional
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from datetime import datetime
+import uuid
+
+from app.models.import_file import ImportFile
+
+
+class ImportFileService:
+    """Service pour l'historique des fichiers importés"""
+    
+    @staticmethod
+    def find(db: Session, sha256: str, kind: str, sheet_name: Optional[str] = None) -> Optional[ImportFile]:
+        """
+        Rechercher un import précédent du même contenu
+        
+        Args:
+            db: Session de base de données
+            sha256: Empreinte du fichier
+            kind: Type d'import
+            sheet_name: Feuille importée
+        
+        Returns:
+            ImportFile ou None
+        """
+        return (
+            db.query(ImportFile)
+            .filter(
+                ImportFile.sha256 == sha256,
+                ImportFile.kind == kind,
+                ImportFile.sheet_name == (sheet_name or "")
+            )
+            .first()
+        )
+    
+    @staticmethod
+    def record(
+        db: Session,
+        sha256: str,
+        kind: str,
+        sheet_name: Optional[str],
+        filename: Optional[str],
+        statistics: Dict[str, Any],
+        user_id: Optional[str] = None
+    ) -> None:
+        """
+        Enregistrer un import réussi (remplace un enregistrement précédent)
+        
+        L'appelant est responsable du commit.
+        """
+        values = {
+            "id": uuid.uuid4(),
+            "sha256": sha256,
+            "kind": kind,
+            "sheet_name": sheet_name or "",
+            "filename": filename,
+            "statistics": statistics,
+            "user_id": user_id,
+            "imported_at": datetime.utcnow().isoformat(),
+        }
+        stmt = insert(ImportFile).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ImportFile.sha256, ImportFile.kind, ImportFile.sheet_name],
+            set_={
+                "filename": stmt.excluded.filename,
+                "statistics": stmt.excluded.statistics,
+                "user_id": stmt.excluded.user_id,
+                "imported_at": stmt.excluded.imported_at,
+            }
+        )
+        db.execute(stmt)
+    
+    @staticmethod
+    def skipped_response(previous: ImportFile) -> Dict[str, Any]:
+        """Réponse d'un import ignoré car déjà fait à l'identique"""
+        return {
+            "message": "Fichier identique déjà importé, import ignoré",
+            "skipped": True,
+            "statistics": previous.statistics,
+            "file": previous.filename,
+            "sheet": previous.sheet_name or None,
+            "imported_at": previous.imported_at
+        }
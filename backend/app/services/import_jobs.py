@@ -0,0 +1,342 @@
+"""
+Service des imports en arrière-plan
+Exécuter les imports Excel dans un pool de workers avec suivi de progression
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Optional
+import uuid
+
+from app.config import settings
+from app.database import SessionLocal
+from app.services.excel_import import ExcelImportService
+from app.services.csv_import import CsvImportService
+from app.services.import_files import ImportFileService
+from app.utils.redis_client import get_redis
+
+
+class ImportLockedError(Exception):
+    """Un import est déjà en cours sur la table"""
+    
+    def __init__(self, table: str):
+        self.table = table
+        super().__init__(f"Un import de '{table}' est déjà en cours")
+
+
+class ImportCancelled(Exception):
+    """Import interrompu à la demande de l'utilisateur"""
+
+
+# Type d'import -> (table verrouillée, import par blocs ou None, import complet, import CSV ou None)
+IMPORTS = {
+    "materials": (
+        "materials",
+        ExcelImportService.import_materials_streaming,
+        ExcelImportService.import_materials_from_excel,
+        CsvImportService.import_materials
+    ),
+    "services": (
+        "services",
+        ExcelImportService.import_services_streaming,
+        ExcelImportService.import_services_from_excel,
+        CsvImportService.import_services
+    ),
+    "articles": (
+        "articles",
+        None,
+        ExcelImportService.import_articles_from_excel,
+        None
+    ),
+}
+
+
+class _MemoryBackend:
+    """État des jobs et verrous dans le processus (repli sans Redis)"""
+    
+    def __init__(self):
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._cancelled = set()
+        self._locks: Dict[str, str] = {}
+        self._mutex = threading.Lock()
+    
+    def save(self, job: Dict[str, Any]) -> None:
+        with self._mutex:
+            self._jobs[job["id"]] = dict(job)
+    
+    def load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._mutex:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+    
+    def request_cancel(self, job_id: str) -> None:
+        with self._mutex:
+            self._cancelled.add(job_id)
+    
+    def is_cancelled(self, job_id: str) -> bool:
+        return job_id in self._cancelled
+    
+    def acquire(self, table: str, job_id: str) -> bool:
+        with self._mutex:
+            if table in self._locks:
+                return False
+            self._locks[table] = job_id
+            return True
+    
+    def refresh(self, table: str, job_id: str) -> None:
+        pass
+    
+    def release(self, table: str, job_id: str) -> None:
+        with self._mutex:
+            if self._locks.get(table) == job_id:
+                del self._locks[table]
+            self._cancelled.discard(job_id)
+
+
+class _RedisBackend:
+    """État des jobs et verrous dans Redis, partagés entre les workers uvicorn"""
+    
+    def __init__(self, client):
+        self.client = client
+    
+    def save(self, job: Dict[str, Any]) -> None:
+        self.client.set(f"import_job:{job['id']}", json.dumps(job, default=str), ex=settings.IMPORT_JOB_TTL_SECONDS)
+    
+    def load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        raw = self.client.get(f"import_job:{job_id}")
+        return json.loads(raw) if raw else None
+    
+    def request_cancel(self, job_id: str) -> None:
+        self.client.set(f"import_job:{job_id}:cancel", 1, ex=settings.IMPORT_JOB_TTL_SECONDS)
+    
+    def is_cancelled(self, job_id: str) -> bool:
+        return bool(self.client.exists(f"import_job:{job_id}:cancel"))
+    
+    def acquire(self, table: str, job_id: str) -> bool:
+        # Le verrou expire si le processus meurt pendant l'import
+        return bool(self.client.set(
+            f"import_lock:{table}", job_id, nx=True, ex=settings.IMPORT_LOCK_TIMEOUT_SECONDS
+        ))
+    
+    def refresh(self, table: str, job_id: str) -> None:
+        if self.client.get(f"import_lock:{table}") == job_id.encode():
+            self.client.expire(f"import_lock:{table}", settings.IMPORT_LOCK_TIMEOUT_SECONDS)
+    
+    def release(self, table: str, job_id: str) -> None:
+        if self.client.get(f"import_lock:{table}") == job_id.encode():
+            self.client.delete(f"import_lock:{table}")
+        self.client.delete(f"import_job:{job_id}:cancel")
+
+
+class ImportJobService:
+    """Service de gestion des imports en arrière-plan"""
+    
+    _backend = None
+    _executor: Optional[ThreadPoolExecutor] = None
+    _init_lock = threading.Lock()
+    
+    @classmethod
+    def backend(cls):
+        """Stockage des jobs : Redis si disponible au premier appel, sinon mémoire"""
+        if cls._backend is None:
+            with cls._init_lock:
+                if cls._backend is None:
+                    client = get_redis()
+                    cls._backend = _RedisBackend(client) if client is not None else _MemoryBackend()
+        return cls._backend
+    
+    @classmethod
+    def executor(cls) -> ThreadPoolExecutor:
+        """Pool de workers partagé"""
+        if cls._executor is None:
+            with cls._init_lock:
+                if cls._executor is None:
+                    cls._executor = ThreadPoolExecutor(
+                        max_workers=settings.IMPORT_WORKERS,
+                        thread_name_prefix="import"
+                    )
+        return cls._executor
+    
+    @classmethod
+    def acquire_table(cls, table: str, owner: str) -> None:
+        """
+        Réserver une table pour un import
+        
+        Raises:
+            ImportLockedError si un import est déjà en cours sur la table
+        """
+        if not cls.backend().acquire(table, owner):
+            raise ImportLockedError(table)
+    
+    @classmethod
+    def release_table(cls, table: str, owner: str) -> None:
+        """Libérer une table réservée par acquire_table"""
+        cls.backend().release(table, owner)
+    
+    @classmethod
+    def submit(
+        cls,
+        kind: str,
+        file_path: str,
+        filename: str,
+        sheet_name: str,
+        mode: str = "standard",
+        chunk_size: Optional[int] = None,
+        user_id: Optional[str] = None,
+        file_hash: Optional[str] = None,
+        options: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Soumettre un import au pool de workers
+        
+        Le fichier temporaire appartient ensuite au job, qui le supprime
+        une fois terminé.
+        
+        Args:
+            kind: Type d'import ("materials", "services" ou "articles")
+            file_path: Fichier Excel sur disque
+            filename: Nom d'origine du fichier
+            sheet_name: Feuille à importer
+            mode: "standard" (une transaction) ou "streaming" (.xlsx, un commit par bloc)
+            chunk_size: Nombre de lignes par bloc (mode streaming)
+            user_id: Utilisateur à l'origine de l'import
+            file_hash: Empreinte SHA-256 du fichier, mémorisée si l'import réussit
+            options: Paramètres supplémentaires de l'import complet
+        
+        Returns:
+            Job créé (statut "queued")
+        
+        Raises:
+            ImportLockedError si un import est déjà en cours sur la table
+        """
+        table = IMPORTS[kind][0]
+        job_id = str(uuid.uuid4())
+        
+        cls.acquire_table(table, job_id)
+        
+        job = {
+            "id": job_id,
+            "kind": kind,
+            "table": table,
+            "status": "queued",
+            "progress": 0,
+            "processed_rows": 0,
+            "total_rows": None,
+            "statistics": None,
+            "error": None,
+            "file": filename,
+            "sheet": sheet_name,
+            "mode": mode,
+            "user_id": user_id,
+            "sha256": file_hash,
+            "options": options or {},
+            "created_at": datetime.utcnow().isoformat(),
+            "started_at": None,
+            "finished_at": None,
+        }
+        cls.backend().save(job)
+        
+        try:
+            cls.executor().submit(cls._run, dict(job), file_path, chunk_size)
+        except Exception:
+            cls.release_table(table, job_id)
+            raise
+        
+        return job
+    
+    @classmethod
+    def get(cls, job_id: str) -> Optional[Dict[str, Any]]:
+        """Récupérer l'état d'un job"""
+        return cls.backend().load(job_id)
+    
+    @classmethod
+    def cancel(cls, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Demander l'arrêt d'un job
+        
+        En mode streaming, l'import s'arrête à la fin du bloc en cours ;
+        les blocs déjà validés restent en base. En mode standard, seul un
+        job pas encore démarré est annulé.
+        
+        Returns:
+            Job, ou None s'il n'existe pas
+        """
+        job = cls.backend().load(job_id)
+        if job is None:
+            return None
+        
+        if job["status"] in ("queued", "running"):
+            cls.backend().request_cancel(job_id)
+            job["cancel_requested"] = True
+        
+        return job
+    
+    @classmethod
+    def _run(cls, job: Dict[str, Any], file_path: str, chunk_size: Optional[int]) -> None:
+        """Exécuter un job dans un worker (session dédiée)"""
+        backend = cls.backend()
+        table, import_streaming, import_full, import_csv = IMPORTS[job["kind"]]
+        db = SessionLocal()
+        
+        try:
+            if backend.is_cancelled(job["id"]):
+                raise ImportCancelled()
+            
+            job["status"] = "running"
+            job["started_at"] = datetime.utcnow().isoformat()
+            
+            streaming = job["mode"] == "streaming" and import_streaming is not None
+            if streaming:
+                job["total_rows"] = ExcelImportService.count_rows(file_path, job["sheet"])
+            backend.save(job)
+            
+            def on_progress(processed: int, stats: Dict[str, Any]) -> None:
+                job["processed_rows"] = processed
+                job["statistics"] = stats
+                if job["total_rows"]:
+                    job["progress"] = min(99, int(processed * 100 / job["total_rows"]))
+                backend.save(job)
+                backend.refresh(table, job["id"])
+                
+                if backend.is_cancelled(job["id"]):
+                    raise ImportCancelled()
+            
+            if import_csv is not None and file_path.endswith(".csv"):
+                stats = import_csv(file_path, db)
+            elif streaming:
+                stats = import_streaming(file_path, db, sheet_name=job["sheet"], chunk_size=chunk_size, on_progress=on_progress)
+            else:
+                stats = import_full(file_path, db, sheet_name=job["sheet"], **job["options"])
+            
+            if job["sha256"] and not stats.get("failed_chunks"):
+                ImportFileService.record(
+                    db, job["sha256"], job["kind"], job["sheet"], job["file"], stats, job["user_id"]
+                )
+                db.commit()
+            
+            job["status"] = "completed"
+            job["progress"] = 100
+            job["statistics"] = stats
+            job["processed_rows"] = max(job["processed_rows"], stats.get("total", 0) + stats.get("errors", 0))
+        
+        except ImportCancelled:
+            db.rollback()
+            job["status"] = "cancelled"
+        
+        except Exception as e:
+            db.rollback()
+            print(f"Erreur dans l'import {job['id']}: {e}")
+            job["status"] = "failed"
+            job["error"] = str(e)
+        
+        finally:
+            db.close()
+            job["finished_at"] = datetime.utcnow().isoformat()
+            backend.save(job)
+            backend.release(table, job["id"])
+            
+            if os.path.exists(file_path):
+                os.unlink(file_path)
@@ -3,19 +3,110 @@ Service de calcul de prix
 Logique métier pour calculer les prix des articles et compositions
 """
 
-from decimal import Decimal
-from typing import List, Dict
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, Iterable, Optional
+import uuid
 from sqlalchemy.orm import Session
 
 from app.models.material import Material
 from app.models.article import Article, ArticleMaterial
-from app.models.composition import Composition, CompositionItem, CompositionItemType
+from app.models.composition import Composition
 from app.config import settings
 
 
 class PriceCalculator:
     """Service de calcul automatique des prix"""
     
+    @staticmethod
+    def compute_article_totals(
+        material_cost: Decimal,
+        labor_cost: Decimal,
+        overhead: Decimal,
+        margin: Decimal
+    ) -> Dict[str, Decimal]:
+        """
+        Appliquer la chaîne frais généraux / marge à un coût matériaux
+        
+        Prix = (Coût matériaux + Coût MO) × (1 + overhead) × (1 + margin)
+        
+        Args:
+            material_cost: Coût matériaux non arrondi
+            labor_cost: Coût de main d'œuvre
+            overhead: Frais généraux (ex: 0.10)
+            margin: Marge (ex: 0.30)
+            
+        Returns:
+            Dict avec material_cost, total_cost, total_price
+        """
+        # Coût total (matériaux + main d'œuvre)
+        total_cost = material_cost + labor_cost
+        
+        # Prix de vente = coût × (1 + overhead) × (1 + margin)
+        price_with_overhead = total_cost * (1 + overhead)
+        total_price = price_with_overhead * (1 + margin)
+        
+        return {
+            "material_cost": round(material_cost, 2),
+            "total_cost": round(total_cost, 2),
+            "total_price": round(total_price, 2)
+        }
+    
+    @staticmethod
+    def calculate_articles_prices(
+        articles: Iterable[Article],
+        db: Session
+    ) -> Dict[uuid.UUID, Dict[str, Decimal]]:
+        """
+        Calculer les prix de plusieurs articles en une seule requête
+        
+        Toutes les lignes de nomenclature et les prix des matériaux référencés
+        sont chargés par une jointure filtrée sur `article_id IN (...)`,
+        au lieu d'une requête par ligne.
+        
+        Les lignes doivent être flushées en base avant l'appel.
+        
+        Args:
+            articles: Articles à calculer
+            db: Session de base de données
+            
+        Returns:
+            Dict {article_id: {material_cost, total_cost, total_price}}
+        """
+        articles = list(articles)
+        if not articles:
+            return {}
+        
+        # Coût matériaux par article
+        material_costs = {article.id: Decimal('0.00') for article in articles}
+        
+        lines = (
+            db.query(
+                ArticleMaterial.article_id,
+                ArticleMaterial.quantity,
+                ArticleMaterial.waste_percent,
+                Material.price_eur
+            )
+            .join(Material, Material.id == ArticleMaterial.material_id)
+            .filter(ArticleMaterial.article_id.in_(list(material_costs.keys())))
+            .all()
+        )
+        
+        for article_id, quantity, waste_percent, price_eur in lines:
+            # Quantité avec perte
+            quantity_with_waste = quantity * (1 + (waste_percent or 0))
+            # Coût = prix × quantité
+            material_costs[article_id] += price_eur * quantity_with_waste
+        
+        return {
+            article.id: PriceCalculator.compute_article_totals(
+                material_costs[article.id],
+                article.labor_cost,
+                article.overhead,
+                article.margin
+            )
+            for article in articles
+        }
+    
     @staticmethod
     def calculate_article_price(article: Article, db: Session) -> Dict[str, Decimal]:
         """
@@ -30,27 +121,30 @@ class PriceCalculator:
         Returns:
             Dict avec material_cost, total_cost, total_price
         """
-        # Calculer le coût des matériaux
-        material_cost = Decimal('0.00')
-        
-        for am in article.materials:
-            material = db.query(Material).filter(Material.id == am.material_id).first()
-            if material:
-                # Quantité avec perte
-                quantity_with_waste = am.quantity * (1 + am.waste_percent)
-                # Coût = prix × quantité
-                cost = material.price_eur * quantity_with_waste
-                material_cost += cost
-        
-        # Coût total (matériaux + main d'œuvre)
-        total_cost = material_cost + article.labor_cost
+        return PriceCalculator.calculate_articles_prices([article], db)[article.id]
+    
+    @staticmethod
+    def compute_composition_totals(
+        total_cost: Decimal,
+        overhead: Decimal,
+        margin: Decimal
+    ) -> Dict[str, Decimal]:
+        """
+        Appliquer la chaîne frais généraux / marge au coût d'une composition
         
+        Args:
+            total_cost: Coût des items non arrondi
+            overhead: Frais généraux (ex: 0.10)
+            margin: Marge (ex: 0.30)
+            
+        Returns:
+            Dict avec total_cost, total_price
+        """
         # Prix de vente = coût × (1 + overhead) × (1 + margin)
-        price_with_overhead = total_cost * (1 + article.overhead)
-        total_price = price_with_overhead * (1 + article.margin)
+        price_with_overhead = total_cost * (1 + overhead)
+        total_price = price_with_overhead * (1 + margin)
         
         return {
-            "material_cost": round(material_cost, 2),
             "total_cost": round(total_cost, 2),
             "total_price": round(total_price, 2)
         }
@@ -67,32 +161,41 @@ class PriceCalculator:
         Returns:
             Dict avec total_cost, total_price
         """
-        total_cost = Decimal('0.00')
+        return PriceCalculator.calculate_compositions_prices([composition], db)[composition.id]
+    
+    @staticmethod
+    def calculate_compositions_prices(
+        compositions: Iterable[Composition],
+        db: Session
+    ) -> Dict[uuid.UUID, Dict[str, Decimal]]:
+        """
+        Calculer les prix de plusieurs compositions en lot
+        
+        Les prix des articles sont recalculés depuis les matériaux (et non lus
+        tels que stockés) et les sous-compositions sont évaluées une seule fois,
+        en ordre topologique. Les compositions et leurs items doivent être
+        flushés en base avant l'appel.
         
-        for item in composition.items:
-            if item.item_type == CompositionItemType.MATERIAL:
-                # Récupérer le matériau
-                material = db.query(Material).filter(Material.id == item.item_id).first()
-                if material:
-                    cost = material.price_eur * item.quantity
-                    total_cost += cost
+        Args:
+            compositions: Compositions à calculer
+            db: Session de base de données
+            
+        Returns:
+            Dict {composition_id: {total_cost, total_price}}
             
-            elif item.item_type == CompositionItemType.ARTICLE:
-                # Récupérer l'article
-                article = db.query(Article).filter(Article.id == item.item_id).first()
-                if article:
-                    # Utiliser le prix total de l'article
-                    cost = article.total_price * item.quantity
-                    total_cost += cost
+        Raises:
+            PricingCycleError si une composition se contient elle-même
+        """
+        from app.services.pricing_graph import PricingGraph
         
-        # Prix de vente = coût × (1 + overhead) × (1 + margin)
-        price_with_overhead = total_cost * (1 + composition.overhead)
-        total_price = price_with_overhead * (1 + composition.margin)
+        composition_ids = [c.id for c in compositions]
+        if not composition_ids:
+            return {}
         
-        return {
-            "total_cost": round(total_cost, 2),
-            "total_price": round(total_price, 2)
-        }
+        graph = PricingGraph.for_compositions(db, composition_ids)
+        result = graph.evaluate(composition_ids=composition_ids)
+        
+        return {c: result.compositions[c] for c in composition_ids if c in result.compositions}
     
     @staticmethod
     def calculate_service_margin(price_net: Decimal, price_gross: Decimal) -> Decimal:
@@ -109,29 +212,37 @@ class PriceCalculator:
         return round(price_gross - price_net, 2)
     
     @staticmethod
-    def convert_eur_to_lei(amount_eur: Decimal) -> Decimal:
+    def convert_eur_to_lei(amount_eur: Decimal, rate: Optional[Decimal] = None) -> Decimal:
         """
         Convertir EUR vers LEI
         
+        Arrondi au centime supérieur à partir de 0.5 (comme ROUND() en SQL,
+        utilisé pour les mises à jour en masse des prix LEI).
+        
         Args:
             amount_eur: Montant en EUR
+            rate: Taux EUR → LEI (par défaut settings.EUR_LEI_RATE ; utiliser
+                ExchangeRateService.get_current_rate pour le taux en vigueur)
             
         Returns:
             Montant en LEI
         """
-        rate = Decimal(str(settings.EUR_LEI_RATE))
-        return round(amount_eur * rate, 2)
+        if rate is None:
+            rate = Decimal(str(settings.EUR_LEI_RATE))
+        return (Decimal(amount_eur) * rate).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
     
     @staticmethod
-    def convert_lei_to_eur(amount_lei: Decimal) -> Decimal:
+    def convert_lei_to_eur(amount_lei: Decimal, rate: Optional[Decimal] = None) -> Decimal:
         """
         Convertir LEI vers EUR
         
         Args:
             amount_lei: Montant en LEI
+            rate: Taux EUR → LEI (par défaut settings.EUR_LEI_RATE)
             
         Returns:
             Montant en EUR
         """
-        rate = Decimal(str(settings.EUR_LEI_RATE))
+        if rate is None:
+            rate = Decimal(str(settings.EUR_LEI_RATE))
         return round(amount_lei / rate, 2)
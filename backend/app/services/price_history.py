@@ -0,0 +1,157 @@
+"""
+Service d'historique des prix matériaux
+Enregistrer chaque changement de prix et retrouver le prix en vigueur à une date
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+from sqlalchemy import insert, select, true
+from sqlalchemy.orm import Session
+import uuid
+
+from app.models.material import Material
+from app.models.material_price import MaterialPrice
+
+
+# Lignes par requête INSERT multi-valeurs
+HISTORY_BATCH_SIZE = 1000
+
+
+class PriceHistoryService:
+    """Service pour l'historique des prix matériaux"""
+    
+    @staticmethod
+    def record(
+        db: Session,
+        rows: Iterable[Dict[str, Any]],
+        source: str,
+        valid_from: Optional[datetime] = None
+    ) -> int:
+        """
+        Enregistrer des prix en masse (INSERT multi-valeurs par lots)
+        
+        L'appelant ne transmet que les matériaux dont le prix vient d'être
+        créé ou modifié, et reste responsable du commit.
+        
+        Args:
+            db: Session de base de données
+            rows: Dicts avec id (du matériau), price_eur et price_lei
+            source: Origine du changement (api, excel, csv)
+            valid_from: Date d'effet (maintenant par défaut)
+        
+        Returns:
+            Nombre de lignes d'historique écrites
+        """
+        valid_from = valid_from or datetime.utcnow()
+        values = [
+            {
+                "id": uuid.uuid4(),
+                "material_id": row["id"],
+                "price_eur": row["price_eur"],
+                "price_lei": row.get("price_lei"),
+                "valid_from": valid_from,
+                "source": source
+            }
+            for row in rows
+        ]
+        
+        for start in range(0, len(values), HISTORY_BATCH_SIZE):
+            db.execute(insert(MaterialPrice).values(values[start:start + HISTORY_BATCH_SIZE]))
+        
+        return len(values)
+    
+    @staticmethod
+    def price_at(db: Session, material_id: str, at: datetime) -> Optional[MaterialPrice]:
+        """
+        Prix d'un matériau en vigueur à une date
+        
+        Une descente dans l'index (material_id, valid_from).
+        
+        Returns:
+            MaterialPrice ou None si le matériau n'avait pas encore de prix
+        """
+        return (
+            db.query(MaterialPrice)
+            .filter(MaterialPrice.material_id == material_id, MaterialPrice.valid_from <= at)
+            .order_by(MaterialPrice.valid_from.desc())
+            .first()
+        )
+    
+    @staticmethod
+    def prices_at(db: Session, material_ids: List[str], at: datetime) -> Dict[Any, Dict[str, Any]]:
+        """
+        Prix de plusieurs matériaux en vigueur à une date (une requête)
+        
+        Jointure LATERAL : pour chaque matériau, une descente dans l'index
+        (material_id, valid_from) lit la dernière ligne antérieure à `at`,
+        quelle que soit la longueur de l'historique.
+        
+        Args:
+            db: Session de base de données
+            material_ids: Matériaux recherchés
+            at: Date de référence
+        
+        Returns:
+            Dict {material_id: {price_eur, price_lei, valid_from}} ; les
+            matériaux sans prix à cette date sont absents
+        """
+        if not material_ids:
+            return {}
+        
+        ids = select(Material.id.label("material_id")).where(Material.id.in_(material_ids)).subquery()
+        latest = (
+            select(MaterialPrice.price_eur, MaterialPrice.price_lei, MaterialPrice.valid_from)
+            .where(MaterialPrice.material_id == ids.c.material_id, MaterialPrice.valid_from <= at)
+            .order_by(MaterialPrice.valid_from.desc())
+            .limit(1)
+            .lateral()
+        )
+        rows = db.execute(
+            select(ids.c.material_id, latest.c.price_eur, latest.c.price_lei, latest.c.valid_from)
+            .join(latest, true())
+        ).all()
+        
+        return {
+            row.material_id: {
+                "price_eur": row.price_eur,
+                "price_lei": row.price_lei,
+                "valid_from": row.valid_from
+            }
+            for row in rows
+        }
+    
+    @staticmethod
+    def series(
+        db: Session,
+        material_id: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[MaterialPrice]:
+        """
+        Série chronologique des prix d'un matériau
+        
+        Avec `start`, la série commence par le prix en vigueur à cette date
+        (s'il existe), pour que la première période soit connue.
+        
+        Args:
+            db: Session de base de données
+            material_id: ID du matériau
+            start: Début de la période (incluse)
+            end: Fin de la période (incluse)
+        
+        Returns:
+            Liste de MaterialPrice par valid_from croissant
+        """
+        query = db.query(MaterialPrice).filter(MaterialPrice.material_id == material_id)
+        if start is not None:
+            query = query.filter(MaterialPrice.valid_from > start)
+        if end is not None:
+            query = query.filter(MaterialPrice.valid_from <= end)
+        points = query.order_by(MaterialPrice.valid_from).all()
+        
+        if start is not None:
+            previous = PriceHistoryService.price_at(db, material_id, start)
+            if previous is not None:
+                points.insert(0, previous)
+        
+        return points
@@ -0,0 +1,160 @@
+"""
+Service de simulation de prix
+Répondre aux questions « et si » sans modifier la base de données
+"""
+
+import time
+import uuid
+from decimal import Decimal
+from typing import Dict, List
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.schemas.pricing import SimulationRequest, MarkupOverride, MaterialPriceOverride
+from app.services.pricing_snapshot import CatalogSnapshot, PricingSnapshot
+
+
+def _parse_uuid(value: str) -> uuid.UUID:
+    try:
+        return uuid.UUID(str(value))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Identifiant invalide: {value}"
+        )
+
+
+class PriceSimulationService:
+    """Service de simulation de prix sur l'instantané du catalogue"""
+    
+    @staticmethod
+    def _resolve_material_prices(
+        snapshot: CatalogSnapshot,
+        overrides: List[MaterialPriceOverride]
+    ) -> Dict[uuid.UUID, Decimal]:
+        """Convertir les hypothèses sur les matériaux en prix EUR par id"""
+        prices = {}
+        
+        for override in overrides:
+            if override.material_id:
+                material_id = _parse_uuid(override.material_id)
+            else:
+                material_id = snapshot.material_ids_by_code.get(override.code)
+            
+            if material_id not in snapshot.graph.material_prices:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Matériau {override.material_id or override.code} non trouvé"
+                )
+            
+            if override.price_eur is not None:
+                prices[material_id] = override.price_eur
+            else:
+                current = snapshot.graph.material_prices[material_id]
+                prices[material_id] = round(current * (1 + override.change_percent / 100), 2)
+        
+        return prices
+    
+    @staticmethod
+    def _resolve_markups(nodes: Dict, overrides: List[MarkupOverride], label: str) -> Dict[uuid.UUID, Dict[str, Decimal]]:
+        """Convertir les hypothèses de marge en {id: {margin?, overhead?}}"""
+        markups: Dict[uuid.UUID, Dict[str, Decimal]] = {}
+        
+        for override in overrides:
+            values = {}
+            if override.margin is not None:
+                values["margin"] = override.margin
+            if override.overhead is not None:
+                values["overhead"] = override.overhead
+            
+            if override.item_id:
+                item_id = _parse_uuid(override.item_id)
+                if item_id not in nodes:
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail=f"{label} {override.item_id} non trouvé(e)"
+                    )
+                targets = [item_id]
+            else:
+                targets = [node.id for node in nodes.values() if node.code.startswith(override.code_prefix)]
+            
+            for target in targets:
+                markups.setdefault(target, {}).update(values)
+        
+        return markups
+    
+    @staticmethod
+    def simulate(db: Session, request: SimulationRequest) -> dict:
+        """
+        Simuler l'effet d'hypothèses de prix et de marges
+        
+        Seuls les articles et compositions impactés sont recalculés, deux fois
+        (prix actuels puis simulés) pour que l'écart ne reflète que les hypothèses.
+        
+        Args:
+            db: Session de base de données (lecture seule, pour l'instantané)
+            request: Hypothèses à simuler
+        
+        Returns:
+            Dict conforme à SimulationResponse
+        
+        Raises:
+            HTTPException si un élément référencé n'existe pas
+            PricingCycleError si les compositions forment un cycle
+        """
+        started = time.perf_counter()
+        snapshot = PricingSnapshot.get(db)
+        graph = snapshot.graph
+        
+        material_prices = PriceSimulationService._resolve_material_prices(snapshot, request.material_prices)
+        article_markups = PriceSimulationService._resolve_markups(graph.articles, request.article_markups, "Article")
+        composition_markups = PriceSimulationService._resolve_markups(
+            graph.compositions, request.composition_markups, "Composition"
+        )
+        
+        article_ids, composition_ids = snapshot.dependents(
+            material_ids=material_prices,
+            article_ids=article_markups,
+            composition_ids=composition_markups
+        )
+        
+        current = graph.evaluate(article_ids=article_ids, composition_ids=composition_ids)
+        simulated = graph.evaluate(
+            article_ids=article_ids,
+            composition_ids=composition_ids,
+            material_prices=material_prices,
+            article_markups=article_markups,
+            composition_markups=composition_markups
+        )
+        
+        items = []
+        for item_type, nodes, before, after in (
+            ("article", graph.articles, current.articles, simulated.articles),
+            ("composition", graph.compositions, current.compositions, simulated.compositions),
+        ):
+            for item_id, prices in after.items():
+                current_price = before[item_id]["total_price"]
+                simulated_price = prices["total_price"]
+                delta = simulated_price - current_price
+                if not delta:
+                    continue
+                
+                items.append({
+                    "item_type": item_type,
+                    "id": str(item_id),
+                    "code": nodes[item_id].code,
+                    "current_price": current_price,
+                    "simulated_price": simulated_price,
+                    "delta": delta,
+                    "delta_percent": round(delta / current_price * 100, 2) if current_price else None
+                })
+        
+        items.sort(key=lambda item: abs(item["delta"]), reverse=True)
+        
+        return {
+            "affected_articles": len(article_ids),
+            "affected_compositions": len(composition_ids),
+            "changed_items": len(items),
+            "items": items[:request.limit],
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1)
+        }
@@ -0,0 +1,350 @@
+"""
+Graphe de calcul des prix
+Évaluation matériaux → articles → compositions (imbriquées) en ordre topologique
+"""
+
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy.orm import Session
+import uuid
+
+from app.models.material import Material
+from app.models.article import Article, ArticleMaterial
+from app.models.composition import Composition, CompositionItem, CompositionItemType
+from app.services.price_calculator import PriceCalculator
+
+
+class PricingCycleError(ValueError):
+    """Cycle détecté entre compositions"""
+    
+    def __init__(self, cycle: List[str]):
+        self.cycle = cycle
+        super().__init__(f"Cycle détecté dans les compositions: {' → '.join(cycle)}")
+
+
+@dataclass
+class ArticleNode:
+    """Article chargé en mémoire avec sa nomenclature"""
+    id: uuid.UUID
+    code: str
+    labor_cost: Decimal
+    overhead: Decimal
+    margin: Decimal
+    # (material_id, quantity, waste_percent)
+    lines: List[Tuple[uuid.UUID, Decimal, Decimal]] = field(default_factory=list)
+
+
+@dataclass
+class CompositionNode:
+    """Composition chargée en mémoire avec ses items"""
+    id: uuid.UUID
+    code: str
+    overhead: Decimal
+    margin: Decimal
+    # (item_type, item_id, quantity)
+    items: List[Tuple[CompositionItemType, uuid.UUID, Decimal]] = field(default_factory=list)
+
+
+@dataclass
+class PricingResult:
+    """Prix calculés lors d'une évaluation du graphe"""
+    articles: Dict[uuid.UUID, Dict[str, Decimal]] = field(default_factory=dict)
+    compositions: Dict[uuid.UUID, Dict[str, Decimal]] = field(default_factory=dict)
+
+
+class PricingGraph:
+    """
+    Graphe de dépendances des prix du catalogue
+    
+    Le chargement se fait par lots (une requête par table et par niveau
+    d'imbrication des compositions), puis l'évaluation est purement en
+    mémoire : chaque article et sous-composition n'est calculé qu'une fois.
+    """
+    
+    def __init__(self):
+        self.material_prices: Dict[uuid.UUID, Decimal] = {}
+        self.articles: Dict[uuid.UUID, ArticleNode] = {}
+        self.compositions: Dict[uuid.UUID, CompositionNode] = {}
+    
+    # ========== CHARGEMENT ==========
+    
+    @classmethod
+    def for_compositions(cls, db: Session, composition_ids: Iterable[uuid.UUID]) -> "PricingGraph":
+        """Construire le graphe nécessaire au calcul de compositions"""
+        graph = cls()
+        graph.load_compositions(db, composition_ids)
+        return graph
+    
+    @classmethod
+    def for_catalog(cls, db: Session) -> "PricingGraph":
+        """Construire le graphe complet du catalogue (5 requêtes)"""
+        graph = cls()
+        graph.load_articles(db)
+        graph.load_compositions(db)
+        graph.load_materials(db)
+        return graph
+    
+    def load_materials(self, db: Session, material_ids: Optional[Iterable[uuid.UUID]] = None) -> None:
+        """
+        Charger les prix des matériaux
+        
+        Args:
+            db: Session de base de données
+            material_ids: Matériaux à charger (None = tous)
+        """
+        query = db.query(Material.id, Material.price_eur)
+        
+        if material_ids is not None:
+            material_ids = [m for m in set(material_ids) if m not in self.material_prices]
+            if not material_ids:
+                return
+            query = query.filter(Material.id.in_(material_ids))
+        
+        self.material_prices.update(query.all())
+    
+    def load_articles(self, db: Session, article_ids: Optional[Iterable[uuid.UUID]] = None) -> None:
+        """
+        Charger des articles, leur nomenclature et les matériaux référencés
+        
+        Args:
+            db: Session de base de données
+            article_ids: Articles à charger (None = tous)
+        """
+        article_query = db.query(
+            Article.id, Article.code, Article.labor_cost, Article.overhead, Article.margin
+        )
+        line_query = db.query(
+            ArticleMaterial.article_id,
+            ArticleMaterial.material_id,
+            ArticleMaterial.quantity,
+            ArticleMaterial.waste_percent
+        )
+        
+        if article_ids is not None:
+            article_ids = [a for a in set(article_ids) if a not in self.articles]
+            if not article_ids:
+                return
+            article_query = article_query.filter(Article.id.in_(article_ids))
+            line_query = line_query.filter(ArticleMaterial.article_id.in_(article_ids))
+        
+        new_articles = {}
+        for article_id, code, labor_cost, overhead, margin in article_query.all():
+            new_articles[article_id] = ArticleNode(article_id, code, labor_cost, overhead, margin)
+        
+        material_ids = set()
+        for article_id, material_id, quantity, waste_percent in line_query.all():
+            node = new_articles.get(article_id)
+            if node is not None:
+                node.lines.append((material_id, quantity, waste_percent or Decimal('0')))
+                material_ids.add(material_id)
+        
+        self.articles.update(new_articles)
+        
+        if article_ids is not None:
+            self.load_materials(db, material_ids)
+    
+    def load_compositions(self, db: Session, composition_ids: Optional[Iterable[uuid.UUID]] = None) -> None:
+        """
+        Charger des compositions et, récursivement, tout ce qu'elles contiennent
+        
+        Les sous-compositions sont chargées niveau par niveau (deux requêtes
+        par niveau d'imbrication), puis articles et matériaux en lot.
+        
+        Args:
+            db: Session de base de données
+            composition_ids: Compositions racines (None = toutes)
+        """
+        article_ids: Set[uuid.UUID] = set()
+        material_ids: Set[uuid.UUID] = set()
+        load_all = composition_ids is None
+        frontier = None if load_all else {c for c in composition_ids if c not in self.compositions}
+        
+        while load_all or frontier:
+            composition_query = db.query(
+                Composition.id, Composition.code, Composition.overhead, Composition.margin
+            )
+            item_query = db.query(
+                CompositionItem.composition_id,
+                CompositionItem.item_type,
+                CompositionItem.item_id,
+                CompositionItem.quantity
+            )
+            if not load_all:
+                composition_query = composition_query.filter(Composition.id.in_(list(frontier)))
+                item_query = item_query.filter(CompositionItem.composition_id.in_(list(frontier)))
+            
+            for composition_id, code, overhead, margin in composition_query.all():
+                self.compositions[composition_id] = CompositionNode(composition_id, code, overhead, margin)
+            
+            next_frontier = set()
+            for composition_id, item_type, item_id, quantity in item_query.all():
+                node = self.compositions.get(composition_id)
+                if node is None:
+                    continue
+                node.items.append((item_type, item_id, quantity))
+                
+                if item_type == CompositionItemType.MATERIAL:
+                    material_ids.add(item_id)
+                elif item_type == CompositionItemType.ARTICLE:
+                    article_ids.add(item_id)
+                elif item_id not in self.compositions:
+                    next_frontier.add(item_id)
+            
+            if load_all:
+                break
+            frontier = next_frontier - set(self.compositions)
+        
+        if not load_all:
+            self.load_articles(db, article_ids)
+            self.load_materials(db, material_ids)
+    
+    # ========== ÉVALUATION ==========
+    
+    def _child_compositions(self, composition_id: uuid.UUID) -> List[uuid.UUID]:
+        return [
+            item_id
+            for item_type, item_id, _ in self.compositions[composition_id].items
+            if item_type == CompositionItemType.COMPOSITION and item_id in self.compositions
+        ]
+    
+    def topological_order(self, composition_ids: Iterable[uuid.UUID]) -> List[uuid.UUID]:
+        """
+        Ordonner les compositions pour que chaque sous-composition précède ses parents
+        
+        Args:
+            composition_ids: Compositions racines (leurs descendants sont inclus)
+        
+        Returns:
+            Liste d'ids, feuilles en premier
+        
+        Raises:
+            PricingCycleError si une composition se contient elle-même
+        """
+        order: List[uuid.UUID] = []
+        # 1 = en cours de visite, 2 = terminé
+        state: Dict[uuid.UUID, int] = {}
+        
+        for root in composition_ids:
+            if root not in self.compositions or state.get(root) == 2:
+                continue
+            
+            state[root] = 1
+            path = [root]
+            stack = [(root, iter(self._child_compositions(root)))]
+            
+            while stack:
+                node, children = stack[-1]
+                for child in children:
+                    child_state = state.get(child)
+                    if child_state == 1:
+                        cycle = path[path.index(child):] + [child]
+                        raise PricingCycleError([self.compositions[c].code for c in cycle])
+                    if child_state is None:
+                        state[child] = 1
+                        path.append(child)
+                        stack.append((child, iter(self._child_compositions(child))))
+                        break
+                else:
+                    stack.pop()
+                    path.pop()
+                    state[node] = 2
+                    order.append(node)
+        
+        return order
+    
+    def evaluate(
+        self,
+        article_ids: Iterable[uuid.UUID] = (),
+        composition_ids: Iterable[uuid.UUID] = (),
+        material_prices: Optional[Dict[uuid.UUID, Decimal]] = None,
+        article_totals: Optional[Dict[uuid.UUID, Decimal]] = None,
+        article_markups: Optional[Dict[uuid.UUID, Dict[str, Decimal]]] = None,
+        composition_markups: Optional[Dict[uuid.UUID, Dict[str, Decimal]]] = None
+    ) -> PricingResult:
+        """
+        Calculer les prix d'articles et de compositions
+        
+        Les sous-totaux sont mémorisés : un article ou une sous-composition
+        partagé(e) par plusieurs parents n'est calculé(e) qu'une fois.
+        
+        Args:
+            article_ids: Articles à calculer
+            composition_ids: Compositions à calculer (avec leurs descendants)
+            material_prices: Prix matériaux de substitution (simulation)
+            article_totals: Prix de vente d'articles déjà calculés (ex: recalcul
+                vectorisé), utilisés tels quels dans les compositions
+            article_markups: {article_id: {"overhead"?, "margin"?}} de substitution
+            composition_markups: {composition_id: {"overhead"?, "margin"?}} de substitution
+        
+        Returns:
+            PricingResult avec les prix par article et par composition
+        
+        Raises:
+            PricingCycleError si les compositions forment un cycle
+        """
+        material_prices = material_prices or {}
+        article_totals = article_totals or {}
+        article_markups = article_markups or {}
+        composition_markups = composition_markups or {}
+        result = PricingResult()
+        
+        def material_price(material_id: uuid.UUID) -> Optional[Decimal]:
+            if material_id in material_prices:
+                return material_prices[material_id]
+            return self.material_prices.get(material_id)
+        
+        def price_article(article_id: uuid.UUID) -> Optional[Dict[str, Decimal]]:
+            if article_id in result.articles:
+                return result.articles[article_id]
+            if article_id in article_totals:
+                return {"total_price": article_totals[article_id]}
+            node = self.articles.get(article_id)
+            if node is None:
+                return None
+            
+            material_cost = Decimal('0.00')
+            for material_id, quantity, waste_percent in node.lines:
+                price = material_price(material_id)
+                if price is not None:
+                    material_cost += price * (quantity * (1 + waste_percent))
+            
+            markup = article_markups.get(article_id, {})
+            prices = PriceCalculator.compute_article_totals(
+                material_cost,
+                node.labor_cost,
+                markup.get("overhead", node.overhead),
+                markup.get("margin", node.margin)
+            )
+            result.articles[article_id] = prices
+            return prices
+        
+        for article_id in article_ids:
+            price_article(article_id)
+        
+        for composition_id in self.topological_order(composition_ids):
+            node = self.compositions[composition_id]
+            total_cost = Decimal('0.00')
+            
+            for item_type, item_id, quantity in node.items:
+                if item_type == CompositionItemType.MATERIAL:
+                    unit_price = material_price(item_id)
+                elif item_type == CompositionItemType.ARTICLE:
+                    article_prices = price_article(item_id)
+                    unit_price = article_prices["total_price"] if article_prices else None
+                else:
+                    # Déjà calculée grâce à l'ordre topologique
+                    child_prices = result.compositions.get(item_id)
+                    unit_price = child_prices["total_price"] if child_prices else None
+                
+                if unit_price is not None:
+                    total_cost += unit_price * quantity
+            
+            markup = composition_markups.get(composition_id, {})
+            result.compositions[composition_id] = PriceCalculator.compute_composition_totals(
+                total_cost,
+                markup.get("overhead", node.overhead),
+                markup.get("margin", node.margin)
+            )
+        
+        return result
@@ -0,0 +1,147 @@
+"""
+Instantané du catalogue pour la simulation de prix
+Graphe de prix complet gardé en mémoire et invalidé à chaque écriture
+"""
+
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, Set, Tuple
+from sqlalchemy.orm import Session
+import uuid
+
+from app.config import settings
+from app.models.material import Material
+from app.models.composition import CompositionItemType
+from app.services.catalog_events import CatalogChanges, register_listener
+from app.services.pricing_graph import PricingGraph
+
+
+# Tables qui influencent les prix
+PRICING_TABLES = {"materials", "articles", "article_materials", "compositions", "composition_items"}
+
+
+class CatalogSnapshot:
+    """Graphe de prix du catalogue avec ses index inverses"""
+    
+    def __init__(self, graph: PricingGraph, material_codes: Dict[uuid.UUID, str]):
+        self.graph = graph
+        self.material_codes = material_codes
+        self.material_ids_by_code = {code: material_id for material_id, code in material_codes.items()}
+        self.loaded_at = time.monotonic()
+        
+        # Matériau -> articles
+        self.material_articles: Dict[uuid.UUID, Set[uuid.UUID]] = defaultdict(set)
+        for article in graph.articles.values():
+            for material_id, _, _ in article.lines:
+                self.material_articles[material_id].add(article.id)
+        
+        # (type, item) -> compositions parentes
+        self.item_compositions: Dict[Tuple[CompositionItemType, uuid.UUID], Set[uuid.UUID]] = defaultdict(set)
+        for composition in graph.compositions.values():
+            for item_type, item_id, _ in composition.items:
+                self.item_compositions[(item_type, item_id)].add(composition.id)
+    
+    @classmethod
+    def load(cls, db: Session) -> "CatalogSnapshot":
+        """Charger tout le catalogue (6 requêtes)"""
+        graph = PricingGraph.for_catalog(db)
+        material_codes = dict(db.query(Material.id, Material.code).all())
+        return cls(graph, material_codes)
+    
+    def dependents(
+        self,
+        material_ids: Iterable[uuid.UUID] = (),
+        article_ids: Iterable[uuid.UUID] = (),
+        composition_ids: Iterable[uuid.UUID] = ()
+    ) -> Tuple[Set[uuid.UUID], Set[uuid.UUID]]:
+        """
+        Articles et compositions impactés par des matériaux/articles/compositions
+        
+        Returns:
+            Tuple (ids d'articles, ids de compositions), éléments de départ inclus
+        """
+        material_ids = set(material_ids)
+        articles = set(article_ids)
+        for material_id in material_ids:
+            articles.update(self.material_articles.get(material_id, ()))
+        
+        compositions = set(composition_ids)
+        frontier = set(compositions)
+        for material_id in material_ids:
+            frontier.update(self.item_compositions.get((CompositionItemType.MATERIAL, material_id), ()))
+        for article_id in articles:
+            frontier.update(self.item_compositions.get((CompositionItemType.ARTICLE, article_id), ()))
+        
+        while frontier:
+            compositions.update(frontier)
+            parents = set()
+            for composition_id in frontier:
+                parents.update(self.item_compositions.get((CompositionItemType.COMPOSITION, composition_id), ()))
+            frontier = parents - compositions
+        
+        return articles, compositions
+
+
+class PricingSnapshot:
+    """
+    Instantané partagé entre les requêtes
+    
+    Reconstruit à la demande après une modification du catalogue (notifiée par
+    catalog_events) ou après PRICING_SNAPSHOT_TTL_SECONDS, ce qui couvre les
+    écritures faites par d'autres processus.
+    """
+    
+    _snapshot: Optional[CatalogSnapshot] = None
+    _generation = 0
+    _lock = threading.Lock()
+    
+    @classmethod
+    def get(cls, db: Session) -> CatalogSnapshot:
+        """
+        Récupérer l'instantané courant, en le reconstruisant si nécessaire
+        
+        Args:
+            db: Session de base de données (utilisée seulement pour recharger)
+        
+        Returns:
+            CatalogSnapshot à jour
+        """
+        snapshot = cls._snapshot
+        if snapshot is not None and not cls._expired(snapshot):
+            return snapshot
+        
+        with cls._lock:
+            snapshot = cls._snapshot
+            if snapshot is not None and not cls._expired(snapshot):
+                return snapshot
+            
+            generation = cls._generation
+            snapshot = CatalogSnapshot.load(db)
+            
+            # Ne pas publier un instantané invalidé pendant son chargement
+            if generation == cls._generation:
+                cls._snapshot = snapshot
+            
+            return snapshot
+    
+    @classmethod
+    def _expired(cls, snapshot: CatalogSnapshot) -> bool:
+        return time.monotonic() - snapshot.loaded_at > settings.PRICING_SNAPSHOT_TTL_SECONDS
+    
+    @classmethod
+    def invalidate(cls, changes: Optional[CatalogChanges] = None) -> None:
+        """
+        Invalider l'instantané
+        
+        Args:
+            changes: Modifications notifiées (ignorées si aucune ne touche les prix)
+        """
+        if changes is not None and not PRICING_TABLES.intersection(changes):
+            return
+        
+        cls._generation += 1
+        cls._snapshot = None
+
+
+register_listener(PricingSnapshot.invalidate)
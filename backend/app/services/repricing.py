@@ -0,0 +1,169 @@
+"""
+Service de repricing incrémental
+Recalculer uniquement les articles et compositions impactés par un changement de prix
+"""
+
+from typing import Dict, Iterable, Set, Tuple
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+from datetime import datetime
+import uuid
+
+from app.models.article import Article, ArticleMaterial
+from app.models.composition import Composition, CompositionItem, CompositionItemType
+from app.services.exchange_rates import ExchangeRateService
+from app.services.price_calculator import PriceCalculator
+from app.services.pricing_graph import PricingGraph
+
+
+class RepricingService:
+    """Service de propagation des changements de prix dans le catalogue"""
+    
+    @staticmethod
+    def find_dependents(
+        db: Session,
+        material_ids: Iterable[uuid.UUID] = (),
+        article_ids: Iterable[uuid.UUID] = (),
+        composition_ids: Iterable[uuid.UUID] = ()
+    ) -> Tuple[Set[uuid.UUID], Set[uuid.UUID]]:
+        """
+        Trouver les articles et compositions qui dépendent de matériaux/articles/compositions
+        
+        Utilise les index inverses `ix_article_materials_material` et
+        `ix_composition_items_item` : matériau → articles → compositions,
+        puis compositions parentes de façon transitive.
+        
+        Args:
+            db: Session de base de données
+            material_ids: Matériaux dont le prix a changé
+            article_ids: Articles modifiés directement
+            composition_ids: Compositions modifiées directement
+        
+        Returns:
+            Tuple (ids des articles impactés, ids des compositions impactées)
+        """
+        material_ids = set(material_ids)
+        affected_articles = set(article_ids)
+        
+        if material_ids:
+            affected_articles.update(
+                article_id for (article_id,) in
+                db.query(ArticleMaterial.article_id)
+                .filter(ArticleMaterial.material_id.in_(list(material_ids)))
+                .distinct()
+                .all()
+            )
+        
+        conditions = []
+        if material_ids:
+            conditions.append(and_(
+                CompositionItem.item_type == CompositionItemType.MATERIAL,
+                CompositionItem.item_id.in_(list(material_ids))
+            ))
+        if affected_articles:
+            conditions.append(and_(
+                CompositionItem.item_type == CompositionItemType.ARTICLE,
+                CompositionItem.item_id.in_(list(affected_articles))
+            ))
+        
+        affected_compositions = set()
+        frontier = set(composition_ids)
+        if conditions:
+            frontier |= {
+                composition_id for (composition_id,) in
+                db.query(CompositionItem.composition_id)
+                .filter(or_(*conditions))
+                .distinct()
+                .all()
+            }
+        
+        # Remonter vers les compositions parentes, niveau par niveau
+        while frontier:
+            affected_compositions.update(frontier)
+            frontier = {
+                composition_id for (composition_id,) in
+                db.query(CompositionItem.composition_id)
+                .filter(
+                    CompositionItem.item_type == CompositionItemType.COMPOSITION,
+                    CompositionItem.item_id.in_(list(frontier))
+                )
+                .distinct()
+                .all()
+            } - affected_compositions
+        
+        return affected_articles, affected_compositions
+    
+    @staticmethod
+    def reprice_dependents(
+        db: Session,
+        material_ids: Iterable[uuid.UUID] = (),
+        article_ids: Iterable[uuid.UUID] = (),
+        composition_ids: Iterable[uuid.UUID] = ()
+    ) -> Dict[str, int]:
+        """
+        Recalculer les articles et compositions impactés
+        
+        Les modifications sont faites dans la transaction en cours : l'appelant
+        est responsable du commit. Seules les lignes dont le prix change
+        effectivement sont écrites.
+        
+        Args:
+            db: Session de base de données
+            material_ids: Matériaux dont le prix a changé
+            article_ids: Articles modifiés directement
+            composition_ids: Compositions modifiées directement (items, marges)
+        
+        Returns:
+            Dict avec le nombre d'articles et de compositions mis à jour
+            
+        Raises:
+            PricingCycleError si les compositions impactées forment un cycle
+        """
+        db.flush()
+        
+        article_ids, composition_ids = RepricingService.find_dependents(
+            db, material_ids, article_ids, composition_ids
+        )
+        now = datetime.utcnow().isoformat()
+        rate = ExchangeRateService.get_current_rate(db)
+        
+        # Évaluer le sous-graphe impacté en une passe
+        graph = PricingGraph()
+        graph.load_articles(db, article_ids)
+        graph.load_compositions(db, composition_ids)
+        result = graph.evaluate(article_ids=article_ids, composition_ids=composition_ids)
+        
+        # Articles
+        articles = db.query(Article).filter(Article.id.in_(list(article_ids))).all() if article_ids else []
+        
+        updated_articles = 0
+        for article in articles:
+            prices = result.articles[article.id]
+            if (article.material_cost, article.total_price) != (prices['material_cost'], prices['total_price']):
+                article.material_cost = prices['material_cost']
+                article.total_price = prices['total_price']
+                article.total_price_lei = PriceCalculator.convert_eur_to_lei(prices['total_price'], rate)
+                article.updated_at = now
+                updated_articles += 1
+        
+        # Compositions
+        compositions = (
+            db.query(Composition).filter(Composition.id.in_(list(composition_ids))).all()
+            if composition_ids else []
+        )
+        
+        updated_compositions = 0
+        for composition in compositions:
+            total_price = result.compositions[composition.id]['total_price']
+            if composition.total_price != total_price:
+                composition.total_price = total_price
+                composition.total_price_lei = PriceCalculator.convert_eur_to_lei(total_price, rate)
+                composition.updated_at = now
+                updated_compositions += 1
+        
+        db.flush()
+        
+        return {
+            "articles": updated_articles,
+            "compositions": updated_compositions
+        }
@@ -0,0 +1,455 @@
+"""
+Index d'autocomplétion du catalogue
+Préfixes et trigrammes des codes et noms gardés en mémoire, tenus à jour à chaque écriture
+"""
+
+import bisect
+import heapq
+import re
+import threading
+import time
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+from sqlalchemy import null
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.material import Material
+from app.models.article import Article
+from app.models.composition import Composition
+from app.models.service import Service
+from app.services.catalog_events import CatalogChanges, register_listener
+
+
+# Type -> (modèle, colonne du nom, colonne du nom roumain ou None)
+SUGGEST_SOURCES = {
+    "materials": (Material, "name_fr", "name_ro"),
+    "articles": (Article, "name", None),
+    "compositions": (Composition, "name", None),
+    "services": (Service, "name", None),
+}
+
+# Au-delà, une modification reconstruit tout l'index plutôt que les seules lignes touchées
+INCREMENTAL_MAX_IDS = 1000
+
+# Lignes chargées par aller-retour lors de la construction
+BUILD_BATCH_SIZE = 5000
+
+TOKEN_PATTERN = re.compile(r"[0-9a-z]+")
+
+# Borne haute d'une plage de préfixe dans une liste triée
+PREFIX_END = "\U0010ffff"
+
+# Mots proches retenus par terme mal orthographié, et similarité minimale
+# (une lettre inversée dans un mot de 4 lettres donne 0.25)
+MAX_CORRECTIONS = 5
+CORRECTION_THRESHOLD = 0.25
+
+# Clé d'une entrée : (type, id)
+Key = Tuple[str, Any]
+
+
+def normalize(value: Optional[str]) -> str:
+    """Texte sans accents, en minuscules ("Panoù" -> "panou")"""
+    if not value:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", value)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).lower()
+
+
+def trigrams(text: str) -> Set[str]:
+    """Trigrammes des mots, complétés d'espaces comme pg_trgm"""
+    grams = set()
+    for token in TOKEN_PATTERN.findall(text):
+        padded = f"  {token} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class Entry(NamedTuple):
+    """Élément du catalogue indexé"""
+    type: str
+    id: Any
+    code: str
+    name: str
+    name_ro: Optional[str]
+    unit: Optional[str]
+    norm_code: str
+    norm_name: str
+    tokens: Tuple[str, ...]
+
+
+def _entry(kind: str, row) -> Entry:
+    """Construire une entrée à partir d'une ligne (id, code, nom, nom RO, unité)"""
+    _, code, name, name_ro, unit = row[:5]
+    norm_code = normalize(code)
+    norm_name = normalize(name)
+    text = " ".join((norm_code, norm_name, normalize(name_ro)))
+    return Entry(
+        kind, row[0], code, name, name_ro, unit, norm_code, norm_name,
+        tuple(sorted(set(TOKEN_PATTERN.findall(text))))
+    )
+
+
+class TypeaheadIndex:
+    """
+    Index en mémoire des éléments actifs
+    
+    Listes triées (valeur, clé) où un préfixe est une plage trouvée par
+    bisection, en O(log n) quelle que soit la taille du catalogue :
+    
+    - codes : code normalisé
+    - names : nom normalisé
+    - words : chaque mot du code et des noms
+    
+    Les fautes de frappe sont corrigées sur le vocabulaire (mots distincts,
+    indexés par trigrammes), bien plus petit que le catalogue.
+    """
+    
+    def __init__(self, entries: Iterable[Entry] = ()):
+        self.entries: Dict[Key, Entry] = {}
+        self.codes: List[Tuple[str, Key]] = []
+        self.names: List[Tuple[str, Key]] = []
+        self.words: List[Tuple[str, Key]] = []
+        self.vocabulary: Counter = Counter()
+        self.word_grams: Dict[str, Set[str]] = defaultdict(set)
+        
+        for entry in entries:
+            key = (entry.type, entry.id)
+            self.entries[key] = entry
+            self.codes.append((entry.norm_code, key))
+            self.names.append((entry.norm_name, key))
+            self.words.extend((word, key) for word in entry.tokens)
+            self._count_words(entry.tokens, 1)
+        
+        self.codes.sort()
+        self.names.sort()
+        self.words.sort()
+        self.loaded_at = time.monotonic()
+    
+    @classmethod
+    def load(cls, db: Session) -> "TypeaheadIndex":
+        """Charger les éléments actifs de tous les types (une requête par type)"""
+        def rows():
+            for kind, (model, name, name_ro) in SUGGEST_SOURCES.items():
+                query = db.query(*_columns(model, name, name_ro)).filter(model.is_active == True)
+                for row in query.yield_per(BUILD_BATCH_SIZE):
+                    yield _entry(kind, row)
+        
+        return cls(rows())
+    
+    def _count_words(self, words: Iterable[str], delta: int) -> None:
+        """Tenir à jour le vocabulaire et ses trigrammes"""
+        for word in words:
+            self.vocabulary[word] += delta
+            if self.vocabulary[word] == delta > 0:
+                for gram in trigrams(word):
+                    self.word_grams[gram].add(word)
+            elif self.vocabulary[word] <= 0:
+                del self.vocabulary[word]
+                for gram in trigrams(word):
+                    self.word_grams[gram].discard(word)
+    
+    @staticmethod
+    def _discard(values: List[Tuple[str, Key]], item: Tuple[str, Key]) -> None:
+        position = bisect.bisect_left(values, item)
+        if position < len(values) and values[position] == item:
+            del values[position]
+    
+    def remove(self, key: Key) -> None:
+        """Retirer une entrée"""
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        self._discard(self.codes, (entry.norm_code, key))
+        self._discard(self.names, (entry.norm_name, key))
+        for word in entry.tokens:
+            self._discard(self.words, (word, key))
+        self._count_words(entry.tokens, -1)
+    
+    def add(self, entry: Entry) -> None:
+        """Ajouter ou remplacer une entrée"""
+        key = (entry.type, entry.id)
+        self.remove(key)
+        self.entries[key] = entry
+        bisect.insort(self.codes, (entry.norm_code, key))
+        bisect.insort(self.names, (entry.norm_name, key))
+        for word in entry.tokens:
+            bisect.insort(self.words, (word, key))
+        self._count_words(entry.tokens, 1)
+    
+    @staticmethod
+    def _range(values: List[Tuple[str, Key]], prefix: str) -> Tuple[int, int]:
+        """Plage [début, fin) des valeurs commençant par `prefix`"""
+        return (
+            bisect.bisect_left(values, (prefix,)),
+            bisect.bisect_left(values, (prefix + PREFIX_END,))
+        )
+    
+    def _corrections(self, term: str, threshold: float) -> List[Tuple[str, float]]:
+        """Mots du vocabulaire proches de `term` (similarité de Jaccard des trigrammes)"""
+        term_grams = trigrams(term)
+        shared = Counter()
+        for gram in term_grams:
+            shared.update(self.word_grams.get(gram, ()))
+        
+        corrections = []
+        for word, count in shared.items():
+            similarity = count / (len(term_grams) + len(trigrams(word)) - count)
+            if similarity >= threshold:
+                corrections.append((word, similarity))
+        return heapq.nlargest(MAX_CORRECTIONS, corrections, key=lambda item: item[1])
+    
+    def _match_words(self, alternatives: List[List[str]], collect) -> None:
+        """
+        Entrées dont chaque terme commence un mot (un des préfixes proposés)
+        
+        Seule la plage du terme le plus sélectif est parcourue ; les autres
+        termes sont vérifiés sur les mots de l'entrée.
+        """
+        ranges = [[self._range(self.words, prefix) for prefix in prefixes] for prefixes in alternatives]
+        sizes = [sum(end - start for start, end in term_ranges) for term_ranges in ranges]
+        driver = min(range(len(alternatives)), key=sizes.__getitem__)
+        others = [prefixes for i, prefixes in enumerate(alternatives) if i != driver]
+        
+        for start, end in ranges[driver]:
+            for position in range(start, end):
+                key = self.words[position][1]
+                tokens = self.entries[key].tokens
+                if all(any(token.startswith(prefix) for prefix in prefixes for token in tokens) for prefixes in others):
+                    if collect(key):
+                        return
+    
+    def search(self, query: str, types: Optional[Sequence[str]] = None, limit: int = 10) -> List[Tuple[Entry, float]]:
+        """
+        Meilleures correspondances d'une saisie, par paliers
+        
+        Chaque palier s'arrête dès que `limit` suggestions sont trouvées :
+        
+        - 3 code exact, 2 code commençant par la saisie
+        - 1.5 nom commençant par la saisie
+        - 1 chaque mot saisi commence un mot du code ou des noms
+        - < 1 mots saisis inconnus remplacés par les mots proches du
+          vocabulaire (fautes de frappe), score = similarité
+        
+        Returns:
+            Liste de (entrée, score), du plus pertinent au moins pertinent
+        """
+        text = normalize(query).strip()
+        terms = TOKEN_PATTERN.findall(text)
+        if not text:
+            return []
+        
+        allowed = set(types) if types else None
+        found: Dict[Key, float] = {}
+        score = 0.0
+        
+        def collect(key: Key) -> bool:
+            """Retenir une clé ; True quand la page est pleine"""
+            if key not in found and (allowed is None or key[0] in allowed):
+                found[key] = score
+            return len(found) >= limit
+        
+        def scan(values: List[Tuple[str, Key]], value_score) -> bool:
+            nonlocal score
+            start, end = self._range(values, text)
+            for position in range(start, end):
+                value, key = values[position]
+                score = value_score(value)
+                if collect(key):
+                    return True
+            return False
+        
+        if scan(self.codes, lambda code: 3.0 if code == text else 2.0):
+            return self._results(found)
+        if scan(self.names, lambda name: 1.5):
+            return self._results(found)
+        if not terms:
+            return self._results(found)
+        
+        score = 1.0
+        self._match_words([[term] for term in terms], collect)
+        if len(found) >= limit:
+            return self._results(found)
+        
+        # Termes sans aucun mot correspondant : corrections du vocabulaire
+        alternatives, similarities = [], []
+        for term in terms:
+            start, end = self._range(self.words, term)
+            if end > start:
+                alternatives.append([term])
+                continue
+            corrections = self._corrections(term, CORRECTION_THRESHOLD) if len(term) >= 3 else []
+            if not corrections:
+                return self._results(found)
+            alternatives.append([word for word, _ in corrections])
+            similarities.append(corrections[0][1])
+        
+        if similarities:
+            score = round(min(similarities) * 0.99, 4)
+            self._match_words(alternatives, collect)
+        
+        return self._results(found)
+    
+    def _results(self, found: Dict[Key, float]) -> List[Tuple[Entry, float]]:
+        """(entrée, score) par score décroissant, dans l'ordre de découverte sinon"""
+        ordered = sorted(found.items(), key=lambda item: -item[1])
+        return [(self.entries[key], score) for key, score in ordered]
+
+
+def _columns(model, name: str, name_ro: Optional[str]) -> list:
+    """Colonnes lues pour une entrée : id, code, nom, nom RO, unité, actif"""
+    return [
+        model.id,
+        model.code,
+        getattr(model, name),
+        getattr(model, name_ro) if name_ro else null().label("name_ro"),
+        model.unit,
+        model.is_active,
+    ]
+
+
+class TypeaheadService:
+    """
+    Index partagé entre les requêtes
+    
+    Construit au démarrage. Les écritures notifiées par catalog_events sont
+    appliquées ligne à ligne à la prochaine recherche ; les écritures des
+    autres processus sont couvertes par une reconstruction en arrière-plan
+    toutes les TYPEAHEAD_REFRESH_SECONDS, l'ancien index restant servi
+    pendant ce temps.
+    """
+    
+    _index: Optional[TypeaheadIndex] = None
+    _pending: CatalogChanges = {}
+    _building = False
+    _refreshing = False
+    _lock = threading.Lock()
+    
+    @classmethod
+    def build(cls, db: Optional[Session] = None) -> TypeaheadIndex:
+        """
+        Construire l'index complet et le publier
+        
+        Les modifications notifiées pendant le chargement restent en attente
+        (_apply_pending ne s'exécute pas tant que _building est levé) et
+        sont appliquées au nouvel index à la recherche suivante.
+        """
+        own_session = db is None
+        db = db or SessionLocal()
+        try:
+            with cls._lock:
+                cls._pending = {}
+                cls._building = True
+            index = TypeaheadIndex.load(db)
+            with cls._lock:
+                cls._index = index
+        finally:
+            cls._building = False
+            if own_session:
+                db.close()
+        
+        return index
+    
+    @classmethod
+    def suggest(
+        cls,
+        db: Session,
+        query: str,
+        types: Optional[Sequence[str]] = None,
+        limit: int = 10
+    ) -> List[Tuple[Entry, float]]:
+        """
+        Suggestions pour une saisie
+        
+        Args:
+            db: Session de base de données (utilisée seulement pour la mise à jour)
+            query: Saisie de l'utilisateur
+            types: Types proposés (materials, articles, compositions, services)
+            limit: Nombre maximum de suggestions
+        
+        Returns:
+            Liste de (entrée, score), vide tant que l'index n'est pas construit
+        """
+        index = cls._index
+        if index is None:
+            # Démarrage sans index (construction initiale en échec) : pas de reconstruction dans la requête
+            cls._refresh_in_background()
+            return []
+        
+        if cls._pending and not cls._building:
+            cls._apply_pending(db)
+        elif time.monotonic() - index.loaded_at > settings.TYPEAHEAD_REFRESH_SECONDS:
+            cls._refresh_in_background()
+        
+        with cls._lock:
+            return cls._index.search(query, types, limit)
+    
+    @classmethod
+    def _apply_pending(cls, db: Session) -> None:
+        """
+        Recharger les seules lignes modifiées depuis la dernière recherche
+        
+        Après une modification de masse (import, recalcul), l'index courant
+        reste servi et une reconstruction est lancée en arrière-plan ; les
+        modifications restent en attente jusqu'à ce qu'elle démarre.
+        """
+        with cls._lock:
+            mass_change = any(ids is None or len(ids) > INCREMENTAL_MAX_IDS for ids in cls._pending.values())
+            if not mass_change:
+                pending, cls._pending = cls._pending, {}
+        
+        if mass_change:
+            cls._refresh_in_background()
+            return
+        
+        for table, ids in pending.items():
+            model, name, name_ro = SUGGEST_SOURCES[table]
+            rows = db.query(*_columns(model, name, name_ro)).filter(model.id.in_(ids)).all()
+            found = {row[0] for row in rows}
+            
+            with cls._lock:
+                for row in rows:
+                    if row.is_active:
+                        cls._index.add(_entry(table, row))
+                    else:
+                        cls._index.remove((table, row[0]))
+                for missing in set(ids) - found:
+                    cls._index.remove((table, missing))
+    
+    @classmethod
+    def _refresh_in_background(cls) -> None:
+        """Reconstruire l'index dans un thread, sans bloquer la recherche"""
+        with cls._lock:
+            if cls._refreshing:
+                return
+            cls._refreshing = True
+        
+        def run():
+            try:
+                cls.build()
+            except Exception as e:
+                print(f"Erreur lors de la reconstruction de l'index d'autocomplétion: {e}")
+            finally:
+                cls._refreshing = False
+        
+        threading.Thread(target=run, name="typeahead-refresh", daemon=True).start()
+    
+    @classmethod
+    def on_change(cls, changes: CatalogChanges) -> None:
+        """Noter les lignes modifiées (appliquées à la prochaine recherche)"""
+        relevant = {table: ids for table, ids in changes.items() if table in SUGGEST_SOURCES}
+        if not relevant:
+            return
+        
+        with cls._lock:
+            for table, ids in relevant.items():
+                if ids is None or cls._pending.get(table, set()) is None:
+                    cls._pending[table] = None
+                else:
+                    cls._pending.setdefault(table, set()).update(ids)
+
+
+register_listener(TypeaheadService.on_change)
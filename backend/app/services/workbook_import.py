@@ -0,0 +1,233 @@
+"""
+Service d'import de classeur complet
+Importer toutes les feuilles de la matrice de prix en une opération
+"""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.services.excel_import import (
+    ExcelImportService,
+    ARTICLE_COLUMNS,
+    BOM_COLUMNS,
+    MATERIAL_COLUMNS,
+    SERVICE_COLUMNS,
+    _provided,
+    _read_sheet
+)
+from app.services.exchange_rates import ExchangeRateService
+from app.services.repricing import RepricingService
+
+
+# Ordre d'application : chaque type ne dépend que des précédents
+APPLY_ORDER = ("materials", "articles", "bom", "compositions", "services")
+
+# Colonnes qui identifient le type d'une feuille
+SHEET_SIGNATURES = {
+    "materials": (MATERIAL_COLUMNS["price_eur"],),
+    "services": (SERVICE_COLUMNS["price_net"], SERVICE_COLUMNS["price_gross"]),
+    "articles": (ARTICLE_COLUMNS["code"], ARTICLE_COLUMNS["labor_cost"]),
+    "bom": (BOM_COLUMNS["article_code"], BOM_COLUMNS["material_code"]),
+}
+
+# Type de feuille -> (normalisation, colonnes acceptées)
+NORMALIZERS = {
+    "materials": (ExcelImportService.normalize_materials, MATERIAL_COLUMNS),
+    "services": (ExcelImportService.normalize_services, SERVICE_COLUMNS),
+    "articles": (ExcelImportService.normalize_articles, ARTICLE_COLUMNS),
+    "bom": (ExcelImportService.normalize_bom, BOM_COLUMNS),
+}
+
+
+def detect_sheet_kind(columns: List[str]) -> Optional[str]:
+    """Type d'une feuille d'après ses en-têtes (None si non reconnue)"""
+    for kind, signature in SHEET_SIGNATURES.items():
+        if all(any(name in columns for name in names) for names in signature):
+            return kind
+    return None
+
+
+def _parse_sheet(kind: str, file_path: str, sheet_name: str, rate: Decimal) -> Dict[str, Any]:
+    """
+    Lire et normaliser une feuille (exécuté dans un processus du pool)
+    
+    Returns:
+        Dict avec records, errors, rows, provided et parse_ms
+    """
+    started = time.perf_counter()
+    normalize, columns = NORMALIZERS[kind]
+    
+    df = _read_sheet(file_path, sheet_name)
+    records, errors = normalize(df, rate)
+    
+    return {
+        "records": records,
+        "errors": errors,
+        "rows": len(df),
+        "provided": _provided(df, columns),
+        "parse_ms": round((time.perf_counter() - started) * 1000, 1)
+    }
+
+
+class WorkbookImportService:
+    """Service pour importer un classeur multi-feuilles"""
+    
+    @staticmethod
+    def plan(file_path: str, sheets: Optional[Dict[str, str]] = None) -> Tuple[Dict[str, str], List[str]]:
+        """
+        Associer les feuilles du classeur à un type d'import
+        
+        Args:
+            file_path: Chemin du fichier Excel
+            sheets: Association explicite {nom de feuille: type}, sinon
+                détection d'après les en-têtes
+        
+        Returns:
+            Tuple ({feuille: type}, feuilles ignorées)
+        
+        Raises:
+            ValueError si une feuille ou un type demandé n'existe pas
+        """
+        structure = ExcelImportService.detect_excel_structure(file_path)
+        
+        if sheets:
+            for sheet_name, kind in sheets.items():
+                if sheet_name not in structure:
+                    raise ValueError(f"Feuille '{sheet_name}' introuvable")
+                if kind not in NORMALIZERS:
+                    raise ValueError(f"Type d'import '{kind}' non pris en charge pour '{sheet_name}'")
+            planned = dict(sheets)
+        else:
+            planned = {}
+            for sheet_name, columns in structure.items():
+                kind = detect_sheet_kind(columns)
+                if kind:
+                    planned[sheet_name] = kind
+        
+        skipped = [sheet_name for sheet_name in structure if sheet_name not in planned]
+        return planned, skipped
+    
+    @staticmethod
+    def parse_sheets(file_path: str, planned: Dict[str, str], rate: Decimal) -> Dict[str, Dict[str, Any]]:
+        """
+        Lire et normaliser les feuilles en parallèle (pool de processus)
+        
+        La lecture Excel est limitée par le CPU : chaque feuille est analysée
+        dans son propre processus.
+        
+        Returns:
+            Dict {feuille: résultat de _parse_sheet}
+        """
+        if not planned:
+            return {}
+        
+        workers = min(len(planned), settings.IMPORT_PARSE_PROCESSES or os.cpu_count() or 1)
+        if workers == 1:
+            return {
+                sheet_name: _parse_sheet(kind, file_path, sheet_name, rate)
+                for sheet_name, kind in planned.items()
+            }
+        
+        # "spawn" : ne pas dupliquer les threads et connexions du serveur
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = {
+                sheet_name: pool.submit(_parse_sheet, kind, file_path, sheet_name, rate)
+                for sheet_name, kind in planned.items()
+            }
+            return {sheet_name: future.result() for sheet_name, future in futures.items()}
+    
+    @staticmethod
+    def import_workbook(
+        file_path: str,
+        db: Session,
+        sheets: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Importer toutes les feuilles reconnues d'un classeur
+        
+        Les feuilles sont lues en parallèle, puis appliquées dans l'ordre des
+        dépendances (matériaux, articles, nomenclatures, compositions,
+        services) dans une seule transaction. Les articles et compositions
+        impactés sont recalculés une seule fois, à la fin.
+        
+        Args:
+            file_path: Chemin du fichier Excel
+            db: Session de base de données
+            sheets: Association explicite {nom de feuille: type}
+        
+        Returns:
+            Dict avec statistiques et durées (ms) par feuille
+        """
+        started = time.perf_counter()
+        
+        try:
+            planned, skipped = WorkbookImportService.plan(file_path, sheets)
+            rate = ExchangeRateService.get_current_rate(db)
+            
+            step = time.perf_counter()
+            parsed = WorkbookImportService.parse_sheets(file_path, planned, rate)
+            parse_ms = round((time.perf_counter() - step) * 1000, 1)
+            
+            appliers = {
+                "materials": ExcelImportService.upsert_materials,
+                "articles": ExcelImportService.upsert_articles,
+                "bom": lambda records, db, provided: ExcelImportService.replace_bom(records, db),
+                "services": ExcelImportService.upsert_services,
+            }
+            
+            results = {}
+            repriced_material_ids = []
+            repriced_article_ids = []
+            ordered = sorted(planned.items(), key=lambda item: APPLY_ORDER.index(item[1]))
+            
+            for sheet_name, kind in ordered:
+                sheet = parsed[sheet_name]
+                
+                step = time.perf_counter()
+                result = appliers[kind](sheet["records"], db, sheet["provided"])
+                repriced_material_ids.extend(result.pop("repriced_material_ids", []))
+                repriced_article_ids.extend(result.pop("repriced_article_ids", []))
+                
+                results[sheet_name] = {
+                    "type": kind,
+                    "rows": sheet["rows"],
+                    "created": result["created"],
+                    "updated": result["updated"],
+                    "unchanged": result["unchanged"],
+                    "errors": sheet["errors"] + result.get("errors", 0),
+                    "parse_ms": sheet["parse_ms"],
+                    "apply_ms": round((time.perf_counter() - step) * 1000, 1)
+                }
+            
+            step = time.perf_counter()
+            repriced = RepricingService.reprice_dependents(
+                db,
+                material_ids=repriced_material_ids,
+                article_ids=repriced_article_ids
+            )
+            reprice_ms = round((time.perf_counter() - step) * 1000, 1)
+            
+            db.commit()
+            
+            return {
+                "sheets": results,
+                "skipped_sheets": skipped,
+                "repriced_articles": repriced["articles"],
+                "repriced_compositions": repriced["compositions"],
+                "timings": {
+                    "parse_ms": parse_ms,
+                    "reprice_ms": reprice_ms,
+                    "total_ms": round((time.perf_counter() - started) * 1000, 1)
+                }
+            }
+        
+        except Exception as e:
+            db.rollback()
+            raise Exception(f"Erreur lors de l'import du classeur: {str(e)}")
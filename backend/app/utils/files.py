@@ -0,0 +1,101 @@
+"""
+Utilitaires fichiers
+Copie des fichiers envoyés et empreinte de contenu des fichiers importés
+"""
+
+import hashlib
+import os
+import tempfile
+from typing import BinaryIO, Tuple
+
+
+# Taille des blocs lus pour la copie et le calcul d'empreinte
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Premiers octets de chaque format Excel accepté
+EXCEL_SIGNATURES = {
+    ".xlsx": b"PK\x03\x04",                          # archive zip (OOXML)
+    ".xls": b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1",  # document OLE2 (BIFF)
+}
+
+# Formats texte acceptés (pas de signature, mais pas d'octet nul)
+TEXT_SUFFIXES = {".csv"}
+
+
+class UploadTooLargeError(Exception):
+    """Fichier envoyé plus gros que la taille maximale"""
+    
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        super().__init__(f"Fichier trop volumineux (maximum {max_bytes // (1024 * 1024)} Mo)")
+
+
+class InvalidFileTypeError(Exception):
+    """Contenu du fichier différent du format annoncé par son extension"""
+
+
+def sha256_file(file_path: str) -> str:
+    """
+    Calculer l'empreinte SHA-256 d'un fichier, lu par blocs
+    
+    Args:
+        file_path: Chemin du fichier
+    
+    Returns:
+        Empreinte hexadécimale
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def save_upload_stream(source: BinaryIO, suffix: str, max_bytes: int) -> Tuple[str, str]:
+    """
+    Copier un flux sur disque par blocs en calculant son empreinte
+    
+    Le contenu n'est jamais chargé en entier en mémoire. La copie s'arrête
+    dès que max_bytes est dépassé, et le fichier temporaire est supprimé
+    en cas d'erreur.
+    
+    Args:
+        source: Flux binaire à copier
+        suffix: Extension du fichier (.xlsx, .xls ou .csv)
+        max_bytes: Taille maximale acceptée
+    
+    Returns:
+        Tuple (chemin du fichier temporaire, empreinte SHA-256)
+    
+    Raises:
+        InvalidFileTypeError si les premiers octets ne correspondent pas à l'extension
+        UploadTooLargeError si le fichier dépasse max_bytes
+    """
+    head = source.read(HASH_CHUNK_SIZE)
+    if suffix in TEXT_SUFFIXES:
+        matches = b"\x00" not in head
+    else:
+        signature = EXCEL_SIGNATURES.get(suffix)
+        matches = signature is not None and head.startswith(signature)
+    if not matches:
+        raise InvalidFileTypeError(f"Le contenu du fichier ne correspond pas au format {suffix}")
+    
+    digest = hashlib.sha256()
+    size = 0
+    tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
+    
+    try:
+        with tmp_file:
+            block = head
+            while block:
+                size += len(block)
+                if size > max_bytes:
+                    raise UploadTooLargeError(max_bytes)
+                digest.update(block)
+                tmp_file.write(block)
+                block = source.read(HASH_CHUNK_SIZE)
+    except BaseException:
+        os.unlink(tmp_file.name)
+        raise
+    
+    return tmp_file.name, digest.hexdigest()
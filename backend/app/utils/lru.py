@@ -0,0 +1,56 @@
+"""
+Cache LRU en mémoire
+Dictionnaire borné, thread-safe, avec expiration optionnelle des entrées
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class LRUCache:
+    """Cache LRU borné à maxsize entrées (expiration après ttl secondes si fourni)"""
+    
+    def __init__(self, maxsize: int = 128, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Lire une entrée (et la marquer comme récente)"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            
+            value, expires_at = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            
+            self._data.move_to_end(key)
+            return value
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        """Écrire une entrée, en évinçant la moins récente si le cache est plein"""
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def delete(self, key: Hashable) -> None:
+        """Supprimer une entrée"""
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def clear(self) -> None:
+        """Vider le cache"""
+        with self._lock:
+            self._data.clear()
+    
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,77 @@
+"""
+Client Redis partagé
+Connexion paresseuse à settings.REDIS_URL, avec repli si Redis est indisponible
+"""
+
+import threading
+import time
+from typing import Optional
+import redis
+
+from app.config import settings
+
+
+# Délai avant de retenter une connexion après un échec (secondes)
+RETRY_SECONDS = 30
+
+_client: Optional[redis.Redis] = None
+_failed_at: Optional[float] = None
+_down = False
+_lock = threading.Lock()
+
+
+def get_redis() -> Optional[redis.Redis]:
+    """
+    Récupérer le client Redis partagé
+    
+    Returns:
+        Client Redis, ou None si Redis ne répond pas (nouvel essai après
+        RETRY_SECONDS)
+    """
+    global _client, _failed_at, _down
+    
+    if _client is not None:
+        return _client
+    if _failed_at is not None and time.monotonic() - _failed_at < RETRY_SECONDS:
+        return None
+    
+    with _lock:
+        if _client is not None:
+            return _client
+        
+        try:
+            client = redis.Redis.from_url(settings.REDIS_URL, socket_connect_timeout=1, socket_timeout=2)
+            client.ping()
+        except redis.RedisError as e:
+            _mark_failed(e)
+            return None
+        
+        if _down:
+            print("Redis de nouveau disponible")
+        _client = client
+        _failed_at = None
+        _down = False
+        return _client
+
+
+def _mark_failed(error: Exception) -> None:
+    """Oublier le client et différer le prochain essai (appelant sous _lock)"""
+    global _client, _failed_at, _down
+    
+    # Un message par panne, pas par requête
+    if not _down:
+        print(f"Redis indisponible ({error}), repli en mémoire")
+    _client = None
+    _failed_at = time.monotonic()
+    _down = True
+
+
+def mark_redis_failed(error: Exception) -> None:
+    """
+    Signaler une erreur Redis survenue en cours d'utilisation
+    
+    Le client partagé est abandonné : get_redis() retourne None (repli en
+    mémoire) pendant RETRY_SECONDS, puis tente une nouvelle connexion.
+    """
+    with _lock:
+        _mark_failed(error)
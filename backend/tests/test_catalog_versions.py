@@ -0,0 +1,45 @@
+"""
+Versions du catalogue incrémentées au commit (PostgreSQL)
+"""
+
+from decimal import Decimal
+import uuid
+
+from app.models.material import Material
+from app.services.catalog_events import mark_changed
+from app.services.catalog_versions import CatalogVersionService
+
+
+TABLES = ("articles", "materials")
+
+
+def _material():
+    return Material(id=uuid.uuid4(), code=f"V-{uuid.uuid4().hex[:8]}", name_fr="Vis", unit="buc", price_eur=Decimal("1.00"))
+
+
+def test_versions_bumped_once_at_commit(db):
+    before = CatalogVersionService.get(db, TABLES)
+    
+    material = _material()
+    db.add(material)
+    db.flush()
+    mark_changed(db, "articles")
+    
+    # Pas de verrou sur catalog_versions avant le commit
+    assert CatalogVersionService.get(db, TABLES) == before
+    
+    # Modification ORM encore en attente au moment du commit
+    material.price_eur = Decimal("2.00")
+    db.commit()
+    
+    assert CatalogVersionService.get(db, TABLES) == {table: before[table] + 1 for table in TABLES}
+
+
+def test_rollback_keeps_versions(db):
+    before = CatalogVersionService.get(db, TABLES)
+    
+    db.add(_material())
+    db.flush()
+    db.rollback()
+    
+    assert CatalogVersionService.get(db, TABLES) == before
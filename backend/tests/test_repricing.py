@@ -0,0 +1,74 @@
+"""
+Répercussion d'un prix matériau sur les articles et compositions (PostgreSQL)
+"""
+
+from decimal import Decimal
+import uuid
+
+from sqlalchemy import text
+
+from app.models.article import Article, ArticleMaterial
+from app.models.composition import Composition, CompositionItem, CompositionItemType
+from app.models.material import Material
+from app.services.repricing import RepricingService
+
+
+def _catalog(db):
+    """Matériau utilisé directement et via un article, dans une composition imbriquée"""
+    suffix = uuid.uuid4().hex[:8]
+    material = Material(id=uuid.uuid4(), code=f"M-{suffix}", name_fr="Vis", unit="buc", price_eur=Decimal("10.00"))
+    article = Article(
+        id=uuid.uuid4(), code=f"A-{suffix}", name="Fixation", unit="buc",
+        total_price=Decimal("0"), material_cost=Decimal("0"), labor_cost=Decimal("5.00")
+    )
+    article.materials = [ArticleMaterial(id=uuid.uuid4(), material_id=material.id, quantity=Decimal("2"), waste_percent=Decimal("0"))]
+    child = Composition(id=uuid.uuid4(), code=f"C-{suffix}", name="Panneau", unit="m2", total_price=Decimal("0"))
+    child.items = [
+        CompositionItem(id=uuid.uuid4(), item_type=CompositionItemType.MATERIAL, item_id=material.id, quantity=Decimal("3")),
+        CompositionItem(id=uuid.uuid4(), item_type=CompositionItemType.ARTICLE, item_id=article.id, quantity=Decimal("1")),
+    ]
+    parent = Composition(id=uuid.uuid4(), code=f"P-{suffix}", name="Cabane", unit="buc", total_price=Decimal("0"))
+    parent.items = [
+        CompositionItem(id=uuid.uuid4(), item_type=CompositionItemType.COMPOSITION, item_id=child.id, quantity=Decimal("4")),
+    ]
+    
+    db.add_all([material, article, child, parent])
+    db.flush()
+    RepricingService.reprice_dependents(db, material_ids=[material.id])
+    db.commit()
+    
+    return material, article, child, parent
+
+
+def test_item_type_is_stored_by_value(db):
+    _, _, child, _ = _catalog(db)
+    
+    stored = {
+        value for (value,) in db.execute(
+            text("SELECT item_type::text FROM composition_items WHERE composition_id = :id"),
+            {"id": str(child.id)}
+        )
+    }
+    
+    assert stored == {"material", "article"}
+
+
+def test_material_price_update_reprices_compositions(db):
+    material, article, child, parent = _catalog(db)
+    before = (article.total_price, child.total_price, parent.total_price)
+    
+    assert RepricingService.find_dependents(db, material_ids=[material.id]) == (
+        {article.id}, {child.id, parent.id}
+    )
+    
+    material.price_eur = Decimal("20.00")
+    updated = RepricingService.reprice_dependents(db, material_ids=[material.id])
+    db.commit()
+    
+    assert updated == {"articles": 1, "compositions": 2}
+    db.refresh(article)
+    db.refresh(child)
+    db.refresh(parent)
+    assert article.total_price > before[0]
+    assert child.total_price > before[1]
+    assert parent.total_price > before[2]